@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Batch Generation Check
+End-to-end run of the Bedrock batch-inference mode against local stand-ins
+
+S3 and DynamoDB are moto's in-process mocks; the Bedrock control plane is
+LocalBatchJobs, which runs a submitted job on its second status check and
+writes output in Bedrock's record format (some records erroring, some too
+short, some missing). The run:
+
+1. submits a cohort of --players players (4 sections each) and polls
+   until the job is ingested; the reported failures must be exactly the
+   injected ones
+2. regenerates a sample of players on demand with the same stand-in
+   model and checks the items match the batch-ingested ones
+3. submits the cohort again: successful sections are cache hits and
+   the few failed ones fall below the batch minimum and run on demand
+
+Requires moto (deployment/requirements.txt).
+
+Usage:
+    python benchmarks/bench_batch_generation.py [--players 50]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+os.environ.update({
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'METRICS_TABLE': 'bench-metrics',
+    'INSIGHTS_TABLE': 'bench-insights',
+    'CHAMPION_RECS_TABLE': 'bench-champions',
+    'RESPONSE_CACHE_TABLE': 'bench-response-cache',
+    'REPORTS_BUCKET': 'bench-reports',
+    'BEDROCK_BATCH_ROLE_ARN': 'arn:aws:iam::000000000000:role/bench-batch',
+    'STREAM_GENERATION': 'false',
+})
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+from moto import mock_aws  # noqa: E402
+
+# Failure injected into every record whose index modulo 50 is listed
+INJECTED = {7: 'error', 13: 'short', 29: 'missing'}
+
+
+def render(model_input: dict) -> str:
+    """Deterministic stand-in model output for a request body"""
+    prompt = model_input['messages'][0]['content']
+    digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return f"## Section {digest[:12]}\n\n" + ' '.join(digest[i:i + 8] for i in range(0, 64, 8)) * 3
+
+
+def model_output(text: str) -> dict:
+    return {
+        'content': [{'type': 'text', 'text': text}],
+        'usage': {'input_tokens': 900, 'output_tokens': len(text) // 4}
+    }
+
+
+class LocalBatchJobs:
+    """Bedrock control-plane stand-in: a job runs on its second status check"""
+
+    def __init__(self, s3):
+        self.s3 = s3
+        self.jobs = {}
+
+    @staticmethod
+    def _split(uri: str):
+        bucket, _, key = uri[len('s3://'):].partition('/')
+        return bucket, key
+
+    def create_model_invocation_job(self, jobName, roleArn, modelId, inputDataConfig, outputDataConfig, **kwargs):
+        job_arn = f"arn:aws:bedrock:us-east-1:000000000000:model-invocation-job/job{len(self.jobs):08d}"
+        self.jobs[job_arn] = {
+            'status': 'Submitted',
+            'input': inputDataConfig['s3InputDataConfig']['s3Uri'],
+            'output': outputDataConfig['s3OutputDataConfig']['s3Uri'],
+        }
+        return {'jobArn': job_arn}
+
+    def get_model_invocation_job(self, jobIdentifier):
+        job = self.jobs[jobIdentifier]
+        if job['status'] == 'Submitted':
+            job['status'] = 'InProgress'
+        elif job['status'] == 'InProgress':
+            self._run(jobIdentifier, job)
+            job['status'] = 'Completed'
+        return {'jobArn': jobIdentifier, 'status': job['status']}
+
+    def _run(self, job_arn: str, job: dict):
+        bucket, key = self._split(job['input'])
+        lines = self.s3.get_object(Bucket=bucket, Key=key)['Body'].read().decode('utf-8').splitlines()
+
+        out = []
+        for index, line in enumerate(lines):
+            record = json.loads(line)
+            failure = INJECTED.get(index % 50)
+            if failure == 'missing':
+                continue
+            if failure == 'error':
+                record['error'] = {'errorCode': 400, 'errorMessage': 'Malformed input request'}
+            elif failure == 'short':
+                record['modelOutput'] = model_output('Too short')
+            else:
+                record['modelOutput'] = model_output(render(record['modelInput']))
+            out.append(json.dumps(record))
+
+        # Bedrock writes <output uri>/<job id>/<input file name>.out
+        bucket, prefix = self._split(job['output'])
+        name = key.rsplit('/', 1)[-1]
+        self.s3.put_object(Bucket=bucket, Key=f"{prefix}{job_arn.rsplit('/', 1)[-1]}/{name}.out",
+                           Body='\n'.join(out).encode('utf-8'))
+        self.s3.put_object(Bucket=bucket, Key=f"{prefix}{job_arn.rsplit('/', 1)[-1]}/manifest.json.out",
+                           Body=json.dumps({'totalRecordCount': len(lines)}).encode('utf-8'))
+
+
+class LocalRuntime:
+    """bedrock-runtime stand-in for on-demand generation, same outputs as the batch stand-in"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_model(self, modelId, body):
+        self.calls += 1
+        text = render(json.loads(body))
+        return {'body': io.BytesIO(json.dumps(model_output(text)).encode('utf-8'))}
+
+
+def create_resources():
+    import boto3
+    from codec import to_dynamo
+
+    dynamodb = boto3.client('dynamodb')
+    tables = (
+        ('bench-metrics', [('player_puuid', 'S', 'HASH'), ('year', 'N', 'RANGE')]),
+        ('bench-insights', [('player_puuid', 'S', 'HASH'), ('section_id', 'S', 'RANGE')]),
+        ('bench-response-cache', [('cache_key', 'S', 'HASH')]),
+    )
+    for name, keys in tables:
+        dynamodb.create_table(
+            TableName=name,
+            BillingMode='PAY_PER_REQUEST',
+            AttributeDefinitions=[{'AttributeName': a, 'AttributeType': t} for a, t, _ in keys],
+            KeySchema=[{'AttributeName': a, 'KeyType': k} for a, _, k in keys]
+        )
+    dynamodb.create_table(
+        TableName='bench-champions',
+        BillingMode='PAY_PER_REQUEST',
+        AttributeDefinitions=[{'AttributeName': 'champion_name', 'AttributeType': 'S'},
+                              {'AttributeName': 'role', 'AttributeType': 'S'}],
+        KeySchema=[{'AttributeName': 'champion_name', 'KeyType': 'HASH'}],
+        GlobalSecondaryIndexes=[{'IndexName': 'RoleIndex',
+                                 'KeySchema': [{'AttributeName': 'role', 'KeyType': 'HASH'}],
+                                 'Projection': {'ProjectionType': 'ALL'}}]
+    )
+    boto3.client('s3').create_bucket(Bucket='bench-reports')
+    return boto3.resource('dynamodb').Table('bench-metrics'), to_dynamo
+
+
+def synthetic_metrics(rng: random.Random, player_puuid: str, year: int) -> dict:
+    return {
+        'player_puuid': player_puuid,
+        'year': year,
+        'primary_role': rng.choice(('TOP', 'JUNGLE', 'MID', 'BOTTOM', 'UTILITY')),
+        'total_games': rng.randint(50, 400),
+        'win_rate': round(rng.uniform(40, 60), 1),
+        'kda': round(rng.uniform(1.5, 5), 2),
+        'kills_per_game': round(rng.uniform(2, 10), 1),
+        'deaths_per_game': round(rng.uniform(2, 8), 1),
+        'assists_per_game': round(rng.uniform(3, 14), 1),
+        'avg_cs_per_min': round(rng.uniform(4, 9), 2),
+        'avg_vision_score_per_min': round(rng.uniform(0.3, 2), 2),
+        'comeback_wins': rng.randint(0, 30),
+        'most_played_champion': rng.choice(('Ahri', 'Lee Sin', 'Jinx', 'Thresh', 'Garen')),
+        'unique_champions': rng.randint(5, 60),
+        'ml_inference': {
+            'playstyle': {'archetype': 'Balanced All-Rounder'},
+            'performance_pattern': {'pattern': 'consistent'},
+            'mental_resilience': {'score': rng.randint(20, 95)},
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end check of batch section generation')
+    parser.add_argument('--players', type=int, default=50)
+    parser.add_argument('--sample', type=int, default=5, help='players regenerated on demand for parity')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with mock_aws():
+        metrics_table, to_dynamo = create_resources()
+
+        import bedrock_generation as bg
+        logging.getLogger().setLevel(logging.WARNING)
+        bg.BATCH_POLL_SECONDS = 0.01
+        runtime = LocalRuntime()
+        bg.bedrock_runtime = runtime
+        jobs = LocalBatchJobs(bg.s3_client)
+
+        year = 2025
+        rng = random.Random(49)
+        players = [f"player-{i:05d}" for i in range(args.players)]
+        with metrics_table.batch_writer() as writer:
+            for player_puuid in players:
+                writer.put_item(Item=to_dynamo(synthetic_metrics(rng, player_puuid, year)))
+
+        problems = []
+
+        # 1. Submit and poll until ingested
+        started = time.perf_counter()
+        submitted = bg.submit_batch_generation(players, year, control=jobs)
+        submit_s = time.perf_counter() - started
+        if submitted['mode'] != 'batch':
+            problems.append(f"expected a batch job, got {submitted['mode']}")
+
+        started = time.perf_counter()
+        polls = 0
+        while True:
+            polls += 1
+            summary = bg.poll_batch_generation(submitted['job_name'], control=jobs)
+            if summary['done']:
+                break
+        ingest_s = time.perf_counter() - started
+
+        records = submitted['records']
+        expected_failures = sum(1 for index in range(records) if index % 50 in INJECTED)
+        if len(summary['failed']) != expected_failures or summary['ingested'] != records - expected_failures:
+            problems.append(f"ingested {summary['ingested']} with {len(summary['failed'])} failures; "
+                            f"expected {records - expected_failures} with {expected_failures}")
+        if bg.poll_batch_generation(submitted['job_name'], control=jobs) != summary:
+            problems.append('second poll did not return the recorded summary')
+
+        print(f"{args.players} players, {records} records in one job")
+        print(f"  submit: {submit_s * 1000:7.1f} ms")
+        print(f"  ingest: {ingest_s * 1000:7.1f} ms over {polls} polls "
+              f"({summary['ingested']} ingested, {len(summary['failed'])} failed)")
+
+        # 2. Parity with on-demand generation
+        insights = bg.dynamodb.Table(bg.INSIGHTS_TABLE_NAME)
+        failed = {(f['player_puuid'], f['section_type']) for f in summary['failed']}
+        compared = 0
+        for player_puuid in players[:args.sample]:
+            for section_type in bg.SECTION_TYPES:
+                if (player_puuid, section_type) in failed:
+                    continue
+                key = {'player_puuid': player_puuid, 'section_id': f"{year}_{section_type}"}
+                batch_item = insights.get_item(Key=key)['Item']
+                result = bg.generate_section(player_puuid, year, section_type, force=True)
+                on_demand_item = insights.get_item(Key=key)['Item']
+                compared += 1
+                for field in ('content', 'data_package_ref', 'model_id', 'generation_status'):
+                    if not result['success'] or batch_item.get(field) != on_demand_item.get(field):
+                        problems.append(f"{player_puuid} {section_type}: {field} differs from on-demand")
+                        break
+        print(f"  parity: {compared} sections regenerated on demand")
+
+        # 3. Resubmit: cache hits plus on-demand for the failed sections
+        calls_before = runtime.calls
+        resubmitted = bg.submit_batch_generation(players, year, control=jobs)
+        print(f"  resubmit: {resubmitted['cache_hits']} cache hits, {resubmitted['records']} records "
+              f"({resubmitted['mode']}, {runtime.calls - calls_before} on-demand calls)")
+        if resubmitted['mode'] != 'on_demand' or not resubmitted['success'] \
+                or resubmitted['records'] != expected_failures:
+            problems.append(f"resubmit: {resubmitted}")
+
+        complete = sum(1 for item in insights.scan()['Items'] if item.get('generation_status') == 'complete')
+        if complete != records:
+            problems.append(f"{complete} of {records} sections complete after resubmit")
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    print('ok' if not problems else f"{len(problems)} problems")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
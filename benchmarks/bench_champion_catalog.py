@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Champion Catalog Benchmark
+Recommendation latency of the in-memory role catalog
+
+Builds a synthetic role of --champions items (seed-table shape), checks
+the vectorized ranking against a plain Python sort over the same
+distances, then reports the per-recommendation latency of both.
+
+Usage:
+    python benchmarks/bench_champion_catalog.py [--champions 60] [--requests 20000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+import champion_catalog  # noqa: E402
+from champion_catalog import FEATURE_COLUMNS, RoleCatalog, player_vector  # noqa: E402
+
+ARCHETYPES = (
+    'Strategic Enabler', 'Mechanical Carry', 'Late-Game Scaler',
+    'Aggressive Playmaker', 'Team-Oriented Support', 'Balanced All-Rounder',
+)
+
+
+def synthetic_champion(rng: random.Random, index: int) -> dict:
+    champion = {
+        'champion_name': f"Champion{index:03d}",
+        'role': 'MID',
+        'playstyle_fit': rng.sample(ARCHETYPES, rng.randint(1, 2)),
+        'avg_cs_min': round(rng.uniform(5, 9), 2),
+        'avg_vision_min': round(rng.uniform(0.4, 1.2), 2),
+        'avg_kda': round(rng.uniform(2, 4.5), 2),
+        'avg_damage_share': round(rng.uniform(0.18, 0.34), 3),
+        'win_rate_by_rank': {'gold': 50.0, 'platinum': 50.0},
+        'learning_curve': 'Medium',
+        'meta_status': 'Stable',
+    }
+    # Seed data is incomplete for some champions
+    for column, _ in FEATURE_COLUMNS:
+        if rng.random() < 0.1:
+            del champion[column]
+    return champion
+
+
+def synthetic_player(rng: random.Random) -> dict:
+    metrics = {
+        'primary_role': 'MID',
+        'avg_cs_per_min': rng.uniform(4, 10),
+        'avg_vision_score_per_min': rng.uniform(0.2, 2),
+        'kda': rng.uniform(1, 6),
+        'avg_damage_share': rng.uniform(0.15, 0.35),
+    }
+    # Some players predate damage-share aggregation
+    if rng.random() < 0.2:
+        metrics['avg_damage_share'] = 0
+    return metrics
+
+
+def python_recommend(catalog: RoleCatalog, metrics: dict, archetype: str, k: int = 3):
+    """The same ranking with per-champion Python arithmetic (column-mean imputation, RMS distance)"""
+    vector = [champion_catalog._positive_or_nan(metrics.get(metric)) for _, metric in FEATURE_COLUMNS]
+    columns = [[champion_catalog._positive_or_nan(champion.get(column)) for champion in catalog.champions]
+               for column, _ in FEATURE_COLUMNS]
+    means = []
+    for values in columns:
+        present = [value for value in values if not math.isnan(value)]
+        means.append(sum(present) / len(present) if present else float('nan'))
+
+    dims = [dim for dim in range(len(FEATURE_COLUMNS)) if not math.isnan(vector[dim]) and not math.isnan(means[dim])]
+    scored = []
+    for row, champion in enumerate(catalog.champions):
+        total = 0.0
+        for dim in dims:
+            value = columns[dim][row]
+            if math.isnan(value):
+                value = means[dim]
+            total += ((value - vector[dim]) / float(catalog.scale[dim])) ** 2
+        fits = archetype in (champion.get('playstyle_fit') or [])
+        scored.append((not fits, math.sqrt(total / max(1, len(dims))), row))
+    scored.sort()
+    return [catalog.champions[row]['champion_name'] for _, _, row in scored[:k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark champion recommendations')
+    parser.add_argument('--champions', type=int, default=60)
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(40)
+    catalog = RoleCatalog('MID', [synthetic_champion(rng, i) for i in range(args.champions)])
+    players = [(synthetic_player(rng), rng.choice(ARCHETYPES)) for _ in range(args.requests)]
+
+    mismatches = 0
+    for metrics, archetype in players[:2000]:
+        expected = python_recommend(catalog, metrics, archetype)
+        actual = [rec['champion_name'] for rec in catalog.recommend(player_vector(metrics), archetype)]
+        mismatches += expected != actual
+    print(f"parity: {mismatches} mismatches in {min(2000, len(players))} requests")
+
+    # A champion with no numeric data must not outrank the field
+    sparse = RoleCatalog('MID', catalog.champions + [{'champion_name': 'Sparse', 'playstyle_fit': list(ARCHETYPES)}])
+    sparse_top = sum(
+        sparse.recommend(player_vector(metrics), archetype, k=1)[0]['champion_name'] == 'Sparse'
+        for metrics, archetype in players[:2000]
+    )
+    print(f"sparse champion ranked first for {sparse_top} of {min(2000, len(players))} players")
+    mismatches += sparse_top > len(players[:2000]) // 10
+
+    started = time.perf_counter()
+    for metrics, archetype in players:
+        python_recommend(catalog, metrics, archetype)
+    python_us = (time.perf_counter() - started) / len(players) * 1e6
+
+    started = time.perf_counter()
+    for metrics, archetype in players:
+        catalog.recommend(player_vector(metrics), archetype)
+    catalog_us = (time.perf_counter() - started) / len(players) * 1e6
+
+    print(f"{args.champions} champions, {len(players)} requests")
+    print(f"  python loop: {python_us:8.1f} us/recommendation")
+    print(f"  catalog:     {catalog_us:8.1f} us/recommendation ({python_us / catalog_us:.1f}x)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
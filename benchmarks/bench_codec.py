@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Codec Micro-Benchmarks
+Compares the shared codec against the per-lambda recursive converters it replaced
+
+The codec is about on par with the old converters (it exists to share one
+correct implementation, not for speed); the saving is in not converting
+at all where a value only goes to dumps, which serializes Decimals itself.
+
+Usage:
+    python benchmarks/bench_codec.py [--number 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+from codec import to_dynamo, from_dynamo, dumps  # noqa: E402
+
+
+def legacy_convert_floats(obj):
+    """Recursive float -> Decimal converter (old save_metrics_to_dynamodb)"""
+    if isinstance(obj, dict):
+        return {k: legacy_convert_floats(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_convert_floats(item) for item in obj]
+    elif isinstance(obj, float):
+        return Decimal(str(obj))
+    return obj
+
+
+def legacy_convert_decimals(obj):
+    """Recursive Decimal -> float converter (old prepare_section_data_package)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, dict):
+        return {k: legacy_convert_decimals(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_convert_decimals(item) for item in obj]
+    return obj
+
+
+class LegacyDecimalEncoder(json.JSONEncoder):
+    """Old feature_engineering DecimalEncoder"""
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        return super(LegacyDecimalEncoder, self).default(obj)
+
+
+def sample_metrics_item() -> dict:
+    """A MetricsTable item shaped like aggregate_metrics output plus ml_inference"""
+    challenges = {f'challenge_{i}': (i * 1.37 if i % 2 else i) for i in range(120)}
+    return {
+        'player_puuid': 'bench-puuid',
+        'year': 2025,
+        'total_games': 412,
+        'wins': 221,
+        'losses': 191,
+        'win_rate': 53.64,
+        'primary_role': 'ADC',
+        'role_distribution': {'ADC': 300, 'SUPPORT': 80, 'MID': 32},
+        'kda': 3.12,
+        'kills_per_game': 6.4,
+        'deaths_per_game': 4.1,
+        'assists_per_game': 6.39,
+        'avg_cs_per_min': 7.81,
+        'avg_gold_per_min': 412.5,
+        'avg_vision_score_per_min': 0.74,
+        'avg_damage_efficiency': 1.12,
+        'avg_objective_participation': 0.31,
+        'comeback_wins': 17,
+        'unique_champions': 24,
+        'most_played_champion': 'Jinx',
+        'challenges': challenges,
+        'recent_matches': [
+            {'match_id': f'NA1_{i}', 'kda': 2.5 + i / 100, 'cs_per_min': 7.0 + i / 50, 'tags': ['ranked', 'solo']}
+            for i in range(100)
+        ],
+        'ml_inference': {
+            'performance_pattern': {'model': 'rule_based', 'pattern': 'balanced_gameplay', 'confidence': 0.75},
+            'mental_resilience': {'resilience_score': 33.84, 'grade': 'Developing', 'comeback_wins': 17},
+            'playstyle': {'archetype': 'Balanced All-Rounder', 'aggression_index': 44.3},
+        },
+    }
+
+
+def run(number: int):
+    native = sample_metrics_item()
+    stored = legacy_convert_floats(native)
+
+    assert to_dynamo(native) == legacy_convert_floats(native)
+    assert from_dynamo(stored) == legacy_convert_decimals(stored)
+
+    cases = [
+        ('to_dynamo', 'legacy convert_floats', lambda: legacy_convert_floats(native), lambda: to_dynamo(native)),
+        ('from_dynamo', 'legacy convert_decimals', lambda: legacy_convert_decimals(stored), lambda: from_dynamo(stored)),
+        ('dumps(Decimal item)', 'json.dumps(cls=DecimalEncoder)',
+         lambda: json.dumps(stored, cls=LegacyDecimalEncoder), lambda: dumps(stored)),
+        ('dumps(Decimal item)', 'convert_decimals + json.dumps',
+         lambda: json.dumps(legacy_convert_decimals(stored)), lambda: dumps(stored)),
+    ]
+
+    print(f"{'operation':<22} {'baseline':<34} {'baseline us':>12} {'codec us':>10} {'speedup':>8}")
+    for name, baseline_name, baseline, candidate in cases:
+        baseline_us = min(timeit.repeat(baseline, number=number, repeat=5)) / number * 1e6
+        candidate_us = min(timeit.repeat(candidate, number=number, repeat=5)) / number * 1e6
+        print(f"{name:<22} {baseline_name:<34} {baseline_us:>12.1f} {candidate_us:>10.1f} "
+              f"{baseline_us / candidate_us:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shared DynamoDB/JSON codec')
+    parser.add_argument('--number', type=int, default=2000, help='Iterations per timing run')
+    args = parser.parse_args()
+
+    run(args.number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Feature Record Memory Benchmark
+Retained heap for a player's match features: legacy dicts vs MatchFeatures records
+
+Usage:
+    python benchmarks/bench_feature_records.py [--games 1000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+from feature_engineering import CHALLENGE_FIELDS, aggregate_metrics, extract_features_from_match  # noqa: E402
+
+PUUID = 'bench-puuid'
+
+
+def synthetic_match(index: int, rng: random.Random) -> bytes:
+    """Raw match JSON with a realistically sized challenges map (~125 entries)"""
+    challenges = {f'challenge{i}': (rng.random() * 10 if i % 2 else rng.randint(0, 20)) for i in range(110)}
+    challenges.update({key: rng.random() * 5 for key in CHALLENGE_FIELDS})
+
+    participant = {
+        'puuid': PUUID, 'participantId': 1, 'teamId': 100,
+        'championName': rng.choice(['Jinx', 'Ashe', 'Sivir', 'Thresh', 'Leona']), 'championId': 222,
+        'teamPosition': rng.choice(['BOTTOM', 'UTILITY']), 'win': rng.random() < 0.52,
+        'kills': rng.randint(0, 15), 'deaths': rng.randint(0, 12), 'assists': rng.randint(0, 20),
+        'totalMinionsKilled': rng.randint(20, 300), 'neutralMinionsKilled': rng.randint(0, 40),
+        'goldEarned': rng.randint(5000, 18000), 'goldSpent': rng.randint(5000, 18000),
+        'totalDamageDealtToChampions': rng.randint(3000, 40000), 'totalDamageTaken': rng.randint(5000, 40000),
+        'visionScore': rng.randint(5, 90), 'wardsPlaced': rng.randint(2, 40), 'wardsKilled': rng.randint(0, 15),
+        'challenges': challenges,
+    }
+    match = {
+        'metadata': {'matchId': f'NA1_{index}'},
+        'info': {
+            'gameCreation': 1700000000000 + index, 'gameDuration': rng.randint(900, 2600),
+            'gameMode': 'CLASSIC', 'gameType': 'MATCHED_GAME', 'participants': [participant],
+            'teams': [{'teamId': 100, 'objectives': {'dragon': {'kills': 2}, 'baron': {'kills': 1}}}],
+        },
+    }
+    return json.dumps(match).encode()
+
+
+def legacy_features(match_data: dict) -> dict:
+    """Equivalent of the old dict output, which embedded the full challenges map"""
+    features = extract_features_from_match(match_data, PUUID).to_dict()
+    features['challenges'] = match_data['info']['participants'][0]['challenges']
+    return features
+
+
+def retained_bytes(raw_matches, extract) -> int:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    records = [extract(json.loads(raw)) for raw in raw_matches]
+
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    del records
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure retained memory of match feature records')
+    parser.add_argument('--games', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    raw_matches = [synthetic_match(i, rng) for i in range(args.games)]
+
+    records = [extract_features_from_match(json.loads(raw), PUUID) for raw in raw_matches]
+    assert aggregate_metrics(records, 2025)['total_games'] == args.games
+
+    before = retained_bytes(raw_matches, legacy_features)
+    after = retained_bytes(raw_matches, lambda match: extract_features_from_match(match, PUUID))
+
+    print(f"Games: {args.games}")
+    print(f"  dict features (full challenges): {before / 1024:>9.1f} KiB  ({before / args.games:.0f} B/game)")
+    print(f"  MatchFeatures (__slots__):       {after / 1024:>9.1f} KiB  ({after / args.games:.0f} B/game)")
+    print(f"  Reduction: {100 * (1 - after / before):.1f}%")
+
+
+if __name__ == '__main__':
+    main()
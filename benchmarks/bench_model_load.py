@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Model Cold-Start Load Benchmark
+Pickled scikit-learn models vs memory-mapped .rsm artifacts
+
+Each load runs in a fresh interpreter so import costs (sklearn vs numpy)
+are included, as they would be in a Lambda cold start. Requires
+scikit-learn to build the reference models.
+
+Usage:
+    python benchmarks/bench_model_load.py [--trees 100] [--runs 5]
+"""
+
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions')
+sys.path.insert(0, LAMBDA_DIR)
+
+from model_artifacts import convert_sklearn_model, save_artifact  # noqa: E402
+
+PICKLE_LOAD = """
+import pickle, sys, time
+started = time.perf_counter()
+with open(sys.argv[1], 'rb') as f:
+    model = pickle.load(f)
+model.predict([[{row}]])
+print((time.perf_counter() - started) * 1000)
+"""
+
+ARTIFACT_LOAD = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[2])
+from model_artifacts import load_artifact
+model = load_artifact(sys.argv[1])
+model.predict([[{row}]])
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def build_models(trees: int):
+    from sklearn.cluster import KMeans
+    from sklearn.decomposition import PCA
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.pipeline import make_pipeline
+
+    rng = np.random.default_rng(7)
+    # Feature layouts match MLModelPipeline._extract_*_features
+    pattern_X = rng.normal(size=(5000, 6))
+    resilience_X = rng.normal(size=(5000, 3))
+    resilience_y = resilience_X @ np.array([4.0, 0.6, 0.01]) + rng.normal(size=5000)
+
+    return {
+        'performance_pattern_analyzer': (KMeans(n_clusters=3, n_init=3, random_state=0).fit(pattern_X), pattern_X),
+        'mental_resilience_calculator': (
+            RandomForestRegressor(n_estimators=trees, random_state=0).fit(resilience_X, resilience_y), resilience_X
+        ),
+        'playstyle_profiler': (
+            make_pipeline(PCA(n_components=4), KMeans(n_clusters=6, n_init=3, random_state=0)).fit(pattern_X),
+            pattern_X
+        ),
+    }
+
+
+def time_load(script: str, path: str, row: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', script.format(row=row), path, LAMBDA_DIR],
+            capture_output=True, text=True, check=True
+        )
+        samples.append(float(output.stdout.strip()))
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold-start model loading')
+    parser.add_argument('--trees', type=int, default=100, help='Random forest size (config.yaml n_estimators)')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'model':<30} {'pickle KB':>10} {'rsm KB':>8} {'pickle ms':>10} {'rsm ms':>8} {'speedup':>8} {'parity':>7}")
+
+        for name, (model, X) in build_models(args.trees).items():
+            pickle_path = os.path.join(workdir, f"{name}.pkl")
+            artifact_path = os.path.join(workdir, f"{name}.rsm")
+
+            with open(pickle_path, 'wb') as f:
+                pickle.dump(model, f)
+
+            predictor = convert_sklearn_model(model)
+            save_artifact(predictor, artifact_path)
+            parity = np.allclose(model.predict(X[:1000]), predictor.predict(X[:1000]))
+
+            row = ', '.join(str(v) for v in X[0])
+            pickle_ms = time_load(PICKLE_LOAD, pickle_path, row, args.runs)
+            artifact_ms = time_load(ARTIFACT_LOAD, artifact_path, row, args.runs)
+
+            print(f"{name:<30} {os.path.getsize(pickle_path) / 1024:>10.1f} "
+                  f"{os.path.getsize(artifact_path) / 1024:>8.1f} {pickle_ms:>10.1f} {artifact_ms:>8.1f} "
+                  f"{pickle_ms / artifact_ms:>7.1f}x {'ok' if parity else 'FAIL':>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Rules Engine Benchmark
+Per-player MLModelPipeline fallbacks vs the vectorized rules engine
+
+Checks that every label and score is identical to the scalar rules
+(including boundary values and missing fields), for items holding
+DynamoDB Decimals and for the same items with plain int/float numbers
+(what batch inference reads with batch_get_items(plain=True)), then times
+both over --players synthetic metrics items. Exits 1 on any mismatch.
+
+Usage:
+    python benchmarks/bench_rules_engine.py [--players 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+import rules_engine  # noqa: E402
+from codec import from_dynamo  # noqa: E402
+from model_inference import MLModelPipeline  # noqa: E402
+
+# Thresholds used by the rules; sampled directly so ties are exercised
+BOUNDARIES = {
+    'kda': [3.0],
+    'deaths_per_game': [5, 7],
+    'avg_vision_score_per_min': [1.0],
+    'total_games': [0],
+}
+
+
+def synthetic_metrics(rng: random.Random) -> dict:
+    """A MetricsTable item as read back from DynamoDB (Decimal values, some fields absent)"""
+    values = {
+        'kda': rng.uniform(0.5, 8.0),
+        'win_rate': rng.uniform(30, 75),
+        'total_games': rng.randint(0, 600),
+        'comeback_wins': rng.randint(0, 60),
+        'kills_per_game': rng.uniform(0, 15),
+        'deaths_per_game': rng.uniform(0, 12),
+        'assists_per_game': rng.uniform(0, 20),
+        'avg_cs_per_min': rng.uniform(0, 10),
+        'avg_vision_score_per_min': rng.uniform(0, 3),
+        'avg_objective_participation': rng.uniform(0, 1),
+    }
+
+    metrics = {}
+    for field, value in values.items():
+        roll = rng.random()
+        if roll < 0.05:
+            continue
+        if roll < 0.15 and field in BOUNDARIES:
+            value = rng.choice(BOUNDARIES[field])
+        metrics[field] = Decimal(str(round(value, 4))) if isinstance(value, float) else value
+    return metrics
+
+
+def scalar_rules(pipeline: MLModelPipeline, metrics_list):
+    results = {key: [] for key in ('performance_pattern', 'resilience_score', 'aggression_index',
+                                   'teamwork_orientation', 'mechanical_skill', 'archetype')}
+    for metrics in metrics_list:
+        aggression = pipeline._calculate_aggression_index(metrics)
+        teamwork = pipeline._calculate_teamwork_orientation(metrics)
+        mechanical = pipeline._calculate_mechanical_skill(metrics)
+
+        results['performance_pattern'].append(pipeline._rule_based_performance_pattern(metrics))
+        results['resilience_score'].append(pipeline._rule_based_resilience_score(metrics))
+        results['aggression_index'].append(aggression)
+        results['teamwork_orientation'].append(teamwork)
+        results['mechanical_skill'].append(mechanical)
+        results['archetype'].append(pipeline._determine_archetype(aggression, teamwork, mechanical))
+    return results
+
+
+def check_parity(expected, actual) -> int:
+    mismatches = 0
+    for key, values in expected.items():
+        for i, (want, got) in enumerate(zip(values, actual[key])):
+            if want != got:
+                if mismatches < 10:
+                    print(f"  ✗ {key}[{i}]: scalar={want!r} vectorized={got!r}")
+                mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vectorized rules engine')
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    metrics_list = [synthetic_metrics(rng) for _ in range(args.players)]
+    pipeline = MLModelPipeline(models_bucket=None)
+
+    started = time.perf_counter()
+    expected = scalar_rules(pipeline, metrics_list)
+    scalar_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    columns = rules_engine.metric_columns(metrics_list)
+    extract_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = rules_engine.evaluate(metrics_list)
+    vector_s = time.perf_counter() - started
+
+    mismatches = check_parity(expected, actual)
+
+    plain_list = [from_dynamo(metrics) for metrics in metrics_list]
+    started = time.perf_counter()
+    plain_actual = rules_engine.evaluate(plain_list)
+    plain_s = time.perf_counter() - started
+    mismatches += check_parity(expected, plain_actual)
+
+    started = time.perf_counter()
+    aggression = rules_engine.aggression_index(columns)
+    rules_engine.archetype(aggression, rules_engine.teamwork_orientation(columns),
+                           rules_engine.mechanical_skill(columns))
+    rules_engine.performance_pattern(columns)
+    rules_engine.resilience_score(columns)
+    rules_only_s = time.perf_counter() - started
+
+    print(f"Players: {args.players}")
+    print(f"  scalar rules:                {scalar_s * 1000:>9.1f} ms  ({args.players / scalar_s:>12,.0f} players/s)")
+    print(f"  rules_engine.evaluate:       {vector_s * 1000:>9.1f} ms  ({args.players / vector_s:>12,.0f} players/s)")
+    print(f"    column extraction:         {extract_s * 1000:>9.1f} ms")
+    print(f"    rules over columns:        {rules_only_s * 1000:>9.1f} ms")
+    print(f"  evaluate, plain numbers:     {plain_s * 1000:>9.1f} ms  ({args.players / plain_s:>12,.0f} players/s)")
+    print(f"  Speedup: {scalar_s / vector_s:.1f}x end-to-end ({scalar_s / plain_s:.1f}x with plain numbers), "
+          f"{scalar_s / rules_only_s:.1f}x on columns")
+
+    if mismatches:
+        print(f"✗ Parity: {mismatches} mismatching values")
+        sys.exit(1)
+    print("✓ Parity: all labels and scores identical")
+
+
+if __name__ == '__main__':
+    main()
@@ -55,6 +55,19 @@ PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 
 cd "${PROJECT_ROOT}/lambda_functions"
 
+# Shared helper modules each handler imports (directly or through another helper);
+# only these are bundled, so unrelated helpers never reach a function's package
+handler_modules() {
+    case "$1" in
+        model_inference)
+            echo "lazy codec batch_get model_artifacts rules_engine model_training parallel_scan" ;;
+        bedrock_generation)
+            echo "lazy codec batch_get champion_catalog distributed_semaphore" ;;
+        *)
+            echo "lazy codec" ;;
+    esac
+}
+
 # Package each function
 for func in data_collection feature_engineering model_inference bedrock_generation report_compilation resource_manager; do
     echo "Packaging ${func}..."
@@ -64,6 +77,9 @@ for func in data_collection feature_engineering model_inference bedrock_generati
 
     # Copy function code
     cp ${func}.py /tmp/${func}_package/index.py
+    for module in $(handler_modules ${func}); do
+        cp ${module}.py /tmp/${func}_package/${module}.py
+    done
 
     # Create zip
     cd /tmp/${func}_package
@@ -0,0 +1,71 @@
+"""
+RiftSage AI Agent - Batch Get
+Chunked DynamoDB BatchGetItem with unprocessed-key retries
+
+    for item in batch_get_items(METRICS_TABLE_NAME, keys):
+        ...
+
+Keys are sent BATCH_GET_LIMIT at a time (the BatchGetItem maximum), with
+duplicates dropped since BatchGetItem rejects them. UnprocessedKeys are
+retried with exponential backoff; keys still unprocessed after
+BATCH_GET_MAX_RETRIES are logged and left out, like keys with no item.
+
+With plain=True the low-level client is used and items are decoded by
+codec.from_wire: numbers arrive as int/float, as from_dynamo would give,
+without creating a Decimal per value first. Use it for numeric items that
+are read, not written back.
+"""
+
+import logging
+import time
+from typing import Dict, Iterator, List, Sequence
+
+import lazy
+from codec import from_wire, to_wire
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients
+# Per thread: callers may fetch from worker threads and boto3 resources are not thread-safe
+dynamodb = lazy.thread_resource('dynamodb')
+dynamodb_client = lazy.client('dynamodb')
+
+BATCH_GET_LIMIT = 100
+BATCH_GET_MAX_RETRIES = 5
+
+
+def batch_get_items(table_name: str, keys: List[Dict], projection: Sequence[str] = None,
+                    plain: bool = False) -> Iterator[Dict]:
+    """
+    Yield the items found for keys, in no particular order. projection
+    limits the attributes returned (include the key attributes if the
+    caller matches items back to keys); plain decodes numbers to int/float.
+    """
+    unique = list({tuple(sorted(key.items())): key for key in keys}.values())
+    if plain:
+        unique = [to_wire(key) for key in unique]
+    batch_get_item = dynamodb_client.batch_get_item if plain else dynamodb.batch_get_item
+
+    request_options = {}
+    if projection:
+        names = {f'#p{i}': field for i, field in enumerate(projection)}
+        request_options = {'ProjectionExpression': ', '.join(names), 'ExpressionAttributeNames': names}
+
+    for start in range(0, len(unique), BATCH_GET_LIMIT):
+        request = {table_name: {'Keys': unique[start:start + BATCH_GET_LIMIT], **request_options}}
+
+        for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+            response = batch_get_item(RequestItems=request)
+            items = response.get('Responses', {}).get(table_name, [])
+            if plain:
+                items = map(from_wire, items)
+            yield from items
+
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+
+            time.sleep(min(2 ** attempt * 0.05, 1.0))
+        else:
+            logger.warning(f"Giving up on {len(request[table_name]['Keys'])} unprocessed keys in {table_name}")
@@ -3,74 +3,204 @@ RiftSage AI Agent - Bedrock Generation Lambda Function
 Generates personalized insights using Amazon Bedrock (Claude AI)
 """
 
+import gzip
+import hashlib
 import json
+import math
 import os
-import boto3
 import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict, List, Any
-from decimal import Decimal
+from typing import Dict, List, Any, Tuple
+
+import lazy
+from batch_get import batch_get_items
+from champion_catalog import champion_catalog
+from codec import from_dynamo, to_dynamo, dumps
+from distributed_semaphore import DistributedSemaphore, SemaphoreTimeout, decorrelated_jitter
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+# Few SDK retries and a bounded read, so throttles and stalls reach the model router quickly
+bedrock_runtime = lazy.client('bedrock-runtime', region_name='us-east-1', config={
+    'read_timeout': int(os.environ.get('BEDROCK_READ_TIMEOUT', 60)),
+    'retries': {'mode': 'standard', 'total_max_attempts': int(os.environ.get('BEDROCK_MAX_ATTEMPTS', 2))}
+})
+# Control plane, for batch inference jobs
+bedrock = lazy.client('bedrock', region_name='us-east-1')
+# Per thread: sections are generated on worker threads and boto3 resources are not thread-safe
+dynamodb = lazy.thread_resource('dynamodb')
+s3_client = lazy.client('s3')
 
 # Environment variables
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'development')
 METRICS_TABLE_NAME = os.environ.get('METRICS_TABLE')
 INSIGHTS_TABLE_NAME = os.environ.get('INSIGHTS_TABLE')
 REPORTS_BUCKET = os.environ.get('REPORTS_BUCKET')
+RESPONSE_CACHE_TABLE_NAME = os.environ.get('RESPONSE_CACHE_TABLE')
+RATE_LIMIT_TABLE_NAME = os.environ.get('RATE_LIMIT_TABLE')
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', 7 * 24 * 60 * 60))
+# Data packages behind generated sections, stored once per distinct content
+DATA_PACKAGE_BUCKET = os.environ.get('DATA_PACKAGE_BUCKET', REPORTS_BUCKET)
+DATA_PACKAGE_PREFIX = 'data-packages'
+# Keys of packages known to be stored, remembered per container (least recently used dropped)
+DATA_PACKAGE_MEMO_SIZE = int(os.environ.get('DATA_PACKAGE_MEMO_SIZE', 4096))
+# Sections generated at once by generate_all (each is one Bedrock call)
+GENERATION_CONCURRENCY = int(os.environ.get('GENERATION_CONCURRENCY', 4))
+# Stream Bedrock output and persist partial content for progressive rendering
+STREAM_GENERATION = os.environ.get('STREAM_GENERATION', 'true') == 'true'
+# Partial content is written once this many new characters or seconds accumulate
+STREAM_FLUSH_CHARS = int(os.environ.get('STREAM_FLUSH_CHARS', 400))
+STREAM_FLUSH_SECONDS = float(os.environ.get('STREAM_FLUSH_SECONDS', 1.0))
+# Input + output tokens allowed per Bedrock call (mirrors config.yaml cost_management)
+BEDROCK_TOKEN_LIMIT = int(os.environ.get('BEDROCK_TOKEN_LIMIT', 10000))
+# Mark the static prompt prefix as a Bedrock prompt-cache checkpoint where supported
+PROMPT_CACHE = os.environ.get('PROMPT_CACHE', 'true') == 'true'
+# Smallest prefix the model will cache (1024 for Sonnet/Opus, 2048 for Haiku)
+PROMPT_CACHE_MIN_TOKENS = int(os.environ.get('PROMPT_CACHE_MIN_TOKENS', 1024))
 
 # Bedrock model configuration
 BEDROCK_MODEL_ID = 'anthropic.claude-3-sonnet-20240229-v1:0'
+# Mirrors config.yaml bedrock.fallback_model; empty disables routing
+BEDROCK_FALLBACK_MODEL_ID = os.environ.get('BEDROCK_FALLBACK_MODEL', 'anthropic.claude-3-haiku-20240307-v1:0')
 MAX_TOKENS = 4000
 TEMPERATURE = 0.3
 
+# Model families with Bedrock prompt caching (matched against model/profile IDs)
+PROMPT_CACHE_MODEL_FAMILIES = (
+    'claude-3-5-haiku',
+    'claude-3-7-sonnet',
+    'claude-sonnet-4',
+    'claude-opus-4',
+    'claude-haiku-4',
+)
+
+# Model routing: outcomes within the window decide primary vs fallback
+ROUTER_WINDOW_SECONDS = int(os.environ.get('ROUTER_WINDOW_SECONDS', 300))
+ROUTER_MIN_SAMPLES = int(os.environ.get('ROUTER_MIN_SAMPLES', 5))
+ROUTER_MAX_THROTTLE_RATE = float(os.environ.get('ROUTER_MAX_THROTTLE_RATE', 0.2))
+# A section whose predicted p95 latency exceeds this goes to the fallback
+ROUTER_LATENCY_BUDGET_MS = float(os.environ.get('ROUTER_LATENCY_BUDGET_MS', 60000))
+
+# Bedrock calls in flight per model across all containers (0 disables the limiter)
+BEDROCK_MAX_CONCURRENCY = int(os.environ.get('BEDROCK_MAX_CONCURRENCY', 8))
+BEDROCK_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('BEDROCK_QUEUE_TIMEOUT_SECONDS', 120))
+# Invocation time kept back from Bedrock retries, so a call started just before the
+# deadline can finish (or time out) and every section's outcome is still written
+GENERATION_DEADLINE_MARGIN_SECONDS = float(os.environ.get('GENERATION_DEADLINE_MARGIN_SECONDS', 90))
+# Longer than the slowest streamed section, so live calls never lose their permit
+BEDROCK_LEASE_SECONDS = int(os.environ.get('BEDROCK_LEASE_SECONDS', 300))
+# Rounds over all routed models, with decorrelated-jitter backoff between rounds (at least one)
+BEDROCK_RETRY_ROUNDS = max(1, int(os.environ.get('BEDROCK_RETRY_ROUNDS', 3)))
+BEDROCK_BACKOFF_BASE_SECONDS = 0.5
+BEDROCK_BACKOFF_MAX_SECONDS = 20.0
+
+# Batch inference (year-end bulk generation)
+BEDROCK_BATCH_ROLE_ARN = os.environ.get('BEDROCK_BATCH_ROLE_ARN')
+BEDROCK_BATCH_MODEL_ID = os.environ.get('BEDROCK_BATCH_MODEL', BEDROCK_MODEL_ID)
+BATCH_BUCKET = os.environ.get('BEDROCK_BATCH_BUCKET', REPORTS_BUCKET)
+BATCH_PREFIX = 'bedrock-batch'
+# Bedrock rejects jobs with fewer records; smaller cohorts are generated on demand
+BATCH_MIN_RECORDS = int(os.environ.get('BEDROCK_BATCH_MIN_RECORDS', 100))
+BATCH_TIMEOUT_HOURS = int(os.environ.get('BEDROCK_BATCH_TIMEOUT_HOURS', 24))
+BATCH_POLL_SECONDS = 30
+BATCH_RUNNING_STATES = ('Submitted', 'Validating', 'Scheduled', 'InProgress', 'Stopping')
+# Worker threads at submit: data package snapshots, and sections generated on demand for
+# cohorts under BATCH_MIN_RECORDS (Bedrock calls still need BEDROCK_MAX_CONCURRENCY permits)
+BATCH_SUBMIT_CONCURRENCY = int(os.environ.get('BEDROCK_BATCH_SUBMIT_CONCURRENCY', 16))
+
+# Errors after which the next model is tried (Bedrock codes and botocore timeouts)
+FAILOVER_ERROR_CODES = {
+    'throttlingexception',
+    'servicequotaexceededexception',
+    'modeltimeoutexception',
+    'modelnotreadyexception',
+    'serviceunavailableexception',
+    'modelstreamerrorexception',
+}
+FAILOVER_ERROR_TYPES = ('ReadTimeoutError', 'ConnectTimeoutError')
+# The subset the router counts as throttles; timeouts count as slow calls
+THROTTLE_ERROR_CODES = {'throttlingexception', 'servicequotaexceededexception'}
+
+# Bump whenever a prompt template changes so cached responses are not reused
+PROMPT_TEMPLATE_VERSION = 3
+
+SECTION_TYPES = ('role_performance', 'improvement_blueprint', 'mental_resilience', 'champion_mastery')
+SECTION_MAX_TOKENS = {'improvement_blueprint': 5000}
+
+# Metrics each section's prompt draws on, most important first. Over the
+# token budget, fields are dropped from the end of the list.
+SECTION_METRIC_FIELDS = {
+    'improvement_blueprint': (
+        'primary_role', 'total_games', 'win_rate', 'kda', 'avg_cs_per_min', 'avg_vision_score_per_min',
+        'avg_damage_share', 'avg_gold_per_min', 'avg_objective_participation', 'deaths_per_game',
+        'kills_per_game', 'assists_per_game', 'avg_damage_efficiency', 'role_distribution',
+    ),
+    'mental_resilience': (
+        'total_games', 'win_rate', 'kda', 'deaths_per_game', 'comeback_wins', 'late_game_wins',
+        'late_game_losses', 'wins', 'losses', 'primary_role',
+    ),
+    'champion_mastery': (
+        'most_played_champion', 'unique_champions', 'total_games', 'win_rate', 'kda', 'primary_role',
+        'role_distribution', 'total_penta_kills', 'total_quadra_kills', 'total_triple_kills',
+        'total_double_kills',
+    ),
+}
+
+# ml_inference fields used by the improvement blueprint
+BLUEPRINT_INFERENCE_FIELDS = {
+    'performance_pattern': ('pattern', 'confidence'),
+    'playstyle': ('archetype', 'playstyle_description', 'aggression_index', 'teamwork_orientation',
+                  'mechanical_skill'),
+    'growth_trajectory': ('trajectory', 'improvement_velocity', 'predicted_improvement_areas'),
+}
+
+# Champion recommendation fields the blueprint's champion table needs
+CHAMPION_REC_FIELDS = (
+    'champion_name', 'playstyle_fit', 'archetype_match', 'win_rate_by_rank', 'avg_cs_min', 'avg_vision_min',
+    'learning_curve', 'fit_explanation_template',
+)
+
+# Conservative characters-per-token ratio for compact JSON and English prose
+CHARS_PER_TOKEN = 3.5
+
+
+# ====================================
+# Prompt templates
+# ====================================
+
+# Identical for every section and player: the static prefix of each prompt
+SYSTEM_PROMPT = """You are RiftSage, an AI performance analyst for League of Legends. Your role is to transform match data into clear, actionable insights using a standardized four-part framework.
 
-class BedrockInsightGenerator:
-    """Generates insights using Amazon Bedrock"""
-
-    def __init__(self):
-        self.model_id = BEDROCK_MODEL_ID
-
-    def call_bedrock(self, prompt: str, max_tokens: int = MAX_TOKENS) -> str:
-        """Call Bedrock API with Claude model"""
-        try:
-            request_body = {
-                'anthropic_version': 'bedrock-2023-05-31',
-                'max_tokens': max_tokens,
-                'temperature': TEMPERATURE,
-                'messages': [{
-                    'role': 'user',
-                    'content': prompt
-                }]
-            }
-
-            response = bedrock_runtime.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body)
-            )
-
-            response_body = json.loads(response['body'].read())
-            return response_body['content'][0]['text']
-
-        except Exception as e:
-            logger.error(f"Error calling Bedrock: {str(e)}")
-            raise
-
-    def generate_role_performance_snapshot(self, player_data: Dict) -> str:
-        """Generate Role Performance Snapshot section"""
-
-        prompt = f"""You are RiftSage, an AI performance analyst for League of Legends. Generate a Role Performance Snapshot analysis using the player's data.
-
-PLAYER DATA:
-{json.dumps(player_data, indent=2)}
-
-Generate the complete Role Performance Snapshot section following this 4-part structure:
+CRITICAL RULES:
+1. Always use the four-part structure: Intro Overview → Stats & Metrics → Deeper Insights → Narrative Meaning
+2. The Intro Overview must frame the data story before presenting numbers
+3. Be data-grounded: every claim must reference specific metrics
+4. Use ONLY numbers from the provided player data; every sentence must be unique to THIS player
+5. Adapt content to the player's unique strengths while maintaining structure
+6. Write in clear, direct language that respects player intelligence
+7. Provide actionable guidance backed by statistical patterns
+
+TONE: Professional, motivating, data-focused, respectful
+STYLE: Clear bullet points for insights, brief paragraphs for narrative
+FORMAT: Follow the structure given for the requested section exactly"""
+
+SECTION_TITLES = {
+    'role_performance': 'Role Performance Snapshot',
+    'improvement_blueprint': 'Improvement Blueprint',
+    'mental_resilience': 'Mental Resilience & Consistency',
+    'champion_mastery': 'Champion Mastery Analysis',
+}
+
+# Per-section structure; the player's data follows in the user message
+SECTION_INSTRUCTIONS = {
+    'role_performance': """Generate the complete Role Performance Snapshot section following this 4-part structure:
 
 1. INTRO OVERVIEW (2-3 sentences):
    - Identify their PRIMARY performance pattern
@@ -95,26 +225,9 @@ Generate the complete Role Performance Snapshot section following this 4-part st
    - Connect to their rank and potential
    - Reference at least 3 specific numbers
 
-CRITICAL RULES:
-- Every sentence must be unique to THIS player's data
-- Use ONLY numbers from the provided data
-- Make connections between metrics that reveal gameplay patterns
-- Write as if you deeply understand THIS player's unique playstyle"""
-
-        return self.call_bedrock(prompt)
+Make connections between metrics that reveal gameplay patterns. Write as if you deeply understand THIS player's unique playstyle.""",
 
-    def generate_improvement_blueprint(self, player_data: Dict, champion_recs: List[Dict]) -> str:
-        """Generate Improvement Blueprint section"""
-
-        prompt = f"""You are RiftSage, an AI performance analyst for League of Legends. Generate an Improvement Blueprint for this player.
-
-PLAYER DATA:
-{json.dumps(player_data, indent=2)}
-
-CHAMPION RECOMMENDATIONS:
-{json.dumps(champion_recs, indent=2)}
-
-Generate the complete Improvement Blueprint section following this structure:
+    'improvement_blueprint': """Generate the complete Improvement Blueprint section following this structure:
 
 1. INTRO OVERVIEW (2-3 sentences):
    - Acknowledge their primary strength first
@@ -132,7 +245,7 @@ Generate the complete Improvement Blueprint section following this structure:
    - WHAT enabling factors these improvements provide
 
 4. RECOMMENDED CHAMPION POOL:
-   Create a table with the 3 recommended champions showing:
+   Create a table with the 3 recommended champions (from CHAMPION RECOMMENDATIONS) showing:
    - Champion name
    - Win rate pattern
    - CS/min potential
@@ -151,50 +264,506 @@ Generate the complete Improvement Blueprint section following this structure:
 7. NARRATIVE MEANING (3-4 sentences):
    Synthesize how current strengths + improvements = superior performance
 
-CRITICAL: Be specific to this player's situation with exact numbers."""
-
-        return self.call_bedrock(prompt, max_tokens=5000)
-
-    def generate_mental_resilience_section(self, player_data: Dict) -> str:
-        """Generate Mental Resilience & Consistency section"""
-
-        prompt = f"""You are RiftSage. Generate a Mental Resilience & Consistency analysis for this player.
-
-PLAYER DATA:
-{json.dumps(player_data, indent=2)}
+Be specific to this player's situation with exact numbers.""",
 
-Use the 4-part structure:
+    'mental_resilience': """Generate a Mental Resilience & Consistency analysis using the 4-part structure:
 1. Intro Overview - frame their mental game strengths
 2. Stats & Metrics - resilience score, consistency rating, comeback performance
 3. Deeper Insights - what the patterns reveal
 4. Narrative Meaning - how mental game contributes to success
 
-Be specific to their data. Include exact numbers."""
+Be specific to their data. Include exact numbers.""",
 
-        return self.call_bedrock(prompt)
-
-    def generate_champion_mastery_section(self, player_data: Dict) -> str:
-        """Generate Champion Mastery Analysis section"""
-
-        prompt = f"""You are RiftSage. Generate a Champion Mastery Analysis for this player.
-
-PLAYER DATA:
-{json.dumps(player_data, indent=2)}
-
-Use the 4-part structure:
+    'champion_mastery': """Generate a Champion Mastery Analysis using the 4-part structure:
 1. Intro Overview - their champion pool characteristics
 2. Stats & Metrics - most played, pool depth, highest win rate
 3. Deeper Insights - what their pool reveals about playstyle
 4. Narrative Meaning - strategic recommendations
 
-Include specific champion names and win rates from their data."""
+Include specific champion names and win rates from their data.""",
+}
 
-        return self.call_bedrock(prompt)
+# With prompt caching, one system prompt carries every section's
+# instructions so a single cached prefix serves all sections and players
+PROMPT_LIBRARY = SYSTEM_PROMPT + ''.join(
+    f"\n\n=== {SECTION_TITLES[section]} ===\n{instructions}"
+    for section, instructions in SECTION_INSTRUCTIONS.items()
+)
 
 
-def prepare_section_data_package(player_puuid: str, year: int, section_type: str) -> Dict:
-    """Prepare data package for a specific section"""
-    try:
+# ====================================
+# Prompt budgeting
+# ====================================
+
+def compact_json(obj: Any) -> str:
+    """JSON without indentation or spaces, for embedding data in prompts"""
+    return dumps(obj, separators=(',', ':'))
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text (no tokenizer in the Lambda package)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _pick(source: Dict, fields) -> Dict:
+    return {field: source[field] for field in fields if field in source}
+
+
+def _system_prompt_tokens(section_type: str) -> int:
+    """Tokens of the largest system prompt a section's request can carry"""
+    if any(model_id and BedrockInsightGenerator.prompt_cache(model_id)
+           for model_id in (BEDROCK_MODEL_ID, BEDROCK_FALLBACK_MODEL_ID)):
+        return estimate_tokens(PROMPT_LIBRARY)
+    return estimate_tokens(f"{SYSTEM_PROMPT}\n\n{SECTION_INSTRUCTIONS[section_type]}")
+
+
+def fit_to_budget(data_package: Dict, section_type: str, extra_data: Any = None) -> Tuple[int, List[str]]:
+    """
+    Drop the lowest-priority player_metrics fields (in place) until the
+    estimated prompt, plus the section's max_tokens, fits
+    BEDROCK_TOKEN_LIMIT. extra_data is other data embedded in the prompt.
+    Returns the estimated input tokens and the dropped fields.
+
+    The system prompt is counted as sent: when prompt caching can be used
+    that is the whole PROMPT_LIBRARY prefix, which occupies the context
+    window even though it is billed at the cache-read rate. The budget
+    does not depend on which model serves the call, so on-demand and
+    batch requests prune a package the same way.
+    """
+    fixed_tokens = _system_prompt_tokens(section_type) + 20
+    if extra_data is not None:
+        fixed_tokens += estimate_tokens(compact_json(extra_data))
+    budget = BEDROCK_TOKEN_LIMIT - SECTION_MAX_TOKENS.get(section_type, MAX_TOKENS) - fixed_tokens
+
+    metrics = data_package.get('player_metrics', {})
+    dropped = []
+    tokens = estimate_tokens(compact_json(data_package))
+    while tokens > budget and metrics:
+        field = next(reversed(metrics))
+        del metrics[field]
+        dropped.append(field)
+        tokens = estimate_tokens(compact_json(data_package))
+
+    if tokens > budget:
+        logger.warning(f"{section_type} data package exceeds the token budget after pruning")
+    return tokens + fixed_tokens, dropped
+
+
+class SectionStream:
+    """
+    Progress of one streamed section. Partial text is written to the
+    section's insights item (partial_content, generation_status
+    'generating') at chunk boundaries, at most every STREAM_FLUSH_CHARS
+    characters or STREAM_FLUSH_SECONDS, so the dashboard can poll it;
+    any previously completed content stays in place until the final write.
+    """
+
+    def __init__(self, player_puuid: str, year: int, section_type: str):
+        self.key = {'player_puuid': player_puuid, 'section_id': f"{year}_{section_type}"}
+        self.year = year
+        self.section_type = section_type
+        self.parts = []
+        self.chunks = 0
+        self.partial_writes = 0
+        self.ttft_ms = None
+        self.started = time.perf_counter()
+        self._flushed_chars = 0
+        self._last_flush = self.started
+
+    def start(self):
+        """
+        Mark the moment the request is sent (time-to-first-token origin).
+        Called again on failover, so text from the failed model is dropped.
+        """
+        self.started = self._last_flush = time.perf_counter()
+        self.parts = []
+        self.chunks = 0
+        self.ttft_ms = None
+        self._flushed_chars = 0
+
+    def on_text(self, text: str):
+        now = time.perf_counter()
+        if self.ttft_ms is None:
+            self.ttft_ms = round((now - self.started) * 1000, 1)
+        self.parts.append(text)
+        self.chunks += 1
+
+        pending = sum(len(part) for part in self.parts) - self._flushed_chars
+        if pending >= STREAM_FLUSH_CHARS or now - self._last_flush >= STREAM_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        content = ''.join(self.parts)
+        try:
+            insights_table = dynamodb.Table(INSIGHTS_TABLE_NAME)
+            insights_table.update_item(
+                Key=self.key,
+                UpdateExpression='SET partial_content = :content, generation_status = :status, '
+                                 'section_type = :section_type, #year = :year, partial_updated_at = :now',
+                ExpressionAttributeNames={'#year': 'year'},
+                ExpressionAttributeValues={
+                    ':content': content,
+                    ':status': 'generating',
+                    ':section_type': self.section_type,
+                    ':year': self.year,
+                    ':now': datetime.utcnow().isoformat()
+                }
+            )
+            self.partial_writes += 1
+        except Exception as e:
+            # Progress is best-effort; the final write still happens
+            logger.warning(f"Error saving partial content: {str(e)}")
+        self._flushed_chars = len(content)
+        self._last_flush = time.perf_counter()
+
+    def fail(self, error: str):
+        """Record a failed generation on an item that already shows progress"""
+        if not self.partial_writes:
+            return
+        try:
+            insights_table = dynamodb.Table(INSIGHTS_TABLE_NAME)
+            insights_table.update_item(
+                Key=self.key,
+                UpdateExpression='SET generation_status = :status, generation_error = :error',
+                ExpressionAttributeValues={':status': 'failed', ':error': error}
+            )
+        except Exception as e:
+            logger.warning(f"Error saving generation failure: {str(e)}")
+
+    @property
+    def metrics(self) -> Dict:
+        return {
+            'streamed': True,
+            'ttft_ms': self.ttft_ms,
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'chunks': self.chunks,
+            'partial_writes': self.partial_writes
+        }
+
+
+# ====================================
+# Model routing
+# ====================================
+
+def _is_failover_error(error: Exception) -> bool:
+    return type(error).__name__ in FAILOVER_ERROR_TYPES or _error_code(error) in FAILOVER_ERROR_CODES
+
+
+def _error_code(error: Exception) -> str:
+    response = getattr(error, 'response', None) or {}
+    # Event-stream errors use lower-camel codes (throttlingException)
+    return str(response.get('Error', {}).get('Code', '')).lower()
+
+
+def _is_throttle(error: Exception) -> bool:
+    return _error_code(error) in THROTTLE_ERROR_CODES
+
+
+def _is_timeout(error: Exception) -> bool:
+    return type(error).__name__ in FAILOVER_ERROR_TYPES or _error_code(error) == 'modeltimeoutexception'
+
+
+class ModelRouter:
+    """
+    Chooses the primary or fallback model per section from recent outcomes
+    in this container: throttle rate and p95 latency per 1k output tokens,
+    scaled by the section's max_tokens (so large sections move first).
+    """
+
+    def __init__(self, primary: str, fallback: str = None):
+        self.primary = primary
+        self.fallback = fallback if fallback and fallback != primary else None
+        # model -> deque of (monotonic time, ms per 1k output tokens or None, throttled)
+        self.outcomes = {model: deque() for model in filter(None, (self.primary, self.fallback))}
+        self._lock = threading.Lock()
+
+    def _recent(self, model: str) -> List[Tuple]:
+        outcomes = self.outcomes[model]
+        horizon = time.monotonic() - ROUTER_WINDOW_SECONDS
+        while outcomes and outcomes[0][0] < horizon:
+            outcomes.popleft()
+        return list(outcomes)
+
+    def record(self, model: str, latency_ms: float = None, output_tokens: int = None, throttled: bool = False):
+        """Record one call: its latency (successes and timeouts), or a throttle"""
+        ms_per_ktoken = None
+        if latency_ms is not None and output_tokens:
+            ms_per_ktoken = latency_ms / (output_tokens / 1000)
+        with self._lock:
+            self.outcomes[model].append((time.monotonic(), ms_per_ktoken, throttled))
+
+    def stats(self, model: str) -> Dict:
+        with self._lock:
+            recent = self._recent(model)
+        speeds = sorted(speed for _, speed, _ in recent if speed is not None)
+        return {
+            'calls': len(recent),
+            'throttle_rate': round(sum(1 for _, _, throttled in recent if throttled) / len(recent), 3) if recent else 0.0,
+            'p95_ms_per_ktoken': round(speeds[min(len(speeds) - 1, int(0.95 * len(speeds)))], 1) if speeds else None
+        }
+
+    def _overloaded(self, model: str, section_type: str) -> str:
+        stats = self.stats(model)
+        if stats['calls'] < ROUTER_MIN_SAMPLES:
+            return None
+        if stats['throttle_rate'] >= ROUTER_MAX_THROTTLE_RATE:
+            return 'throttling'
+        if stats['p95_ms_per_ktoken'] is not None:
+            predicted_ms = stats['p95_ms_per_ktoken'] * SECTION_MAX_TOKENS.get(section_type, MAX_TOKENS) / 1000
+            if predicted_ms > ROUTER_LATENCY_BUDGET_MS:
+                return 'latency'
+        return None
+
+    def route(self, section_type: str) -> List[str]:
+        """Models to try for a section, in order"""
+        if self.fallback is None:
+            return [self.primary]
+
+        reason = self._overloaded(self.primary, section_type)
+        if reason and not self._overloaded(self.fallback, section_type):
+            logger.info(f"Routing {section_type} to {self.fallback} ({reason} on {self.primary})")
+            return [self.fallback, self.primary]
+        return [self.primary, self.fallback]
+
+
+model_router = ModelRouter(BEDROCK_MODEL_ID, BEDROCK_FALLBACK_MODEL_ID)
+
+_semaphores: Dict[str, DistributedSemaphore] = {}
+_semaphores_lock = threading.Lock()
+
+
+class GenerationDeadline(Exception):
+    """No time left in the invocation for another Bedrock attempt"""
+
+
+def invocation_deadline(context) -> float:
+    """
+    time.monotonic() value after which generation starts no new Bedrock
+    attempts: the Lambda's remaining time less GENERATION_DEADLINE_MARGIN_SECONDS
+    (None without a Lambda context)
+    """
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - GENERATION_DEADLINE_MARGIN_SECONDS
+
+
+def bedrock_permit(model_id: str, wait_timeout: float = None):
+    """
+    Context manager holding one cross-container Bedrock permit for model_id,
+    waiting at most wait_timeout seconds (default BEDROCK_QUEUE_TIMEOUT_SECONDS)
+    """
+    if not RATE_LIMIT_TABLE_NAME or BEDROCK_MAX_CONCURRENCY <= 0:
+        return nullcontext({'lease_id': None, 'queue_wait_ms': 0.0, 'attempts': 0})
+
+    with _semaphores_lock:
+        semaphore = _semaphores.get(model_id)
+        if semaphore is None:
+            semaphore = DistributedSemaphore(
+                RATE_LIMIT_TABLE_NAME, f"bedrock#{model_id}", BEDROCK_MAX_CONCURRENCY,
+                lease_seconds=BEDROCK_LEASE_SECONDS, wait_timeout=BEDROCK_QUEUE_TIMEOUT_SECONDS
+            )
+            _semaphores[model_id] = semaphore
+    return semaphore.hold(wait_timeout)
+
+
+class BedrockInsightGenerator:
+    """Generates insights using Amazon Bedrock"""
+
+    def __init__(self, router: ModelRouter = None):
+        self.model_id = BEDROCK_MODEL_ID
+        self.router = router or model_router
+
+    @staticmethod
+    def prompt_cache(model_id: str) -> bool:
+        return (
+            PROMPT_CACHE
+            and any(family in model_id for family in PROMPT_CACHE_MODEL_FAMILIES)
+            and estimate_tokens(PROMPT_LIBRARY) >= PROMPT_CACHE_MIN_TOKENS
+        )
+
+    @staticmethod
+    def data_text(player_data: Dict, champion_recs: List[Dict] = None) -> str:
+        """The per-player part of the prompt"""
+        data_text = f"PLAYER DATA:\n{compact_json(player_data)}"
+        if champion_recs is not None:
+            data_text += f"\n\nCHAMPION RECOMMENDATIONS:\n{compact_json(champion_recs)}"
+        return data_text
+
+    def build_request(self, section_type: str, data_text: str, max_tokens: int, model_id: str = None,
+                      cacheable: bool = True) -> Dict:
+        """
+        Static instructions go in the system prompt and the player's data in
+        the user message. With prompt caching the system prompt is the full
+        PROMPT_LIBRARY, marked as a cache checkpoint (not for batch jobs,
+        which pass cacheable=False).
+        """
+        if cacheable and self.prompt_cache(model_id or self.model_id):
+            system = [{'type': 'text', 'text': PROMPT_LIBRARY, 'cache_control': {'type': 'ephemeral'}}]
+        else:
+            system = [{'type': 'text', 'text': f"{SYSTEM_PROMPT}\n\n{SECTION_INSTRUCTIONS[section_type]}"}]
+
+        return {
+            'anthropic_version': 'bedrock-2023-05-31',
+            'max_tokens': max_tokens,
+            'temperature': TEMPERATURE,
+            'system': system,
+            'messages': [{
+                'role': 'user',
+                'content': f"{data_text}\n\nWrite the {SECTION_TITLES[section_type]} section for this player."
+            }]
+        }
+
+    def call_bedrock(self, request_body: Dict, model_id: str = None, stream: SectionStream = None,
+                     usage: Dict = None) -> str:
+        """
+        Call Bedrock API with Claude model (streamed when a SectionStream is
+        given). Token usage, including cache reads/writes, is added to usage.
+        """
+        model_id = model_id or self.model_id
+        try:
+            if stream is not None:
+                return self._stream_bedrock(request_body, model_id, stream, usage)
+
+            response = bedrock_runtime.invoke_model(
+                modelId=model_id,
+                body=json.dumps(request_body)
+            )
+
+            response_body = json.loads(response['body'].read())
+            _record_usage(usage, response_body.get('usage'))
+            return response_body['content'][0]['text']
+
+        except Exception as e:
+            logger.error(f"Error calling Bedrock: {str(e)}")
+            raise
+
+    def _stream_bedrock(self, request_body: Dict, model_id: str, stream: SectionStream, usage: Dict = None) -> str:
+        stream.start()
+        response = bedrock_runtime.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=json.dumps(request_body)
+        )
+
+        for event in response['body']:
+            chunk = event.get('chunk')
+            if chunk is None:
+                continue
+            payload = json.loads(chunk['bytes'])
+            event_type = payload.get('type')
+            if event_type == 'content_block_delta':
+                text = payload['delta'].get('text')
+                if text:
+                    stream.on_text(text)
+            elif event_type == 'message_start':
+                _record_usage(usage, payload.get('message', {}).get('usage'))
+            elif event_type == 'message_delta':
+                _record_usage(usage, payload.get('usage'))
+
+        return ''.join(stream.parts)
+
+    def generate(self, section_type: str, player_data: Dict, champion_recs: List[Dict] = None,
+                 stream: SectionStream = None, usage: Dict = None, call_metrics: Dict = None,
+                 deadline: float = None) -> Tuple[str, str]:
+        """
+        Generate one section from its data package on the model the router
+        picks. Each call holds a cross-container permit for its model; on
+        throttling, timeouts or a permit wait timeout the next model is
+        tried, and once every model has failed the round is retried after
+        a decorrelated-jitter backoff. Returns the content and the model
+        that served it; queue and retry figures are added to call_metrics.
+
+        With a deadline (see invocation_deadline), permit waits are cut to
+        the time left and no attempt or backoff starts past it; the last
+        error (or GenerationDeadline) is raised so the caller can still
+        record the failure.
+        """
+        data_text = self.data_text(player_data, champion_recs)
+        max_tokens = SECTION_MAX_TOKENS.get(section_type, MAX_TOKENS)
+
+        metrics = call_metrics if call_metrics is not None else {}
+        metrics.update({'queue_wait_ms': 0.0, 'calls': 0, 'failovers': 0, 'backoff_ms': 0.0})
+
+        models = self.router.route(section_type)
+        delay = BEDROCK_BACKOFF_BASE_SECONDS
+        last_error = None
+
+        def time_left() -> float:
+            return float('inf') if deadline is None else deadline - time.monotonic()
+
+        for round_number in range(BEDROCK_RETRY_ROUNDS):
+            if round_number:
+                delay = decorrelated_jitter(delay, BEDROCK_BACKOFF_BASE_SECONDS, BEDROCK_BACKOFF_MAX_SECONDS)
+                if delay >= time_left():
+                    break
+                logger.warning(f"{section_type}: all models busy, retrying in {delay:.1f}s")
+                metrics['backoff_ms'] += round(delay * 1000, 1)
+                time.sleep(delay)
+
+            for model_id in models:
+                remaining = time_left()
+                if remaining <= 0:
+                    break
+                if last_error is not None:
+                    metrics['failovers'] += 1
+                request_body = self.build_request(section_type, data_text, max_tokens, model_id)
+                try:
+                    with bedrock_permit(model_id, min(BEDROCK_QUEUE_TIMEOUT_SECONDS, remaining)) as permit:
+                        metrics['queue_wait_ms'] += permit['queue_wait_ms']
+                        metrics['calls'] += 1
+                        started = time.perf_counter()
+                        content = self.call_bedrock(request_body, model_id, stream=stream, usage=usage)
+                except SemaphoreTimeout as e:
+                    logger.warning(f"{section_type}: {str(e)}")
+                    last_error = e
+                    continue
+                except Exception as e:
+                    if not _is_failover_error(e):
+                        raise
+                    if _is_throttle(e):
+                        self.router.record(model_id, throttled=True)
+                    elif _is_timeout(e):
+                        # A slow call, counted at the section's full token budget
+                        self.router.record(model_id, (time.perf_counter() - started) * 1000, max_tokens)
+                    logger.warning(f"{section_type}: {model_id} failed ({type(e).__name__})")
+                    last_error = e
+                    continue
+
+                output_tokens = (usage or {}).get('output_tokens') or estimate_tokens(content)
+                self.router.record(model_id, (time.perf_counter() - started) * 1000, output_tokens)
+                return content, model_id
+
+            if time_left() <= 0:
+                break
+
+        if time_left() <= 0:
+            logger.warning(f"{section_type}: invocation deadline reached, giving up")
+        raise last_error or GenerationDeadline(f"{section_type}: no time left for a Bedrock attempt")
+
+
+def _record_usage(usage: Dict, reported: Dict):
+    """Keep the token counts Bedrock reports (streaming splits them across events)"""
+    if usage is None or not reported:
+        return
+    for field in ('input_tokens', 'output_tokens', 'cache_read_input_tokens', 'cache_creation_input_tokens'):
+        if reported.get(field) is not None:
+            usage[field] = reported[field]
+
+
+class PlayerContext:
+    """
+    One player's metrics and ML inference for a generation request.
+    Loaded from MetricsTable and converted from DynamoDB types once;
+    every section's data package is built from it.
+    """
+
+    def __init__(self, player_puuid: str, year: int, metrics: Dict):
+        self.player_puuid = player_puuid
+        self.year = year
+        self.metrics = metrics
+        self.ml_inference = metrics.get('ml_inference', {})
+
+    @classmethod
+    def load(cls, player_puuid: str, year: int) -> 'PlayerContext':
         metrics_table = dynamodb.Table(METRICS_TABLE_NAME)
 
         response = metrics_table.get_item(
@@ -207,22 +776,13 @@ def prepare_section_data_package(player_puuid: str, year: int, section_type: str
         if 'Item' not in response:
             raise ValueError("Metrics not found")
 
-        metrics = response['Item']
-
-        # Convert Decimal to float for JSON serialization
-        def convert_decimals(obj):
-            if isinstance(obj, Decimal):
-                return float(obj)
-            elif isinstance(obj, dict):
-                return {k: convert_decimals(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_decimals(item) for item in obj]
-            return obj
+        # Convert Decimal to int/float for JSON serialization
+        return cls(player_puuid, year, from_dynamo(response['Item']))
 
-        metrics = convert_decimals(metrics)
-
-        # Get ML inference results if available
-        ml_inference = metrics.get('ml_inference', {})
+    def data_package(self, section_type: str) -> Dict:
+        """Prepare data package for a specific section"""
+        metrics = self.metrics
+        ml_inference = self.ml_inference
 
         # Build data package based on section type
         if section_type == 'role_performance':
@@ -246,8 +806,11 @@ def prepare_section_data_package(player_puuid: str, year: int, section_type: str
 
         elif section_type == 'improvement_blueprint':
             data_package = {
-                'player_metrics': metrics,
-                'ml_inference': ml_inference,
+                'player_metrics': _pick(metrics, SECTION_METRIC_FIELDS[section_type]),
+                'ml_inference': {
+                    name: _pick(ml_inference.get(name) or {}, fields)
+                    for name, fields in BLUEPRINT_INFERENCE_FIELDS.items()
+                },
                 'improvement_opportunities': [
                     {'metric': 'cs_per_min', 'current': metrics.get('avg_cs_per_min', 0)},
                     {'metric': 'vision_per_min', 'current': metrics.get('avg_vision_score_per_min', 0)}
@@ -256,14 +819,14 @@ def prepare_section_data_package(player_puuid: str, year: int, section_type: str
 
         elif section_type == 'mental_resilience':
             data_package = {
-                'player_metrics': metrics,
+                'player_metrics': _pick(metrics, SECTION_METRIC_FIELDS[section_type]),
                 'resilience': ml_inference.get('mental_resilience', {}),
                 'comeback_wins': metrics.get('comeback_wins', 0)
             }
 
         elif section_type == 'champion_mastery':
             data_package = {
-                'player_metrics': metrics,
+                'player_metrics': _pick(metrics, SECTION_METRIC_FIELDS[section_type]),
                 'most_played': metrics.get('most_played_champion', 'Unknown'),
                 'unique_champions': metrics.get('unique_champions', 0)
             }
@@ -273,71 +836,628 @@ def prepare_section_data_package(player_puuid: str, year: int, section_type: str
 
         return data_package
 
+
+def prepare_section_data_package(player_puuid: str, year: int, section_type: str) -> Dict:
+    """Prepare data package for a specific section"""
+    try:
+        return PlayerContext.load(player_puuid, year).data_package(section_type)
+
     except Exception as e:
         logger.error(f"Error preparing data package: {str(e)}")
         raise
 
 
-def generate_section(player_puuid: str, year: int, section_type: str) -> Dict:
-    """Generate a single section using Bedrock"""
-    try:
-        # Prepare data
-        data_package = prepare_section_data_package(player_puuid, year, section_type)
+def response_cache_key(model_id: str, section_type: str, inputs: Dict) -> str:
+    """Content hash of everything a section's Bedrock response depends on"""
+    payload = {
+        'model_id': model_id,
+        'temperature': TEMPERATURE,
+        'max_tokens': SECTION_MAX_TOKENS.get(section_type, MAX_TOKENS),
+        'prompt_version': PROMPT_TEMPLATE_VERSION,
+        'section_type': section_type,
+        'inputs': inputs,
+    }
+    return hashlib.sha256(dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
 
-        # Initialize generator
-        generator = BedrockInsightGenerator()
 
-        # Generate content based on section type
-        if section_type == 'role_performance':
-            content = generator.generate_role_performance_snapshot(data_package)
+def get_cached_response(cache_key: str) -> str:
+    """Cached section content for cache_key if present and unexpired, else None"""
+    if not RESPONSE_CACHE_TABLE_NAME:
+        return None
+    try:
+        cache_table = dynamodb.Table(RESPONSE_CACHE_TABLE_NAME)
+        response = cache_table.get_item(Key={'cache_key': cache_key})
 
-        elif section_type == 'improvement_blueprint':
-            # Get champion recommendations
-            champion_recs = []  # Would query champion recommendations table
-            content = generator.generate_improvement_blueprint(data_package, champion_recs)
+        if 'Item' in response:
+            # DynamoDB deletes expired items lazily
+            if int(time.time()) < response['Item'].get('ttl', 0):
+                return response['Item']['content']
 
-        elif section_type == 'mental_resilience':
-            content = generator.generate_mental_resilience_section(data_package)
+        return None
+    except Exception as e:
+        logger.warning(f"Error checking response cache: {str(e)}")
+        return None
 
-        elif section_type == 'champion_mastery':
-            content = generator.generate_champion_mastery_section(data_package)
 
-        else:
-            raise ValueError(f"Unknown section type: {section_type}")
+def get_cached_responses(cache_keys: List[str]) -> Dict[str, str]:
+    """get_cached_response for many keys with BatchGetItem: {cache_key: content} for unexpired hits"""
+    if not RESPONSE_CACHE_TABLE_NAME or not cache_keys:
+        return {}
+    try:
+        now = int(time.time())
+        return {
+            item['cache_key']: item['content']
+            for item in batch_get_items(RESPONSE_CACHE_TABLE_NAME, [{'cache_key': key} for key in cache_keys],
+                                        projection=('cache_key', 'content', 'ttl'), plain=True)
+            if now < item.get('ttl', 0)
+        }
+    except Exception as e:
+        logger.warning(f"Error checking response cache: {str(e)}")
+        return {}
 
-        # Validate content
-        if not content or len(content) < 100:
-            raise ValueError("Generated content is too short")
 
-        # Save to DynamoDB
-        insights_table = dynamodb.Table(INSIGHTS_TABLE_NAME)
-        insights_table.put_item(
+def save_cached_response(cache_key: str, section_type: str, model_id: str, content: str):
+    """Save validated section content to the response cache"""
+    if not RESPONSE_CACHE_TABLE_NAME:
+        return
+    try:
+        cache_table = dynamodb.Table(RESPONSE_CACHE_TABLE_NAME)
+        cache_table.put_item(
             Item={
-                'player_puuid': player_puuid,
-                'section_id': f"{year}_{section_type}",
+                'cache_key': cache_key,
                 'section_type': section_type,
-                'year': year,
+                'model_id': model_id,
                 'content': content,
-                'generated_at': datetime.utcnow().isoformat(),
-                'data_package': json.dumps(data_package)
+                'ttl': int(time.time()) + RESPONSE_CACHE_TTL_SECONDS,
+                'cached_at': datetime.utcnow().isoformat()
             }
         )
+    except Exception as e:
+        logger.warning(f"Error saving to response cache: {str(e)}")
+
+
+def prepare_section_inputs(context: PlayerContext, section_type: str, model_id: str) -> Tuple[Dict, List[Dict], str, int]:
+    """
+    Everything a section's prompt is built from: the budgeted data package,
+    champion recommendations (improvement_blueprint only, else None), the
+    response cache key and the estimated input tokens.
+    """
+    data_package = context.data_package(section_type)
+    cache_inputs = {'data_package': data_package}
+    champion_recs = None
+
+    if section_type == 'improvement_blueprint':
+        # Get champion recommendations
+        try:
+            champion_recs = [
+                _pick(rec, CHAMPION_REC_FIELDS) for rec in champion_catalog.recommend(
+                    context.metrics,
+                    context.ml_inference.get('playstyle', {}).get('archetype'),
+                    k=3
+                )
+            ]
+        except Exception as e:
+            # Recommendations enrich the section; generate it without them
+            logger.error(f"Error getting champion recommendations: {str(e)}")
+            champion_recs = []
+        cache_inputs['champion_recs'] = champion_recs
+
+    estimated_tokens, dropped = fit_to_budget(data_package, section_type, champion_recs)
+    logger.info(f"{section_type}: ~{estimated_tokens} estimated input tokens"
+                + (f", dropped {', '.join(dropped)} to fit {BEDROCK_TOKEN_LIMIT}" if dropped else ''))
+
+    return data_package, champion_recs, response_cache_key(model_id, section_type, cache_inputs), estimated_tokens
+
+
+def validate_content(content: str):
+    """Reject empty or truncated section content"""
+    if not content or len(content) < 100:
+        raise ValueError("Generated content is too short")
+
+
+_stored_packages = OrderedDict()
+_stored_packages_lock = threading.Lock()
+
+
+def _package_stored(key: str) -> bool:
+    with _stored_packages_lock:
+        if key in _stored_packages:
+            _stored_packages.move_to_end(key)
+            return True
+    return False
+
+
+def _remember_package(key: str):
+    with _stored_packages_lock:
+        _stored_packages[key] = None
+        _stored_packages.move_to_end(key)
+        while len(_stored_packages) > DATA_PACKAGE_MEMO_SIZE:
+            _stored_packages.popitem(last=False)
+
+
+def snapshot_data_package(data_package: Dict) -> Dict:
+    """
+    Insights item attributes recording the data package a section was
+    generated from. The package is written once per distinct content, as
+    gzipped JSON under its SHA-256, and the item keeps only the S3 key
+    (data_package_ref). If S3 is unavailable it is kept inline as before.
+    """
+    body = dumps(data_package, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(body).hexdigest()
+    key = f"{DATA_PACKAGE_PREFIX}/{digest[:2]}/{digest}.json.gz"
+
+    if not _package_stored(key):
+        try:
+            # Conditional, so an identical package already stored is not rewritten
+            s3_client.put_object(
+                Bucket=DATA_PACKAGE_BUCKET,
+                Key=key,
+                Body=gzip.compress(body, mtime=0),
+                ContentType='application/json',
+                ContentEncoding='gzip',
+                IfNoneMatch='*'
+            )
+        except Exception as e:
+            response = getattr(e, 'response', None) or {}
+            if response.get('Error', {}).get('Code') not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                logger.warning(f"Error storing data package, keeping it inline: {str(e)}")
+                return {'data_package': dumps(data_package)}
+        _remember_package(key)
+
+    return {'data_package_ref': key}
+
+
+def load_data_package(item: Dict) -> Dict:
+    """The data package an insights item was generated from (referenced or inline), or None"""
+    if item.get('data_package_ref'):
+        response = s3_client.get_object(Bucket=DATA_PACKAGE_BUCKET, Key=item['data_package_ref'])
+        return json.loads(gzip.decompress(response['Body'].read()))
+    if item.get('data_package'):
+        return json.loads(item['data_package'])
+    return None
+
+
+def section_item(player_puuid: str, year: int, section_type: str, content: str, model_id: str,
+                 snapshot: Dict) -> Dict:
+    """
+    GeneratedInsightsTable item for a completed section (replaces any
+    partial content); snapshot comes from snapshot_data_package
+    """
+    return {
+        'player_puuid': player_puuid,
+        'section_id': f"{year}_{section_type}",
+        'section_type': section_type,
+        'year': year,
+        'content': content,
+        'generation_status': 'complete',
+        'model_id': model_id,
+        'generated_at': datetime.utcnow().isoformat(),
+        **snapshot
+    }
+
+
+def generate_section(player_puuid: str, year: int, section_type: str, context: PlayerContext = None,
+                     generator: BedrockInsightGenerator = None, force: bool = False,
+                     deadline: float = None) -> Dict:
+    """
+    Generate a single section using Bedrock. generate_all passes a shared
+    context and generator; a single-section request loads its own.
+    deadline bounds Bedrock retries (see BedrockInsightGenerator.generate).
+    The response cache is consulted first unless force is set; otherwise
+    the section is streamed (STREAM_GENERATION) with partial persistence.
+    """
+    started = time.perf_counter()
+    stream = None
+    usage = {}
+    call_metrics = {}
+    try:
+        if section_type not in SECTION_TYPES:
+            raise ValueError(f"Unknown section type: {section_type}")
+
+        # Prepare data
+        if context is None:
+            context = PlayerContext.load(player_puuid, year)
+
+        if generator is None:
+            generator = BedrockInsightGenerator()
+
+        data_package, champion_recs, cache_key, estimated_tokens = prepare_section_inputs(
+            context, section_type, generator.model_id
+        )
+        content = None if force else get_cached_response(cache_key)
+        cache_hit = content is not None
+        # Only the primary model's responses are cached
+        served_by = generator.model_id
+
+        if not cache_hit:
+            if STREAM_GENERATION:
+                stream = SectionStream(player_puuid, year, section_type)
+
+            content, served_by = generator.generate(section_type, data_package, champion_recs,
+                                                    stream=stream, usage=usage, call_metrics=call_metrics,
+                                                    deadline=deadline)
+
+            # Validate content
+            validate_content(content)
+
+            # Fallback output is not cached under the primary model's key
+            if served_by == generator.model_id:
+                save_cached_response(cache_key, section_type, served_by, content)
+
+            if usage:
+                logger.info(f"{section_type} tokens: {usage.get('input_tokens', 0)} input, "
+                            f"{usage.get('cache_read_input_tokens', 0)} cache read, "
+                            f"{usage.get('cache_creation_input_tokens', 0)} cache write, "
+                            f"{usage.get('output_tokens', 0)} output")
+
+        # Save to DynamoDB (replaces any partial content)
+        item = section_item(player_puuid, year, section_type, content, served_by,
+                            snapshot_data_package(data_package))
+        if stream is not None:
+            item['generation_metrics'] = to_dynamo(stream.metrics)
+        if usage:
+            item['token_usage'] = usage
+        if call_metrics:
+            item['bedrock_metrics'] = to_dynamo(call_metrics)
+
+        insights_table = dynamodb.Table(INSIGHTS_TABLE_NAME)
+        insights_table.put_item(Item=item)
 
         return {
             'success': True,
             'section_type': section_type,
             'content_length': len(content),
-            'player_puuid': player_puuid
+            'player_puuid': player_puuid,
+            'cache_hit': cache_hit,
+            'model_id': served_by,
+            'estimated_input_tokens': estimated_tokens,
+            'token_usage': usage,
+            'bedrock_metrics': call_metrics,
+            'ttft_ms': stream.ttft_ms if stream is not None else None,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
         }
 
     except Exception as e:
         logger.error(f"Error generating section: {str(e)}")
+        if stream is not None:
+            stream.fail(str(e))
         return {
             'success': False,
-            'error': str(e)
+            'section_type': section_type,
+            'error': str(e),
+            'bedrock_metrics': call_metrics,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
         }
 
 
+def generate_all_sections(player_puuid: str, year: int, sections=SECTION_TYPES, force: bool = False,
+                          deadline: float = None) -> Dict:
+    """
+    Generate sections concurrently (at most GENERATION_CONCURRENCY at once),
+    so wall time approaches the slowest section rather than the sum.
+    A failing section does not affect the others. Metrics are loaded
+    once and shared by every section.
+    """
+    started = time.perf_counter()
+    results = []
+
+    try:
+        context = PlayerContext.load(player_puuid, year)
+    except Exception as e:
+        logger.error(f"Error loading player context: {str(e)}")
+        results = [{'success': False, 'section_type': section, 'error': str(e)} for section in sections]
+        context = None
+
+    if context is not None:
+        generator = BedrockInsightGenerator()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(GENERATION_CONCURRENCY, len(sections))),
+                                thread_name_prefix='section') as executor:
+            futures = [
+                (section, executor.submit(generate_section, player_puuid, year, section, context, generator, force,
+                                          deadline))
+                for section in sections
+            ]
+
+            for section, future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error generating section {section}: {str(e)}")
+                    results.append({'success': False, 'section_type': section, 'error': str(e)})
+
+    success_count = sum(1 for r in results if r['success'])
+    wall_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Generated {success_count}/{len(sections)} sections in {wall_ms:.0f} ms "
+                f"(serial would be ~{sum(r.get('latency_ms', 0) for r in results):.0f} ms)")
+
+    return {
+        'success': success_count == len(sections),
+        'sections_generated': success_count,
+        'total_sections': len(sections),
+        'wall_ms': round(wall_ms, 1),
+        'results': results,
+        'model_routing': {model: model_router.stats(model) for model in model_router.outcomes}
+    }
+
+
+# ====================================
+# Batch inference
+# ====================================
+
+def load_contexts(player_puuids: List[str], year: int) -> Dict[str, PlayerContext]:
+    """
+    PlayerContexts for many players with BatchGetItem; unprocessed keys are
+    retried with backoff. Players without metrics are left out.
+    """
+    keys = [{'player_puuid': player_puuid, 'year': year} for player_puuid in player_puuids]
+    return {
+        item['player_puuid']: PlayerContext(item['player_puuid'], year, item)
+        for item in batch_get_items(METRICS_TABLE_NAME, keys, plain=True)
+    }
+
+
+def _batch_key(job_name: str, name: str) -> str:
+    return f"{BATCH_PREFIX}/{job_name}/{name}"
+
+
+def load_batch_job(job_name: str) -> Dict:
+    response = s3_client.get_object(Bucket=BATCH_BUCKET, Key=_batch_key(job_name, 'job.json'))
+    return json.loads(response['Body'].read())
+
+
+def save_batch_job(job: Dict):
+    s3_client.put_object(Bucket=BATCH_BUCKET, Key=_batch_key(job['job_name'], 'job.json'),
+                         Body=dumps(job), ContentType='application/json')
+
+
+def submit_batch_generation(player_puuids: List[str], year: int, sections=SECTION_TYPES, force: bool = False,
+                            control=None, deadline: float = None) -> Dict:
+    """
+    Year-end bulk generation. Every section prompt for the cohort is built
+    exactly as generate_section builds it (without prompt-cache markers)
+    and written as one JSONL record to S3, then submitted as a Bedrock
+    batch inference job. Sections with a cached response are written
+    straight away unless force is set. The job state (job ARN and, per
+    record, player, section, cache key and data package snapshot) is kept
+    in job.json next to the input, for poll_batch_generation to ingest.
+
+    The response cache is read with BatchGetItem and snapshots are stored
+    from a thread pool. Cohorts under BATCH_MIN_RECORDS are generated on
+    demand instead, BATCH_SUBMIT_CONCURRENCY sections at a time.
+    control is the Bedrock control-plane client (a local stand-in in tests);
+    deadline bounds the on-demand sections' Bedrock retries.
+    """
+    started = time.perf_counter()
+    control = control or bedrock
+    generator = BedrockInsightGenerator()
+    job_name = f"riftsage-{ENVIRONMENT}-{year}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+
+    contexts = load_contexts(player_puuids, year)
+    missing = [player_puuid for player_puuid in dict.fromkeys(player_puuids) if player_puuid not in contexts]
+    if missing:
+        logger.warning(f"No metrics for {len(missing)} players; skipping them")
+
+    # (player_puuid, section_type, data_package, champion_recs, cache_key) per section
+    entries = []
+    for player_puuid, context in contexts.items():
+        for section_type in sections:
+            data_package, champion_recs, cache_key, _ = prepare_section_inputs(
+                context, section_type, generator.model_id
+            )
+            entries.append((player_puuid, section_type, data_package, champion_recs, cache_key))
+
+    cached_contents = {} if force else get_cached_responses([entry[4] for entry in entries])
+    cached = [entry for entry in entries if entry[4] in cached_contents]
+    pending = [entry for entry in entries if entry[4] not in cached_contents]
+    # Too few for a batch job (or nothing left to generate)
+    on_demand = len(pending) < BATCH_MIN_RECORDS
+
+    # On-demand sections store their own snapshot when generated
+    snapshot_entries = cached if on_demand else cached + pending
+    with ThreadPoolExecutor(max_workers=max(1, min(BATCH_SUBMIT_CONCURRENCY, len(snapshot_entries))),
+                            thread_name_prefix='snapshot') as executor:
+        snapshots = list(executor.map(snapshot_data_package, [entry[2] for entry in snapshot_entries]))
+
+    if cached:
+        with dynamodb.Table(INSIGHTS_TABLE_NAME).batch_writer() as writer:
+            for (player_puuid, section_type, _, _, cache_key), snapshot in zip(cached, snapshots):
+                writer.put_item(Item=section_item(player_puuid, year, section_type, cached_contents[cache_key],
+                                                  generator.model_id, snapshot))
+
+    result = {
+        'job_name': job_name,
+        'players': len(contexts),
+        'missing_players': missing,
+        'records': len(pending),
+        'cache_hits': len(cached)
+    }
+
+    if on_demand:
+        logger.info(f"{len(pending)} records is below the batch minimum; generating on demand")
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, min(BATCH_SUBMIT_CONCURRENCY, len(pending))),
+                                thread_name_prefix='section') as executor:
+            futures = [
+                (section_type, executor.submit(generate_section, player_puuid, year, section_type,
+                                               contexts[player_puuid], generator, True, deadline))
+                for player_puuid, section_type, _, _, _ in pending
+            ]
+
+            for section_type, future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error generating section {section_type}: {str(e)}")
+                    results.append({'success': False, 'section_type': section_type, 'error': str(e)})
+        failed = [r for r in results if not r['success']]
+        result.update({
+            'success': not failed,
+            'mode': 'on_demand',
+            'ingested': len(results) - len(failed),
+            'failed': [{'section_type': r['section_type'], 'error': r['error']} for r in failed]
+        })
+        return result
+
+    records = []
+    manifest = {}
+    for (player_puuid, section_type, data_package, champion_recs, cache_key), snapshot in zip(
+            pending, snapshots[len(cached):]):
+        # Bedrock record IDs are 11 alphanumeric characters
+        record_id = f"R{len(records):010d}"
+        max_tokens = SECTION_MAX_TOKENS.get(section_type, MAX_TOKENS)
+        records.append({
+            'recordId': record_id,
+            'modelInput': generator.build_request(
+                section_type, generator.data_text(data_package, champion_recs), max_tokens,
+                model_id=BEDROCK_BATCH_MODEL_ID, cacheable=False
+            )
+        })
+        manifest[record_id] = {
+            'player_puuid': player_puuid,
+            'section_type': section_type,
+            'cache_key': cache_key,
+            'snapshot': snapshot
+        }
+
+    input_key = _batch_key(job_name, 'input/records.jsonl')
+    s3_client.put_object(
+        Bucket=BATCH_BUCKET,
+        Key=input_key,
+        Body='\n'.join(json.dumps(record, separators=(',', ':')) for record in records).encode('utf-8'),
+        ContentType='application/jsonl'
+    )
+
+    job = {
+        'job_name': job_name,
+        'year': year,
+        'model_id': BEDROCK_BATCH_MODEL_ID,
+        'output_prefix': _batch_key(job_name, 'output/'),
+        'manifest': manifest
+    }
+
+    response = control.create_model_invocation_job(
+        jobName=job_name,
+        roleArn=BEDROCK_BATCH_ROLE_ARN,
+        modelId=BEDROCK_BATCH_MODEL_ID,
+        inputDataConfig={'s3InputDataConfig': {'s3Uri': f"s3://{BATCH_BUCKET}/{input_key}", 's3InputFormat': 'JSONL'}},
+        outputDataConfig={'s3OutputDataConfig': {'s3Uri': f"s3://{BATCH_BUCKET}/{job['output_prefix']}"}},
+        timeoutDurationInHours=BATCH_TIMEOUT_HOURS
+    )
+    job['job_arn'] = response['jobArn']
+    save_batch_job(job)
+
+    logger.info(f"Submitted batch job {job_name}: {len(records)} records, {len(cached)} cache hits "
+                f"in {(time.perf_counter() - started):.1f}s")
+
+    result.update({'success': True, 'mode': 'batch', 'job_arn': job['job_arn']})
+    return result
+
+
+def _output_records(output_prefix: str):
+    """Records of every .jsonl.out object the job wrote under output_prefix"""
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=BATCH_BUCKET, Prefix=output_prefix):
+        for obj in page.get('Contents', []):
+            if not obj['Key'].endswith('.jsonl.out'):
+                continue
+            body = s3_client.get_object(Bucket=BATCH_BUCKET, Key=obj['Key'])['Body']
+            for line in body.iter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+def ingest_batch_output(job: Dict) -> Dict:
+    """
+    Write a finished job's outputs to GeneratedInsightsTable, validated as
+    generate_section validates them. Records that errored, failed
+    validation or have no output are returned in failed, for on-demand
+    regeneration; their existing items are left untouched.
+    """
+    manifest = job['manifest']
+    year = job['year']
+    seen = set()
+    failed = []
+    ingested = 0
+
+    with dynamodb.Table(INSIGHTS_TABLE_NAME).batch_writer() as writer:
+        for record in _output_records(job['output_prefix']):
+            entry = manifest.get(record.get('recordId'))
+            if entry is None:
+                continue
+            seen.add(record['recordId'])
+
+            usage = {}
+            try:
+                if record.get('error'):
+                    raise ValueError(record['error'].get('errorMessage') or str(record['error']))
+                output = record['modelOutput']
+                content = output['content'][0]['text']
+                validate_content(content)
+                _record_usage(usage, output.get('usage'))
+            except Exception as e:
+                failed.append({'player_puuid': entry['player_puuid'], 'section_type': entry['section_type'],
+                               'error': str(e)})
+                continue
+
+            # As on demand, only the primary model's responses are cached
+            if job['model_id'] == BEDROCK_MODEL_ID:
+                save_cached_response(entry['cache_key'], entry['section_type'], job['model_id'], content)
+
+            item = section_item(entry['player_puuid'], year, entry['section_type'], content, job['model_id'],
+                                entry['snapshot'])
+            item['batch_job'] = job['job_name']
+            if usage:
+                item['token_usage'] = usage
+            writer.put_item(Item=item)
+            ingested += 1
+
+    for record_id, entry in manifest.items():
+        if record_id not in seen:
+            failed.append({'player_puuid': entry['player_puuid'], 'section_type': entry['section_type'],
+                           'error': 'No output record'})
+
+    logger.info(f"Ingested {ingested}/{len(manifest)} batch records from {job['job_name']} ({len(failed)} failed)")
+    return {'ingested': ingested, 'failed': failed}
+
+
+def poll_batch_generation(job_name: str, wait_seconds: float = 0, control=None) -> Dict:
+    """
+    Check a submitted batch job, waiting up to wait_seconds for it to
+    finish. Once Bedrock reports a final status (completed, partially
+    completed, failed, stopped or expired) whatever output exists is
+    ingested, exactly once; later polls return the recorded summary.
+    """
+    control = control or bedrock
+    job = load_batch_job(job_name)
+    if 'summary' in job:
+        return job['summary']
+
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        response = control.get_model_invocation_job(jobIdentifier=job['job_arn'])
+        status = response['status']
+        if status not in BATCH_RUNNING_STATES:
+            break
+        if time.monotonic() + BATCH_POLL_SECONDS > deadline:
+            return {'success': True, 'done': False, 'job_name': job_name, 'status': status}
+        time.sleep(BATCH_POLL_SECONDS)
+
+    summary = {
+        'job_name': job_name,
+        'done': True,
+        'status': status,
+        'message': response.get('message'),
+        'records': len(job['manifest']),
+        **ingest_batch_output(job)
+    }
+    summary['success'] = status == 'Completed' and not summary['failed']
+
+    job['summary'] = summary
+    save_batch_job(job)
+    return summary
+
+
 def lambda_handler(event, context):
     """
     Lambda handler for Bedrock generation
@@ -346,24 +1466,80 @@ def lambda_handler(event, context):
     {
         "player_puuid": "string",
         "year": 2025,
-        "section_type": "role_performance" | "improvement_blueprint" | "mental_resilience" | "champion_mastery"
+        "section_type": "role_performance" | "improvement_blueprint" | "mental_resilience" | "champion_mastery",
+        "force": false
     }
 
     OR generate all sections:
     {
         "player_puuid": "string",
         "year": 2025,
-        "generate_all": true
+        "generate_all": true,
+        "force": false
+    }
+
+    Bedrock responses are cached on a hash of the model, generation
+    settings, prompt version and input data; "force": true regenerates.
+
+    OR year-end batch inference over a cohort (submit once, then poll
+    until "done"; the poll ingests the outputs):
+    {
+        "action": "batch_submit",
+        "player_puuids": ["string", ...],
+        "year": 2025,
+        "force": false
+    }
+    {
+        "action": "batch_poll",
+        "job_name": "string",
+        "wait_seconds": 600
     }
     """
 
     try:
         logger.info(f"Event: {json.dumps(event, default=str)}")
 
+        action = event.get('action')
+
+        if action == 'batch_submit':
+            if not event.get('player_puuids'):
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'player_puuids is required'})
+                }
+            result = submit_batch_generation(
+                event['player_puuids'],
+                event.get('year', datetime.utcnow().year),
+                sections=event.get('sections', SECTION_TYPES),
+                force=bool(event.get('force')),
+                deadline=invocation_deadline(context)
+            )
+            return {
+                'statusCode': 200 if result['success'] else 500,
+                'body': dumps(result)
+            }
+
+        if action == 'batch_poll':
+            if not event.get('job_name'):
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'job_name is required'})
+                }
+            wait_seconds = float(event.get('wait_seconds', 0))
+            if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+                # Leave a minute for ingestion
+                wait_seconds = min(wait_seconds, context.get_remaining_time_in_millis() / 1000 - 60)
+            result = poll_batch_generation(event['job_name'], wait_seconds=max(0.0, wait_seconds))
+            return {
+                'statusCode': 200 if result['success'] or not result['done'] else 500,
+                'body': dumps(result)
+            }
+
         player_puuid = event.get('player_puuid')
         year = event.get('year', datetime.utcnow().year)
         section_type = event.get('section_type')
         generate_all = event.get('generate_all', False)
+        force = bool(event.get('force'))
 
         if not player_puuid:
             return {
@@ -372,29 +1548,17 @@ def lambda_handler(event, context):
             }
 
         if generate_all:
-            # Generate all sections
-            sections = ['role_performance', 'improvement_blueprint', 'mental_resilience', 'champion_mastery']
-            results = []
-
-            for section in sections:
-                result = generate_section(player_puuid, year, section)
-                results.append(result)
-
-            success_count = sum(1 for r in results if r['success'])
-
+            # Generate all sections concurrently
             return {
                 'statusCode': 200,
-                'body': json.dumps({
-                    'success': success_count == len(sections),
-                    'sections_generated': success_count,
-                    'total_sections': len(sections),
-                    'results': results
-                })
+                'body': json.dumps(generate_all_sections(player_puuid, year, force=force,
+                                                         deadline=invocation_deadline(context)))
             }
 
         elif section_type:
             # Generate single section
-            result = generate_section(player_puuid, year, section_type)
+            result = generate_section(player_puuid, year, section_type, force=force,
+                                      deadline=invocation_deadline(context))
 
             if result['success']:
                 return {
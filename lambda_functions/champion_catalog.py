@@ -0,0 +1,171 @@
+"""
+RiftSage AI Agent - Champion Catalog
+In-memory champion recommendation index, loaded once per container
+
+Each role is read from ChampionRecommendationsTable through RoleIndex on
+first use and kept for CHAMPION_CATALOG_TTL_SECONDS. Per role the catalog
+holds the champion items, a float64 matrix of their numeric columns and
+an index of row numbers by playstyle_fit, so a recommendation is one
+vectorized distance computation over a few dozen rows.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List
+
+import lazy
+from codec import from_dynamo
+
+# numpy is executed on first use, so importing this module stays cheap
+np = lazy.lazy_import('numpy')
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients
+dynamodb = lazy.resource('dynamodb')
+
+# Environment variables
+CHAMPION_RECS_TABLE_NAME = os.environ.get('CHAMPION_RECS_TABLE')
+CATALOG_TTL_SECONDS = int(os.environ.get('CHAMPION_CATALOG_TTL_SECONDS', 3600))
+
+ROLE_INDEX = 'RoleIndex'
+
+# (catalog column, player metric it is compared with)
+FEATURE_COLUMNS = (
+    ('avg_cs_min', 'avg_cs_per_min'),
+    ('avg_vision_min', 'avg_vision_score_per_min'),
+    ('avg_kda', 'kda'),
+    ('avg_damage_share', 'avg_damage_share'),
+)
+
+
+def _positive_or_nan(value) -> float:
+    """Missing, None or non-positive values are treated as unknown"""
+    if value is None:
+        return float('nan')
+    value = float(value)
+    return value if value > 0 else float('nan')
+
+
+def player_vector(metrics: Dict):
+    """The player's metrics in FEATURE_COLUMNS order (NaN where unknown)"""
+    return np.array([_positive_or_nan(metrics.get(metric)) for _, metric in FEATURE_COLUMNS])
+
+
+class RoleCatalog:
+    """Champions of one role: items, feature matrix and playstyle_fit index"""
+
+    def __init__(self, role: str, champions: List[Dict]):
+        self.role = role
+        self.champions = champions
+        self.loaded_at = time.monotonic()
+
+        matrix = np.array(
+            [[_positive_or_nan(champion.get(column)) for column, _ in FEATURE_COLUMNS] for champion in champions],
+            dtype=np.float64
+        ).reshape(len(champions), len(FEATURE_COLUMNS))
+        missing = np.isnan(matrix)
+
+        # Distances are measured in units of each column's spread within the role
+        counts = (~missing).sum(axis=0)
+        means = np.where(counts > 0, np.where(missing, 0.0, matrix).sum(axis=0) / np.maximum(counts, 1), np.nan)
+        spread = np.sqrt(
+            np.where(missing, 0.0, (matrix - means) ** 2).sum(axis=0) / np.maximum(counts, 1)
+        )
+        self.scale = np.where((counts > 1) & (spread > 0), spread, 1.0)
+
+        # Missing champion values are imputed with the role's column mean, so
+        # a champion with little data sits at the average instead of matching
+        # every player; columns no champion has are not compared at all
+        self.compared = counts > 0
+        self.matrix = np.where(missing, means, matrix)
+
+        fit_rows = {}
+        for row, champion in enumerate(champions):
+            for fit in champion.get('playstyle_fit') or []:
+                fit_rows.setdefault(fit, []).append(row)
+        self.by_fit = {fit: np.array(rows, dtype=np.intp) for fit, rows in fit_rows.items()}
+
+    def recommend(self, vector, archetype: str = None, k: int = 3) -> List[Dict]:
+        """
+        Top-k champions: those whose playstyle_fit contains the archetype
+        first, then the rest, each ordered by standardized distance to the
+        player's vector. Distance is the root-mean-square standardized
+        difference over the dimensions compared (known for the player and
+        for at least one champion); missing champion values were imputed
+        with the column mean.
+        """
+        if not self.champions:
+            return []
+
+        known = ~np.isnan(vector) & self.compared
+        diff = (self.matrix[:, known] - vector[known]) / self.scale[known]
+        distance = np.sqrt((diff * diff).sum(axis=1) / max(1, int(known.sum())))
+
+        fits = np.zeros(len(self.champions), dtype=bool)
+        if archetype in self.by_fit:
+            fits[self.by_fit[archetype]] = True
+
+        # lexsort: last key is primary, so archetype matches come first
+        order = np.lexsort((distance, ~fits))[:k]
+
+        return [
+            {**self.champions[row], 'archetype_match': bool(fits[row]), 'distance': round(float(distance[row]), 3)}
+            for row in order
+        ]
+
+
+class ChampionCatalog:
+    """Per-container cache of RoleCatalogs, loaded lazily per role"""
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self.roles: Dict[str, RoleCatalog] = {}
+        self._lock = threading.Lock()
+
+    def _query_role(self, role: str) -> List[Dict]:
+        table = dynamodb.Table(self.table_name)
+        kwargs = {
+            'IndexName': ROLE_INDEX,
+            'KeyConditionExpression': '#role = :role',
+            'ExpressionAttributeNames': {'#role': 'role'},
+            'ExpressionAttributeValues': {':role': role}
+        }
+
+        champions = []
+        while True:
+            response = table.query(**kwargs)
+            champions.extend(from_dynamo(item) for item in response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        # Stable row order regardless of index paging
+        champions.sort(key=lambda champion: champion['champion_name'])
+        return champions
+
+    def role(self, role: str) -> RoleCatalog:
+        catalog = self.roles.get(role)
+        if catalog is not None and time.monotonic() - catalog.loaded_at < CATALOG_TTL_SECONDS:
+            return catalog
+
+        with self._lock:
+            catalog = self.roles.get(role)
+            if catalog is None or time.monotonic() - catalog.loaded_at >= CATALOG_TTL_SECONDS:
+                catalog = RoleCatalog(role, self._query_role(role))
+                self.roles[role] = catalog
+                logger.info(f"Loaded champion catalog for {role}: {len(catalog.champions)} champions")
+            return catalog
+
+    def recommend(self, metrics: Dict, archetype: str = None, k: int = 3) -> List[Dict]:
+        """Top-k champions for a player's primary role, metrics and archetype"""
+        role = metrics.get('primary_role')
+        if not role or role == 'UNKNOWN':
+            return []
+        return self.role(role).recommend(player_vector(metrics), archetype, k)
+
+
+champion_catalog = ChampionCatalog(CHAMPION_RECS_TABLE_NAME)
@@ -0,0 +1,206 @@
+"""
+RiftSage AI Agent - Shared Codec
+Decimal <-> float conversion for DynamoDB items and JSON dumping, and
+decoding of low-level client items without Decimals
+"""
+
+import json
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+
+def _decimal_to_number(value: Decimal) -> Any:
+    """Convert a DynamoDB Decimal to int when integral (exactly, at any size), float otherwise"""
+    number = float(value)
+    if number.is_integer():
+        # int(value), not int(number): floats lose precision past 2**53
+        integer = int(value)
+        if integer == value:
+            return integer
+    return number
+
+
+def _float_to_decimal(value: float) -> Decimal:
+    """Convert a float to Decimal via its shortest repr (DynamoDB rejects floats)"""
+    # float() so subclasses such as numpy.float64 use the plain float repr
+    return Decimal(repr(float(value)))
+
+
+# Leaf types that are never converted or walked (exact-type fast path)
+_PLAIN_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _transform(root: Any, leaf_type: type, convert: Callable[[Any], Any]) -> Any:
+    """
+    Iteratively rebuild nested dicts/lists, converting leaves of leaf_type.
+
+    Dispatch is on exact type first, so the common str/int/bool/None
+    leaves are copied without any conversion work; other types fall back
+    to isinstance, so subclasses (numpy.float64, OrderedDict, ...) are
+    converted as before.
+    """
+    if isinstance(root, leaf_type):
+        return convert(root)
+    if isinstance(root, dict):
+        result = {}
+    elif isinstance(root, list):
+        result = []
+    else:
+        return root
+
+    stack = [(root, result)]
+    push = stack.append
+    pop = stack.pop
+
+    while stack:
+        source, target = pop()
+
+        if type(target) is dict:
+            for key, value in source.items():
+                value_type = type(value)
+                if value_type is leaf_type:
+                    target[key] = convert(value)
+                elif value_type is dict:
+                    child = target[key] = {}
+                    push((value, child))
+                elif value_type is list:
+                    child = target[key] = []
+                    push((value, child))
+                elif value_type in _PLAIN_TYPES:
+                    target[key] = value
+                elif isinstance(value, leaf_type):
+                    target[key] = convert(value)
+                elif isinstance(value, dict):
+                    child = target[key] = {}
+                    push((value, child))
+                elif isinstance(value, list):
+                    child = target[key] = []
+                    push((value, child))
+                else:
+                    target[key] = value
+        else:
+            append = target.append
+            for value in source:
+                value_type = type(value)
+                if value_type is leaf_type:
+                    append(convert(value))
+                elif value_type is dict:
+                    child = {}
+                    append(child)
+                    push((value, child))
+                elif value_type is list:
+                    child = []
+                    append(child)
+                    push((value, child))
+                elif value_type in _PLAIN_TYPES:
+                    append(value)
+                elif isinstance(value, leaf_type):
+                    append(convert(value))
+                elif isinstance(value, dict):
+                    child = {}
+                    append(child)
+                    push((value, child))
+                elif isinstance(value, list):
+                    child = []
+                    append(child)
+                    push((value, child))
+                else:
+                    append(value)
+
+    return result
+
+
+def to_dynamo(obj: Any) -> Any:
+    """Convert floats to Decimal so the item can be written to DynamoDB"""
+    return _transform(obj, float, _float_to_decimal)
+
+
+def from_dynamo(obj: Any) -> Any:
+    """Convert DynamoDB Decimals back to int/float"""
+    return _transform(obj, Decimal, _decimal_to_number)
+
+
+def _wire_number(text: str) -> Any:
+    """A low-level 'N' value as int/float, the same as _decimal_to_number would give"""
+    if text.isdigit() or (text[:1] == '-' and text[1:].isdigit()):
+        return int(text)
+    number = float(text)
+    if number.is_integer():
+        # '5.0', '1E+3', ...: rare, so the exact Decimal check is affordable
+        return _decimal_to_number(Decimal(text))
+    return number
+
+
+def _from_wire_value(value: Dict) -> Any:
+    for tag, data in value.items():
+        if tag == 'N':
+            return _wire_number(data)
+        if tag == 'S' or tag == 'BOOL' or tag == 'B':
+            return data
+        if tag == 'M':
+            return from_wire(data)
+        if tag == 'L':
+            return [_from_wire_value(item) for item in data]
+        if tag == 'NULL':
+            return None
+        if tag == 'NS':
+            return {_wire_number(item) for item in data}
+        if tag == 'SS' or tag == 'BS':
+            return set(data)
+        raise TypeError(f"Unknown DynamoDB attribute type {tag}")
+
+
+def from_wire(item: Dict) -> Dict:
+    """
+    Decode a low-level client item ({'kda': {'N': '3.2'}, ...}) straight to
+    plain Python, numbers as int/float like from_dynamo. No Decimal is
+    created, which makes numeric items several times cheaper to decode
+    than the resource layer's Decimals followed by from_dynamo.
+    """
+    return {key: _from_wire_value(value) for key, value in item.items()}
+
+
+def _to_wire_value(value: Any) -> Dict:
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, float):
+        return {'N': repr(float(value))}
+    if isinstance(value, (int, Decimal)):
+        return {'N': str(value)}
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, dict):
+        return {'M': to_wire(value)}
+    if isinstance(value, list):
+        return {'L': [_to_wire_value(item) for item in value]}
+    raise TypeError(f"Cannot encode {type(value).__name__} for DynamoDB")
+
+
+def to_wire(item: Dict) -> Dict:
+    """Encode a plain item (keys, small maps) in the low-level client format"""
+    return {key: _to_wire_value(value) for key, value in item.items()}
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for types the stdlib encoder does not handle"""
+    if isinstance(obj, Decimal):
+        return _decimal_to_number(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # numpy scalars (np.int64, np.bool_) from the vectorized scorers
+    if type(obj).__module__ == 'numpy' and hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, **kwargs) -> str:
+    """
+    JSON-encode obj, serializing Decimals directly.
+
+    The C encoder walks the structure itself and only calls back for
+    Decimal/unknown leaves, so no separate conversion pass is needed.
+    """
+    kwargs.setdefault('default', _json_default)
+    return json.dumps(obj, **kwargs)
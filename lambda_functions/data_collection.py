@@ -5,20 +5,22 @@ Fetches match history from Riot API and stores in S3
 
 import json
 import os
-import boto3
 import time
 from datetime import datetime
 from typing import Dict, List, Any
 import logging
 
+import lazy
+from codec import to_dynamo, dumps
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-secrets_client = boto3.client('secretsmanager')
+s3_client = lazy.client('s3')
+dynamodb = lazy.resource('dynamodb')
+secrets_client = lazy.client('secretsmanager')
 
 # Environment variables
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'development')
@@ -166,6 +168,7 @@ def check_cache(match_id: str) -> Dict:
             # Check if cache is still valid
             ttl = response['Item'].get('ttl', 0)
             if int(time.time()) < ttl:
+                # Left as Decimals: match data only goes to S3 through dumps, which serializes them
                 return response['Item'].get('match_data')
 
         return None
@@ -185,7 +188,7 @@ def save_to_cache(match_id: str, match_data: Dict):
         cache_table.put_item(
             Item={
                 'match_id': match_id,
-                'match_data': match_data,
+                'match_data': to_dynamo(match_data),
                 'ttl': ttl,
                 'cached_at': datetime.utcnow().isoformat()
             }
@@ -203,7 +206,7 @@ def save_to_s3(player_puuid: str, match_data: Dict, match_id: str):
         s3_client.put_object(
             Bucket=DATA_BUCKET,
             Key=key,
-            Body=json.dumps(match_data, indent=2),
+            Body=dumps(match_data, indent=2),
             ContentType='application/json',
             Metadata={
                 'player_puuid': player_puuid,
@@ -0,0 +1,180 @@
+"""
+RiftSage AI Agent - Distributed Semaphore
+Concurrency limit shared by every Lambda container, kept in DynamoDB
+
+One item per semaphore holds a map of leases (lease id -> expiry epoch).
+A permit is taken with a conditional update that only succeeds while
+size(holders) < limit, so the count is enforced by DynamoDB rather than by
+any one container. Leases expire, so a container that dies holding a
+permit cannot leak it: waiters remove expired leases before backing off.
+
+    semaphore = DistributedSemaphore(RATE_LIMIT_TABLE_NAME, 'bedrock', limit=8)
+    with semaphore.hold() as permit:
+        ...                                  # permit['queue_wait_ms']
+
+Waiting uses decorrelated-jitter backoff; SemaphoreTimeout is raised after
+wait_timeout seconds.
+"""
+
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import lazy
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients
+# Per thread: permits are taken from concurrent section workers
+dynamodb = lazy.thread_resource('dynamodb')
+
+
+class SemaphoreTimeout(Exception):
+    """No permit became free within the wait timeout"""
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """Next backoff delay: uniform between base and 3x the previous delay, capped"""
+    return min(cap, random.uniform(base, max(base, previous) * 3))
+
+
+def _error_code(error: Exception) -> str:
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code', '')
+
+
+class DistributedSemaphore:
+    """Counting semaphore over one item of a DynamoDB table keyed by user_action"""
+
+    def __init__(self, table_name: str, name: str, limit: int, lease_seconds: int = 300,
+                 wait_timeout: float = 120, base_delay: float = 0.05, max_delay: float = 2.0):
+        self.table_name = table_name
+        self.key = {'user_action': f"semaphore#{name}"}
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self.wait_timeout = wait_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _try_acquire(self, table, lease_id: str) -> bool:
+        try:
+            table.update_item(
+                Key=self.key,
+                UpdateExpression='SET #holders.#lease = :expires',
+                ConditionExpression='attribute_exists(#holders) AND size(#holders) < :limit',
+                ExpressionAttributeNames={'#holders': 'holders', '#lease': lease_id},
+                ExpressionAttributeValues={
+                    ':expires': int(time.time()) + self.lease_seconds,
+                    ':limit': self.limit
+                }
+            )
+            return True
+        except Exception as e:
+            if _error_code(e) == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+    def _repair(self, table) -> bool:
+        """Create the item if missing and drop expired leases; True if a slot may have opened"""
+        item = table.get_item(Key=self.key, ConsistentRead=True).get('Item')
+
+        if item is None or 'holders' not in item:
+            try:
+                table.update_item(
+                    Key=self.key,
+                    UpdateExpression='SET #holders = :empty',
+                    ConditionExpression='attribute_not_exists(#holders)',
+                    ExpressionAttributeNames={'#holders': 'holders'},
+                    ExpressionAttributeValues={':empty': {}}
+                )
+            except Exception as e:
+                if _error_code(e) != 'ConditionalCheckFailedException':
+                    raise
+            return True
+
+        now = int(time.time())
+        reaped = False
+        for lease_id, expires in item['holders'].items():
+            if expires >= now:
+                continue
+            try:
+                # Conditional, so a lease renewed meanwhile is left alone
+                table.update_item(
+                    Key=self.key,
+                    UpdateExpression='REMOVE #holders.#lease',
+                    ConditionExpression='#holders.#lease = :expires',
+                    ExpressionAttributeNames={'#holders': 'holders', '#lease': lease_id},
+                    ExpressionAttributeValues={':expires': expires}
+                )
+                logger.warning(f"Reclaimed expired lease {lease_id} on {self.key['user_action']}")
+                reaped = True
+            except Exception as e:
+                if _error_code(e) != 'ConditionalCheckFailedException':
+                    raise
+        return reaped
+
+    def acquire(self, wait_timeout: float = None) -> Dict:
+        """
+        Wait for a permit (at most wait_timeout seconds, default the
+        semaphore's). Returns the permit: lease_id, queue_wait_ms and
+        attempts. DynamoDB errors other than a full semaphore fail open
+        (lease_id None) so the limiter never takes generation down with it.
+        """
+        wait_timeout = self.wait_timeout if wait_timeout is None else wait_timeout
+        table = dynamodb.Table(self.table_name)
+        lease_id = uuid.uuid4().hex
+        started = time.perf_counter()
+        delay = self.base_delay
+        attempts = 0
+
+        try:
+            while True:
+                attempts += 1
+                if self._try_acquire(table, lease_id):
+                    break
+                if self._repair(table):
+                    continue
+
+                waited = time.perf_counter() - started
+                if waited >= wait_timeout:
+                    raise SemaphoreTimeout(
+                        f"No {self.key['user_action']} permit after {waited:.1f}s ({self.limit} in use)"
+                    )
+                delay = decorrelated_jitter(delay, self.base_delay, self.max_delay)
+                time.sleep(min(delay, wait_timeout - waited))
+        except SemaphoreTimeout:
+            raise
+        except Exception as e:
+            logger.warning(f"Semaphore unavailable, proceeding without a permit: {str(e)}")
+            lease_id = None
+
+        return {
+            'lease_id': lease_id,
+            'queue_wait_ms': round((time.perf_counter() - started) * 1000, 1),
+            'attempts': attempts
+        }
+
+    def release(self, permit: Dict):
+        if permit.get('lease_id') is None:
+            return
+        try:
+            dynamodb.Table(self.table_name).update_item(
+                Key=self.key,
+                UpdateExpression='REMOVE #holders.#lease',
+                ExpressionAttributeNames={'#holders': 'holders', '#lease': permit['lease_id']}
+            )
+        except Exception as e:
+            # The lease expires on its own
+            logger.warning(f"Error releasing semaphore lease: {str(e)}")
+
+    @contextmanager
+    def hold(self, wait_timeout: float = None) -> Iterator[Dict]:
+        permit = self.acquire(wait_timeout)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
@@ -5,31 +5,104 @@ Transforms raw match data into ML-ready features
 
 import json
 import os
-import boto3
 import logging
 from datetime import datetime
-from typing import Dict, List, Any
-from decimal import Decimal
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_plus
+from typing import Dict, List, Any, Tuple
+
+import lazy
+from codec import to_dynamo, dumps
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+s3_client = lazy.client('s3')
+dynamodb = lazy.resource('dynamodb')
 
 # Environment variables
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'development')
 DATA_BUCKET = os.environ.get('DATA_BUCKET')
 METRICS_TABLE_NAME = os.environ.get('METRICS_TABLE')
 
+# Upper bound on records processed in parallel from one batched event
+RECORD_CONCURRENCY = int(os.environ.get('RECORD_CONCURRENCY', 8))
+
+# Extracted feature records are stored under features/ mirroring raw-matches/.
+# Bump FEATURE_SCHEMA_VERSION whenever extract_features_from_match output changes
+# so previously stored records are recognised as stale and re-extracted.
+#   2: challenges reduced to the CHALLENGE_FIELDS projection
+FEATURE_SCHEMA_VERSION = 2
+RAW_MATCHES_PREFIX = 'raw-matches'
+FEATURES_PREFIX = 'features'
+
+
+# Riot challenge stats kept on each feature record; the full map has 100+ entries
+CHALLENGE_FIELDS = (
+    'killParticipation',
+    'teamDamagePercentage',
+    'damagePerMinute',
+    'goldPerMinute',
+    'visionScorePerMinute',
+    'soloKills',
+    'laneMinionsFirst10Minutes',
+    'maxCsAdvantageOnLaneOpponent',
+    'dragonTakedowns',
+    'baronTakedowns',
+    'riftHeraldTakedowns',
+    'turretPlatesTaken',
+)
+
+
+class MatchFeatures:
+    """
+    Compact per-match feature record.
+    Uses __slots__ instead of a per-instance dict, and keeps only the
+    whitelisted CHALLENGE_FIELDS instead of the full challenges map.
+    """
+
+    __slots__ = (
+        # Match metadata
+        'match_id', 'game_creation', 'game_duration', 'game_mode', 'game_type',
+        # Participant info
+        'champion_name', 'champion_id', 'role', 'team_position',
+        # Core stats
+        'win', 'kills', 'deaths', 'assists', 'kda',
+        # Farm
+        'total_minions_killed', 'neutral_minions_killed', 'total_cs', 'cs_per_min',
+        # Gold
+        'gold_earned', 'gold_spent', 'gold_per_min',
+        # Damage
+        'total_damage_dealt', 'total_damage_taken', 'damage_efficiency',
+        # Vision
+        'vision_score', 'vision_score_per_min', 'wards_placed', 'wards_killed', 'control_wards_placed',
+        # Objectives
+        'turret_kills', 'inhibitor_kills', 'objective_participation',
+        # Performance indicators
+        'double_kills', 'triple_kills', 'quadra_kills', 'penta_kills', 'first_blood',
+        # Challenges projection (CHALLENGE_FIELDS only)
+        'challenges',
+        # Special flags
+        'is_comeback_game', 'early_surrender', 'late_game',
+    )
 
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert Decimal to float for JSON serialization"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+        challenges = self.challenges or {}
+        self.challenges = {key: challenges[key] for key in CHALLENGE_FIELDS if key in challenges}
+
+    def to_dict(self) -> Dict:
+        """Plain dict for JSON storage"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MatchFeatures':
+        """Rebuild a record from its stored dict form"""
+        return cls(**data)
 
 
 def calculate_kda(kills: int, deaths: int, assists: int) -> float:
@@ -136,7 +209,7 @@ def calculate_objective_participation(participant_data: Dict, team_data: Dict) -
         return 0.0
 
 
-def extract_features_from_match(match_data: Dict, player_puuid: str) -> Dict:
+def extract_features_from_match(match_data: Dict, player_puuid: str) -> MatchFeatures:
     """Extract all features from a single match"""
 
     try:
@@ -167,86 +240,86 @@ def extract_features_from_match(match_data: Dict, player_puuid: str) -> Dict:
         # Extract basic stats
         game_duration = info['gameDuration']
 
-        features = {
+        features = MatchFeatures(
             # Match metadata
-            'match_id': metadata['matchId'],
-            'game_creation': info['gameCreation'],
-            'game_duration': game_duration,
-            'game_mode': info['gameMode'],
-            'game_type': info['gameType'],
+            match_id=metadata['matchId'],
+            game_creation=info['gameCreation'],
+            game_duration=game_duration,
+            game_mode=info['gameMode'],
+            game_type=info['gameType'],
 
             # Participant info
-            'champion_name': participant_data['championName'],
-            'champion_id': participant_data['championId'],
-            'role': determine_primary_role(match_data, participant_data),
-            'team_position': participant_data.get('teamPosition', ''),
+            champion_name=participant_data['championName'],
+            champion_id=participant_data['championId'],
+            role=determine_primary_role(match_data, participant_data),
+            team_position=participant_data.get('teamPosition', ''),
 
             # Core stats
-            'win': participant_data['win'],
-            'kills': participant_data['kills'],
-            'deaths': participant_data['deaths'],
-            'assists': participant_data['assists'],
-            'kda': calculate_kda(
+            win=participant_data['win'],
+            kills=participant_data['kills'],
+            deaths=participant_data['deaths'],
+            assists=participant_data['assists'],
+            kda=calculate_kda(
                 participant_data['kills'],
                 participant_data['deaths'],
                 participant_data['assists']
             ),
 
             # Farm
-            'total_minions_killed': participant_data['totalMinionsKilled'],
-            'neutral_minions_killed': participant_data['neutralMinionsKilled'],
-            'total_cs': participant_data['totalMinionsKilled'] + participant_data['neutralMinionsKilled'],
-            'cs_per_min': calculate_cs_per_min(
+            total_minions_killed=participant_data['totalMinionsKilled'],
+            neutral_minions_killed=participant_data['neutralMinionsKilled'],
+            total_cs=participant_data['totalMinionsKilled'] + participant_data['neutralMinionsKilled'],
+            cs_per_min=calculate_cs_per_min(
                 participant_data['totalMinionsKilled'] + participant_data['neutralMinionsKilled'],
                 game_duration
             ),
 
             # Gold
-            'gold_earned': participant_data['goldEarned'],
-            'gold_spent': participant_data['goldSpent'],
-            'gold_per_min': calculate_gold_per_min(
+            gold_earned=participant_data['goldEarned'],
+            gold_spent=participant_data['goldSpent'],
+            gold_per_min=calculate_gold_per_min(
                 participant_data['goldEarned'],
                 game_duration
             ),
 
             # Damage
-            'total_damage_dealt': participant_data['totalDamageDealtToChampions'],
-            'total_damage_taken': participant_data['totalDamageTaken'],
-            'damage_efficiency': calculate_damage_efficiency(
+            total_damage_dealt=participant_data['totalDamageDealtToChampions'],
+            total_damage_taken=participant_data['totalDamageTaken'],
+            damage_efficiency=calculate_damage_efficiency(
                 participant_data['totalDamageDealtToChampions'],
                 participant_data['totalDamageTaken']
             ),
 
             # Vision
-            'vision_score': participant_data['visionScore'],
-            'vision_score_per_min': calculate_vision_score_per_min(
+            vision_score=participant_data['visionScore'],
+            vision_score_per_min=calculate_vision_score_per_min(
                 participant_data['visionScore'],
                 game_duration
             ),
-            'wards_placed': participant_data['wardsPlaced'],
-            'wards_killed': participant_data['wardsKilled'],
-            'control_wards_placed': participant_data.get('detectorWardsPlaced', 0),
+            wards_placed=participant_data['wardsPlaced'],
+            wards_killed=participant_data['wardsKilled'],
+            control_wards_placed=participant_data.get('detectorWardsPlaced', 0),
 
             # Objectives
-            'turret_kills': participant_data.get('turretKills', 0),
-            'inhibitor_kills': participant_data.get('inhibitorKills', 0),
-            'objective_participation': calculate_objective_participation(participant_data, team_data),
+            turret_kills=participant_data.get('turretKills', 0),
+            inhibitor_kills=participant_data.get('inhibitorKills', 0),
+            objective_participation=calculate_objective_participation(participant_data, team_data),
 
             # Performance indicators
-            'double_kills': participant_data.get('doubleKills', 0),
-            'triple_kills': participant_data.get('tripleKills', 0),
-            'quadra_kills': participant_data.get('quadraKills', 0),
-            'penta_kills': participant_data.get('pentaKills', 0),
-            'first_blood': participant_data.get('firstBloodKill', False),
+            double_kills=participant_data.get('doubleKills', 0),
+            triple_kills=participant_data.get('tripleKills', 0),
+            quadra_kills=participant_data.get('quadraKills', 0),
+            penta_kills=participant_data.get('pentaKills', 0),
+            first_blood=participant_data.get('firstBloodKill', False),
 
-            # Challenges (if available)
-            'challenges': participant_data.get('challenges', {}),
+            # Challenges (whitelisted projection, if available)
+            challenges=participant_data.get('challenges', {}),
 
             # Special flags
-            'is_comeback_game': identify_comeback_game(match_data, participant_data),
-            'early_surrender': game_duration < 900,  # Less than 15 minutes
-            'late_game': game_duration > 2100,  # More than 35 minutes
-        }
+            is_comeback_game=identify_comeback_game(match_data, participant_data),
+            early_surrender=game_duration < 900,  # Less than 15 minutes
+            late_game=game_duration > 2100,  # More than 35 minutes
+        )
 
         return features
 
@@ -255,30 +328,189 @@ def extract_features_from_match(match_data: Dict, player_puuid: str) -> Dict:
         raise
 
 
-def aggregate_metrics(all_match_features: List[Dict], year: int) -> Dict:
+def get_feature_key(raw_key: str) -> str:
+    """Map raw-matches/PUUID/YEAR/match_id.json to its feature record key"""
+    return FEATURES_PREFIX + raw_key[len(RAW_MATCHES_PREFIX):]
+
+
+def normalize_etag(etag: str) -> str:
+    """S3 listings quote ETags while event notifications do not"""
+    return etag.strip('"') if etag else etag
+
+
+def load_feature_record(bucket: str, raw_key: str, source_etag: str) -> MatchFeatures:
+    """
+    Load stored features for a raw match if they are still current,
+    i.e. written by this schema version from the same source object
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=get_feature_key(raw_key))
+        record = json.loads(response['Body'].read())
+
+        if (record.get('schema_version') == FEATURE_SCHEMA_VERSION and
+                record.get('source_etag') == source_etag):
+            return MatchFeatures.from_dict(record['features'])
+
+        return None
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    except Exception as e:
+        logger.warning(f"Error loading feature record for {raw_key}: {str(e)}")
+        return None
+
+
+def save_feature_record(bucket: str, raw_key: str, source_etag: str, features: MatchFeatures):
+    """Store extracted features tagged with schema version and source ETag"""
+    try:
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=get_feature_key(raw_key),
+            Body=dumps({
+                'schema_version': FEATURE_SCHEMA_VERSION,
+                'source_key': raw_key,
+                'source_etag': source_etag,
+                'extracted_at': datetime.utcnow().isoformat(),
+                'features': features.to_dict()
+            }),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        logger.warning(f"Error saving feature record for {raw_key}: {str(e)}")
+
+
+def get_match_features(bucket: str, raw_key: str, player_puuid: str,
+                       source_etag: str = None, force: bool = False) -> Tuple[MatchFeatures, bool]:
+    """
+    Return (features, reused) for a raw match object.
+    Stored features are reused unless the schema version or source ETag
+    changed, or force is set.
+    """
+    source_etag = normalize_etag(source_etag)
+
+    if not force and source_etag:
+        features = load_feature_record(bucket, raw_key, source_etag)
+        if features is not None:
+            return features, True
+
+    response = s3_client.get_object(Bucket=bucket, Key=raw_key)
+    match_data = json.loads(response['Body'].read())
+
+    features = extract_features_from_match(match_data, player_puuid)
+    save_feature_record(bucket, raw_key, normalize_etag(response.get('ETag')), features)
+
+    return features, False
+
+
+def process_s3_record(s3_record: Dict, force: bool = False) -> Dict:
+    """Extract features for the raw match referenced by one S3 notification record"""
+    bucket = s3_record['s3']['bucket']['name']
+    # Keys in S3 notifications are URL-encoded
+    key = unquote_plus(s3_record['s3']['object']['key'])
+
+    # Parse key to extract player_puuid and year
+    # Format: raw-matches/PUUID/YEAR/match_id.json
+    parts = key.split('/')
+    if len(parts) != 4 or parts[0] != RAW_MATCHES_PREFIX:
+        logger.warning(f"Invalid S3 key format: {key}")
+        return {'key': key, 'skipped': True}
+
+    player_puuid = parts[1]
+
+    # Extract features (reusing the stored record if still current)
+    features, reused = get_match_features(
+        bucket, key, player_puuid,
+        source_etag=s3_record['s3']['object'].get('eTag'),
+        force=force
+    )
+
+    logger.info(f"{'Reused' if reused else 'Extracted'} features for match {features.match_id}")
+
+    return {
+        'key': key,
+        'match_id': features.match_id,
+        'player_puuid': player_puuid,
+        'features_reused': reused
+    }
+
+
+class EventRecordsFailed(Exception):
+    """Records of a direct (asynchronous) S3 invocation failed; raised so Lambda retries the event"""
+
+
+def process_event_records(records: List[Dict], force: bool = False) -> Dict:
+    """
+    Process every record of a batched event through a bounded thread pool.
+
+    Records are either S3 notifications or SQS messages wrapping S3
+    notifications. Returns per-record results plus the identifiers
+    (SQS messageId, or object key for direct S3 events) that failed.
+    """
+    # (identifier, s3_record) pairs; one SQS message may carry several S3 records
+    tasks = []
+    failed_identifiers = []
+
+    for record in records:
+        if record.get('eventSource') == 'aws:sqs':
+            try:
+                body = json.loads(record['body'])
+            except Exception as e:
+                logger.error(f"Invalid SQS message {record.get('messageId')}: {str(e)}")
+                failed_identifiers.append(record['messageId'])
+                continue
+            # s3:TestEvent messages carry no Records and are simply acknowledged
+            for s3_record in body.get('Records', []):
+                tasks.append((record['messageId'], s3_record))
+        else:
+            tasks.append((record['s3']['object']['key'], record))
+
+    results = []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(RECORD_CONCURRENCY, len(tasks)))) as executor:
+        futures = [
+            (identifier, executor.submit(process_s3_record, s3_record, force))
+            for identifier, s3_record in tasks
+        ]
+
+        for identifier, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Error processing record {identifier}: {str(e)}")
+                if identifier not in failed_identifiers:
+                    failed_identifiers.append(identifier)
+
+    return {
+        'results': results,
+        'failed_identifiers': failed_identifiers
+    }
+
+
+def aggregate_metrics(all_match_features: List[MatchFeatures], year: int) -> Dict:
     """Aggregate features across all matches for a player"""
 
     if not all_match_features:
         return {}
 
     total_games = len(all_match_features)
-    wins = sum(1 for m in all_match_features if m['win'])
+    wins = sum(1 for m in all_match_features if m.win)
 
     # Aggregate by role
-    roles = {}
-    for match in all_match_features:
-        role = match['role']
-        if role not in roles:
-            roles[role] = []
-        roles[role].append(match)
+    roles = Counter(m.role for m in all_match_features)
 
     # Determine primary role (most games)
-    primary_role = max(roles.keys(), key=lambda r: len(roles[r])) if roles else 'UNKNOWN'
+    primary_role = max(roles.keys(), key=lambda r: roles[r]) if roles else 'UNKNOWN'
 
     # Calculate averages
-    total_kills = sum(m['kills'] for m in all_match_features)
-    total_deaths = sum(m['deaths'] for m in all_match_features)
-    total_assists = sum(m['assists'] for m in all_match_features)
+    total_kills = sum(m.kills for m in all_match_features)
+    total_deaths = sum(m.deaths for m in all_match_features)
+    total_assists = sum(m.assists for m in all_match_features)
+
+    # Champion pool
+    champion_games = Counter(m.champion_name for m in all_match_features)
+
+    # Share of team damage (0-1), from the challenges projection when Riot provides it
+    damage_shares = [m.challenges['teamDamagePercentage'] for m in all_match_features
+                     if 'teamDamagePercentage' in m.challenges]
 
     aggregated = {
         'year': year,
@@ -289,7 +521,7 @@ def aggregate_metrics(all_match_features: List[Dict], year: int) -> Dict:
 
         # Primary role
         'primary_role': primary_role,
-        'role_distribution': {role: len(matches) for role, matches in roles.items()},
+        'role_distribution': dict(roles),
 
         # KDA
         'total_kills': total_kills,
@@ -301,29 +533,27 @@ def aggregate_metrics(all_match_features: List[Dict], year: int) -> Dict:
         'kda': calculate_kda(total_kills, total_deaths, total_assists),
 
         # Average stats
-        'avg_cs_per_min': round(sum(m['cs_per_min'] for m in all_match_features) / total_games, 2),
-        'avg_gold_per_min': round(sum(m['gold_per_min'] for m in all_match_features) / total_games, 2),
-        'avg_vision_score_per_min': round(sum(m['vision_score_per_min'] for m in all_match_features) / total_games, 2),
-        'avg_damage_efficiency': round(sum(m['damage_efficiency'] for m in all_match_features) / total_games, 2),
-        'avg_objective_participation': round(sum(m['objective_participation'] for m in all_match_features) / total_games, 2),
+        'avg_cs_per_min': round(sum(m.cs_per_min for m in all_match_features) / total_games, 2),
+        'avg_gold_per_min': round(sum(m.gold_per_min for m in all_match_features) / total_games, 2),
+        'avg_vision_score_per_min': round(sum(m.vision_score_per_min for m in all_match_features) / total_games, 2),
+        'avg_damage_efficiency': round(sum(m.damage_efficiency for m in all_match_features) / total_games, 2),
+        'avg_damage_share': round(sum(damage_shares) / len(damage_shares), 3) if damage_shares else 0,
+        'avg_objective_participation': round(sum(m.objective_participation for m in all_match_features) / total_games, 2),
 
         # Performance indicators
-        'comeback_wins': sum(1 for m in all_match_features if m['is_comeback_game'] and m['win']),
-        'late_game_wins': sum(1 for m in all_match_features if m['late_game'] and m['win']),
-        'late_game_losses': sum(1 for m in all_match_features if m['late_game'] and not m['win']),
+        'comeback_wins': sum(1 for m in all_match_features if m.is_comeback_game and m.win),
+        'late_game_wins': sum(1 for m in all_match_features if m.late_game and m.win),
+        'late_game_losses': sum(1 for m in all_match_features if m.late_game and not m.win),
 
         # Multi-kills
-        'total_double_kills': sum(m['double_kills'] for m in all_match_features),
-        'total_triple_kills': sum(m['triple_kills'] for m in all_match_features),
-        'total_quadra_kills': sum(m['quadra_kills'] for m in all_match_features),
-        'total_penta_kills': sum(m['penta_kills'] for m in all_match_features),
+        'total_double_kills': sum(m.double_kills for m in all_match_features),
+        'total_triple_kills': sum(m.triple_kills for m in all_match_features),
+        'total_quadra_kills': sum(m.quadra_kills for m in all_match_features),
+        'total_penta_kills': sum(m.penta_kills for m in all_match_features),
 
         # Champion pool
-        'unique_champions': len(set(m['champion_name'] for m in all_match_features)),
-        'most_played_champion': max(
-            set(m['champion_name'] for m in all_match_features),
-            key=lambda c: sum(1 for m in all_match_features if m['champion_name'] == c)
-        ),
+        'unique_champions': len(champion_games),
+        'most_played_champion': max(champion_games, key=champion_games.get),
 
         # Metadata
         'processed_at': datetime.utcnow().isoformat(),
@@ -338,16 +568,7 @@ def save_metrics_to_dynamodb(player_puuid: str, metrics: Dict):
         metrics_table = dynamodb.Table(METRICS_TABLE_NAME)
 
         # Convert floats to Decimal for DynamoDB
-        def convert_floats(obj):
-            if isinstance(obj, dict):
-                return {k: convert_floats(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_floats(item) for item in obj]
-            elif isinstance(obj, float):
-                return Decimal(str(obj))
-            return obj
-
-        metrics_decimal = convert_floats(metrics)
+        metrics_decimal = to_dynamo(metrics)
 
         metrics_table.put_item(
             Item={
@@ -371,62 +592,66 @@ def lambda_handler(event, context):
     OR manually with player_puuid and year
 
     Event formats:
-    1. S3 Event (automatic):
+    1. S3 Event (automatic), delivered directly or wrapped in SQS messages.
+       Every record is processed. From SQS, failures are returned as
+       batchItemFailures so only those messages are retried; this needs
+       FunctionResponseTypes: [ReportBatchItemFailures] on the event
+       source mapping (otherwise the whole batch is retried). S3 invokes
+       asynchronously and ignores that response, so for direct events
+       any failure raises EventRecordsFailed and the event goes through
+       Lambda's async retries and on to the DLQ / failure destination;
+       records that succeeded are cheap to redo (features are reused).
     {
         "Records": [{
             "s3": {
                 "bucket": {"name": "..."},
                 "object": {"key": "raw-matches/PUUID/2025/match_id.json"}
             }
-        }]
+        }, ...]
     }
 
     2. Manual trigger:
     {
         "player_puuid": "string",
-        "year": 2025
+        "year": 2025,
+        "force": false  # re-extract even if stored features are current
     }
     """
 
     try:
         logger.info(f"Event: {json.dumps(event, default=str)}")
 
+        force = bool(event.get('force', False))
+
         # Determine if this is an S3 event or manual trigger
         if 'Records' in event and event['Records']:
-            # S3 event - process single match
-            record = event['Records'][0]
-            bucket = record['s3']['bucket']['name']
-            key = record['s3']['object']['key']
-
-            logger.info(f"Processing S3 event: {bucket}/{key}")
-
-            # Parse key to extract player_puuid and year
-            # Format: raw-matches/PUUID/YEAR/match_id.json
-            parts = key.split('/')
-            if len(parts) != 4 or parts[0] != 'raw-matches':
-                logger.warning(f"Invalid S3 key format: {key}")
-                return {'statusCode': 400, 'body': 'Invalid key format'}
-
-            player_puuid = parts[1]
-            year = int(parts[2])
+            # S3/SQS event - process every record in the batch
+            logger.info(f"Processing {len(event['Records'])} event records")
 
-            # Get match data from S3
-            response = s3_client.get_object(Bucket=bucket, Key=key)
-            match_data = json.loads(response['Body'].read())
+            outcome = process_event_records(event['Records'], force=force)
+            results = outcome['results']
+            failed = outcome['failed_identifiers']
+            from_sqs = event['Records'][0].get('eventSource') == 'aws:sqs'
 
-            # Extract features
-            features = extract_features_from_match(match_data, player_puuid)
+            if failed and not from_sqs:
+                raise EventRecordsFailed(f"{len(failed)} of {len(event['Records'])} S3 records failed: "
+                                         f"{', '.join(failed)}")
 
-            logger.info(f"Extracted features for match {features['match_id']}")
-
-            return {
+            response = {
                 'statusCode': 200,
                 'body': json.dumps({
-                    'success': True,
-                    'match_id': features['match_id'],
-                    'player_puuid': player_puuid
+                    'success': not failed,
+                    'records_processed': sum(1 for r in results if not r.get('skipped')),
+                    'records_skipped': sum(1 for r in results if r.get('skipped')),
+                    'records_failed': len(failed),
+                    'features_reused': sum(1 for r in results if r.get('features_reused')),
+                    'results': results
                 })
             }
+            if from_sqs:
+                # Partial batch response: only these messages are retried
+                response['batchItemFailures'] = [{'itemIdentifier': identifier} for identifier in failed]
+            return response
 
         else:
             # Manual trigger - aggregate all matches
@@ -454,20 +679,22 @@ def lambda_handler(event, context):
 
             # Process each match
             all_match_features = []
+            reused_count = 0
 
             for obj in response['Contents']:
                 key = obj['Key']
                 if not key.endswith('.json'):
                     continue
 
-                # Get match data
-                match_response = s3_client.get_object(Bucket=DATA_BUCKET, Key=key)
-                match_data = json.loads(match_response['Body'].read())
-
-                # Extract features
+                # Extract features (reusing stored records whose version and source match)
                 try:
-                    features = extract_features_from_match(match_data, player_puuid)
+                    features, reused = get_match_features(
+                        DATA_BUCKET, key, player_puuid,
+                        source_etag=obj.get('ETag'),
+                        force=force
+                    )
                     all_match_features.append(features)
+                    reused_count += int(reused)
                 except Exception as e:
                     logger.error(f"Error processing match {key}: {str(e)}")
                     continue
@@ -486,15 +713,21 @@ def lambda_handler(event, context):
 
             return {
                 'statusCode': 200,
-                'body': json.dumps({
+                'body': dumps({
                     'success': True,
                     'player_puuid': player_puuid,
                     'year': year,
                     'matches_processed': len(all_match_features),
+                    'features_reused': reused_count,
+                    'features_extracted': len(all_match_features) - reused_count,
                     'metrics': aggregated_metrics
-                }, cls=DecimalEncoder)
+                })
             }
 
+    except EventRecordsFailed as e:
+        logger.error(str(e))
+        raise
+
     except Exception as e:
         logger.error(f"Lambda handler error: {str(e)}", exc_info=True)
         return {
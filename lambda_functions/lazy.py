@@ -0,0 +1,129 @@
+"""
+RiftSage AI Agent - Lazy Loading
+Defers heavy imports and AWS client creation until first use
+
+Module-level names keep their usual shape:
+
+    s3_client = lazy.client('s3')        # boto3 imported/created on first call
+    np = lazy.lazy_import('numpy')       # numpy executed on first attribute
+
+so code paths that never touch a client or library do not pay for it
+during Lambda INIT. Set LAZY_INIT=false to create everything at import
+time instead (e.g. to front-load work into INIT for provisioned
+concurrency or SnapStart).
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+
+LAZY_INIT = os.environ.get('LAZY_INIT', 'true') == 'true'
+
+
+def lazy_import(name: str):
+    """
+    Return module `name`, executing it on first attribute access.
+    Already-imported modules are returned as-is; with LAZY_INIT=false the
+    module is imported immediately.
+    """
+    # Returned directly: import_module would read __spec__ and force a lazy module to load
+    if name in sys.modules:
+        return sys.modules[name]
+    if not LAZY_INIT:
+        return importlib.import_module(name)
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class LazyAWS:
+    """
+    boto3 client/resource created (thread-safely) on first attribute access.
+    A dict passed as config= is turned into botocore.config.Config at
+    creation, so callers need not import botocore up front.
+    """
+
+    def __init__(self, kind: str, service_name: str, **kwargs):
+        self._kind = kind
+        self._service_name = service_name
+        self._kwargs = kwargs
+        self._instance = None
+        self._lock = threading.Lock()
+
+        if not LAZY_INIT:
+            self._get()
+
+    def _get(self):
+        if self._instance is None:
+            # boto3's default session is not thread-safe while creating clients
+            with self._lock:
+                if self._instance is None:
+                    import boto3
+                    self._instance = self._create(boto3)
+        return self._instance
+
+    def _create(self, owner):
+        """Create the client/resource from `owner` (the boto3 module or a Session)"""
+        kwargs = dict(self._kwargs)
+        if isinstance(kwargs.get('config'), dict):
+            from botocore.config import Config
+            kwargs['config'] = Config(**kwargs['config'])
+        factory = owner.client if self._kind == 'client' else owner.resource
+        return factory(self._service_name, **kwargs)
+
+    @property
+    def created(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __repr__(self):
+        state = 'created' if self.created else 'deferred'
+        return f"<lazy {self._kind} {self._service_name} ({state})>"
+
+
+class ThreadLocalAWS(LazyAWS):
+    """
+    Like LazyAWS, but each thread gets its own instance from its own
+    boto3 Session. boto3 resources (unlike clients) are not thread-safe, so
+    a resource used from worker threads must not be shared between them.
+    """
+
+    def __init__(self, kind: str, service_name: str, **kwargs):
+        self._local = threading.local()
+        super().__init__(kind, service_name, **kwargs)
+
+    def _get(self):
+        instance = getattr(self._local, 'instance', None)
+        if instance is None:
+            import boto3
+            instance = self._create(boto3.session.Session())
+            self._local.instance = instance
+            self._instance = instance
+        return instance
+
+
+def client(service_name: str, **kwargs) -> LazyAWS:
+    """Deferred boto3.client(service_name, **kwargs)"""
+    return LazyAWS('client', service_name, **kwargs)
+
+
+def resource(service_name: str, **kwargs) -> LazyAWS:
+    """Deferred boto3.resource(service_name, **kwargs)"""
+    return LazyAWS('resource', service_name, **kwargs)
+
+
+def thread_resource(service_name: str, **kwargs) -> ThreadLocalAWS:
+    """Deferred boto3 resource, one per thread (for resources used from thread pools)"""
+    return ThreadLocalAWS('resource', service_name, **kwargs)
@@ -0,0 +1,359 @@
+"""
+RiftSage AI Agent - Model Artifacts
+Memory-mappable model format and pure-NumPy predictors
+
+File layout (models/{name}.rsm):
+    MAGIC (8 bytes) | header length (8 bytes, little-endian) | JSON header |
+    padding | array blobs, each aligned to ALIGNMENT bytes
+
+The header records the model kind, scalar params and, for every array,
+its dtype, shape and byte offset. Arrays are read as views over a single
+np.memmap, so loading only maps the file and pages weights in on use.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, List, Tuple
+
+import lazy
+
+# numpy is executed on first use, so importing this module stays cheap
+np = lazy.lazy_import('numpy')
+
+MAGIC = b'RSMODEL1'
+ALIGNMENT = 64
+FORMAT_VERSION = 1
+ARTIFACT_EXTENSION = '.rsm'
+
+
+# ====================================
+# Predictors
+# ====================================
+
+class KMeansPredictor:
+    """Nearest-centroid assignment, optionally mapped to string labels"""
+
+    kind = 'kmeans'
+
+    def __init__(self, centroids: np.ndarray, labels: List[str] = None):
+        self.centroids = centroids
+        self.labels = np.asarray(labels, dtype=object) if labels else None
+        self._centroid_sq_norms = np.einsum('ij,ij->i', centroids, centroids)
+
+    def predict_clusters(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; ||x||^2 is constant per row
+        distances = self._centroid_sq_norms[None, :] - 2.0 * (X @ self.centroids.T)
+        return np.argmin(distances, axis=1)
+
+    def predict(self, X) -> np.ndarray:
+        clusters = self.predict_clusters(X)
+        return self.labels[clusters] if self.labels is not None else clusters
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'centroids': self.centroids}
+
+    def params(self) -> Dict[str, Any]:
+        return {'labels': self.labels.tolist() if self.labels is not None else None}
+
+    @classmethod
+    def from_parts(cls, params: Dict, arrays: Dict[str, np.ndarray]) -> 'KMeansPredictor':
+        return cls(arrays['centroids'], params.get('labels'))
+
+
+class PCAPredictor:
+    """Linear projection onto principal components"""
+
+    kind = 'pca'
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, scale: np.ndarray = None):
+        self.mean = mean
+        self.components = components
+        # Per-component divisor when the PCA was fitted with whiten=True
+        self.scale = scale
+
+    def transform(self, X) -> np.ndarray:
+        projected = (np.asarray(X, dtype=np.float64) - self.mean) @ self.components.T
+        if self.scale is not None:
+            projected = projected / self.scale
+        return projected
+
+    predict = transform
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {'mean': self.mean, 'components': self.components}
+        if self.scale is not None:
+            arrays['scale'] = self.scale
+        return arrays
+
+    def params(self) -> Dict[str, Any]:
+        return {}
+
+    @classmethod
+    def from_parts(cls, params: Dict, arrays: Dict[str, np.ndarray]) -> 'PCAPredictor':
+        return cls(arrays['mean'], arrays['components'], arrays.get('scale'))
+
+
+class PCAKMeansPredictor:
+    """PCA projection followed by nearest-centroid assignment"""
+
+    kind = 'pca_kmeans'
+
+    def __init__(self, pca: PCAPredictor, kmeans: KMeansPredictor):
+        self.pca = pca
+        self.kmeans = kmeans
+
+    def transform(self, X) -> np.ndarray:
+        return self.pca.transform(X)
+
+    def predict(self, X) -> np.ndarray:
+        return self.kmeans.predict(self.pca.transform(X))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {f'pca_{name}': value for name, value in self.pca.arrays().items()}
+        arrays['centroids'] = self.kmeans.centroids
+        return arrays
+
+    def params(self) -> Dict[str, Any]:
+        return self.kmeans.params()
+
+    @classmethod
+    def from_parts(cls, params: Dict, arrays: Dict[str, np.ndarray]) -> 'PCAKMeansPredictor':
+        pca_arrays = {name[len('pca_'):]: value for name, value in arrays.items() if name.startswith('pca_')}
+        return cls(PCAPredictor.from_parts(params, pca_arrays), KMeansPredictor.from_parts(params, arrays))
+
+
+class TreeEnsemblePredictor:
+    """
+    Forest of binary decision trees flattened into shared node arrays.
+
+    Child indices are global (already offset per tree) with -1 marking
+    leaves; roots holds each tree's root node. All samples walk all trees
+    together, one depth level per iteration.
+    """
+
+    kind = 'tree_ensemble'
+
+    def __init__(self, roots: np.ndarray, children_left: np.ndarray, children_right: np.ndarray,
+                 feature: np.ndarray, threshold: np.ndarray, value: np.ndarray,
+                 classes: List[Any] = None):
+        self.roots = roots
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        # (n_nodes, n_outputs): regression value, or class probabilities per node
+        self.value = value
+        self.classes = np.asarray(classes, dtype=object) if classes else None
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node reached by every (sample, tree) pair"""
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.shape[0])).copy()
+        rows = np.arange(X.shape[0])[:, None]
+
+        while True:
+            left = self.children_left[nodes]
+            internal = left != -1
+            if not internal.any():
+                return nodes
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, left, self.children_right[nodes]), nodes)
+
+    def predict_raw(self, X) -> np.ndarray:
+        """Mean of leaf values across trees, shape (n_samples, n_outputs)"""
+        # scikit-learn trees split on float32 inputs; round the same way
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        return self.value[self._leaves(X)].mean(axis=1)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.predict_raw(X)
+
+    def predict(self, X) -> np.ndarray:
+        raw = self.predict_raw(X)
+        if self.classes is not None:
+            return self.classes[np.argmax(raw, axis=1)]
+        return raw[:, 0]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            'roots': self.roots,
+            'children_left': self.children_left,
+            'children_right': self.children_right,
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'value': self.value,
+        }
+
+    def params(self) -> Dict[str, Any]:
+        return {'classes': self.classes.tolist() if self.classes is not None else None}
+
+    @classmethod
+    def from_parts(cls, params: Dict, arrays: Dict[str, np.ndarray]) -> 'TreeEnsemblePredictor':
+        return cls(arrays['roots'], arrays['children_left'], arrays['children_right'],
+                   arrays['feature'], arrays['threshold'], arrays['value'], params.get('classes'))
+
+
+PREDICTOR_TYPES = {
+    predictor.kind: predictor
+    for predictor in (KMeansPredictor, PCAPredictor, PCAKMeansPredictor, TreeEnsemblePredictor)
+}
+
+
+# ====================================
+# Artifact I/O
+# ====================================
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_artifact(predictor, path: str, metadata: Dict = None):
+    """Write a predictor as a memory-mappable artifact"""
+    arrays = {name: np.ascontiguousarray(array) for name, array in predictor.arrays().items()}
+
+    # Offsets are relative to the start of the data section
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+
+    header = json.dumps({
+        'format_version': FORMAT_VERSION,
+        'kind': predictor.kind,
+        'params': predictor.params(),
+        'metadata': metadata or {},
+        'arrays': layout,
+    }).encode('utf-8')
+
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b'\0' * (data_start + layout[name]['offset'] - f.tell()))
+            f.write(array.tobytes())
+
+
+def read_header(path: str) -> Tuple[Dict, int]:
+    """Return (header, data section offset) without touching array data"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a model artifact: {path}")
+        (header_length,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_length))
+
+    if header.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact version: {header.get('format_version')}")
+
+    return header, _align(len(MAGIC) + 8 + header_length)
+
+
+def load_artifact(path: str):
+    """Load a predictor with its arrays memory-mapped (read-only) from path"""
+    header, data_start = read_header(path)
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        start = data_start + spec['offset']
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+
+    predictor_type = PREDICTOR_TYPES.get(header['kind'])
+    if predictor_type is None:
+        raise ValueError(f"Unknown model kind: {header['kind']}")
+
+    predictor = predictor_type.from_parts(header['params'], arrays)
+    predictor.metadata = header.get('metadata', {})
+    return predictor
+
+
+# ====================================
+# Conversion from scikit-learn
+# ====================================
+
+def _convert_trees(estimators: List, classes: List = None) -> TreeEnsemblePredictor:
+    roots, left, right, feature, threshold, value = [], [], [], [], [], []
+    base = 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        node_count = tree.node_count
+
+        tree_left = tree.children_left.astype(np.int64)
+        tree_right = tree.children_right.astype(np.int64)
+        is_leaf = tree_left == -1
+
+        roots.append(base)
+        left.append(np.where(is_leaf, -1, tree_left + base))
+        right.append(np.where(is_leaf, -1, tree_right + base))
+        # Leaves get feature 0 so indexing stays in bounds; they never branch
+        feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+        threshold.append(tree.threshold.astype(np.float64))
+
+        node_value = tree.value[:, 0, :].astype(np.float64)
+        if classes is not None:
+            # Older sklearn stores class counts per node; normalise to probabilities
+            totals = node_value.sum(axis=1, keepdims=True)
+            node_value = np.divide(node_value, totals, out=np.zeros_like(node_value), where=totals > 0)
+        value.append(node_value)
+
+        base += node_count
+
+    return TreeEnsemblePredictor(
+        np.asarray(roots, dtype=np.int64),
+        np.concatenate(left),
+        np.concatenate(right),
+        np.concatenate(feature),
+        np.concatenate(threshold),
+        np.concatenate(value),
+        classes,
+    )
+
+
+def _pca_from_sklearn(pca) -> PCAPredictor:
+    scale = np.sqrt(pca.explained_variance_) if getattr(pca, 'whiten', False) else None
+    return PCAPredictor(np.asarray(pca.mean_, dtype=np.float64),
+                        np.asarray(pca.components_, dtype=np.float64),
+                        scale)
+
+
+def convert_sklearn_model(model, labels: List[str] = None):
+    """
+    Convert a fitted scikit-learn model into a NumPy predictor.
+
+    Supports KMeans/MiniBatchKMeans, PCA, Pipeline(PCA, KMeans), single
+    decision trees and bagged tree ensembles (random forest, extra trees).
+    labels optionally names k-means clusters in cluster-index order.
+    """
+    name = type(model).__name__
+
+    if hasattr(model, 'steps'):
+        steps = [step for _, step in model.steps if step is not None and step != 'passthrough']
+        if len(steps) == 2 and hasattr(steps[0], 'components_') and hasattr(steps[1], 'cluster_centers_'):
+            return PCAKMeansPredictor(_pca_from_sklearn(steps[0]),
+                                      KMeansPredictor(np.asarray(steps[1].cluster_centers_, dtype=np.float64), labels))
+        raise ValueError(f"Unsupported pipeline: {[type(step).__name__ for step in steps]}")
+
+    if hasattr(model, 'cluster_centers_'):
+        return KMeansPredictor(np.asarray(model.cluster_centers_, dtype=np.float64), labels)
+
+    if hasattr(model, 'components_') and hasattr(model, 'mean_'):
+        return _pca_from_sklearn(model)
+
+    classes = model.classes_.tolist() if hasattr(model, 'classes_') else None
+
+    if hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_'):
+        return _convert_trees(list(model.estimators_), classes)
+
+    if hasattr(model, 'tree_'):
+        return _convert_trees([model], classes)
+
+    raise ValueError(f"Unsupported model type: {name}")
@@ -3,85 +3,252 @@ RiftSage AI Agent - Model Inference Lambda Function
 Applies ML models to player data for classification and predictions
 """
 
+import hashlib
 import json
 import os
-import boto3
 import logging
-import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any
-from decimal import Decimal
-import numpy as np
+
+import lazy
+from batch_get import batch_get_items
+from codec import to_dynamo, dumps
+from model_artifacts import ARTIFACT_EXTENSION, load_artifact
+import rules_engine
+
+# Only the batch path needs numpy directly; loaded on first use
+np = lazy.lazy_import('numpy')
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+s3_client = lazy.client('s3')
+# Per thread: batch inference writes results from a thread pool
+dynamodb = lazy.thread_resource('dynamodb')
 
 # Environment variables
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'development')
 MODELS_BUCKET = os.environ.get('MODELS_BUCKET')
 METRICS_TABLE_NAME = os.environ.get('METRICS_TABLE')
 
+# Model registry configuration
+MODEL_NAMES = (
+    'performance_pattern_analyzer',
+    'mental_resilience_calculator',
+    'growth_trajectory_analyzer',
+    'playstyle_profiler',
+)
+MODEL_CACHE_DIR = os.environ.get('MODEL_CACHE_DIR', '/tmp/models')
+MODEL_REVALIDATE_SECONDS = int(os.environ.get('MODEL_REVALIDATE_SECONDS', 300))
+MODEL_NEGATIVE_CACHE_SECONDS = int(os.environ.get('MODEL_NEGATIVE_CACHE_SECONDS', 900))
+MODEL_PRELOAD = os.environ.get('MODEL_PRELOAD', 'false') == 'true'
+
+# Inference memoization: ml_inference.input_hash covers these fields, the
+# ETags of the models inference loads, and INFERENCE_VERSION (bump it when
+# rule logic or output shape changes so stored results are recomputed)
+INFERENCE_VERSION = 3
+INFERENCE_MODELS = ('performance_pattern_analyzer', 'mental_resilience_calculator', 'playstyle_profiler')
+INFERENCE_FIELDS = tuple(sorted(set(rules_engine.RULE_FIELDS) | {'comeback_wins'}))
+GROWTH_FIELDS = ('kda', 'win_rate', 'avg_cs_per_min', 'avg_vision_score_per_min')
+
+# Attributes inference reads from a season's item (the projection for its reads), so
+# large ones such as recent_matches are never transferred
+SEASON_FIELDS = tuple(sorted(
+    {'player_puuid', 'year', 'ml_inference'} | set(INFERENCE_FIELDS) | set(GROWTH_FIELDS)
+))
+
+# Seasons (including the scored one) loaded for the growth trajectory
+TRAJECTORY_MAX_SEASONS = int(os.environ.get('TRAJECTORY_MAX_SEASONS', 10))
+
+# Concurrent ml_inference updates in batch inference (UpdateItem has no batch form)
+INFERENCE_WRITE_CONCURRENCY = int(os.environ.get('INFERENCE_WRITE_CONCURRENCY', 16))
+
+
+class ModelRegistry:
+    """
+    Container-wide cache of trained models, shared across invocations.
+
+    - Loaded models stay in memory; after MODEL_REVALIDATE_SECONDS the S3
+      ETag is checked and the model re-downloaded only if it changed.
+    - Downloads are kept in MODEL_CACHE_DIR (/tmp) with their ETag, so a
+      matching file is memory-mapped without downloading again.
+    - Missing models are negatively cached for MODEL_NEGATIVE_CACHE_SECONDS
+      so the rule-based fallback does not retry S3 on every call.
+    """
 
-class MLModelPipeline:
-    """Pipeline for running ML models on player data"""
+    NOT_FOUND_CODES = ('404', 'NoSuchKey', 'NotFound')
 
-    def __init__(self, models_bucket: str):
+    def __init__(self, models_bucket: str, cache_dir: str = MODEL_CACHE_DIR):
         self.models_bucket = models_bucket
-        self.models = {}
+        self.cache_dir = cache_dir
+        self.entries = {}
+        self.load_stats = {}
+        self._locks = {name: threading.Lock() for name in MODEL_NAMES}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, model_name: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(model_name, threading.Lock())
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        ttl = MODEL_REVALIDATE_SECONDS if entry['model'] is not None else MODEL_NEGATIVE_CACHE_SECONDS
+        return time.monotonic() - entry['checked_at'] < ttl
+
+    def get(self, model_name: str):
+        """Return the model, or None if it does not exist (rule-based fallback)"""
+        entry = self.entries.get(model_name)
+        if entry is not None and self._is_fresh(entry):
+            return entry['model']
+
+        with self._lock(model_name):
+            # Another thread (e.g. background preload) may have refreshed it
+            entry = self.entries.get(model_name)
+            if entry is not None and self._is_fresh(entry):
+                return entry['model']
+            return self._refresh(model_name, entry)
+
+    def _refresh(self, model_name: str, entry: Dict):
+        started = time.perf_counter()
+        model_key = f"models/{model_name}{ARTIFACT_EXTENSION}"
+        # Imported here, not at module level: botocore only loads with the first S3 call
+        from botocore.exceptions import ClientError
 
-    def load_model(self, model_name: str):
-        """Load a trained model from S3"""
         try:
-            if model_name in self.models:
-                return self.models[model_name]
+            head = s3_client.head_object(Bucket=self.models_bucket, Key=model_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in self.NOT_FOUND_CODES:
+                self.entries[model_name] = {'model': None, 'etag': None, 'checked_at': time.monotonic()}
+                self._record(model_name, 'absent', started)
+                logger.info(f"Model {model_name} not found, caching absence for {MODEL_NEGATIVE_CACHE_SECONDS}s")
+                return None
+            return self._refresh_failed(model_name, entry, e)
+        except Exception as e:
+            return self._refresh_failed(model_name, entry, e)
 
-            # Download model from S3
-            model_key = f"models/{model_name}.pkl"
-            local_path = f"/tmp/{model_name}.pkl"
+        etag = head['ETag'].strip('"')
 
-            s3_client.download_file(self.models_bucket, model_key, local_path)
+        # Unchanged in S3 - keep the in-memory model
+        if entry is not None and entry['model'] is not None and entry['etag'] == etag:
+            entry['checked_at'] = time.monotonic()
+            self._record(model_name, 'revalidated', started)
+            return entry['model']
 
-            # Load model
-            with open(local_path, 'rb') as f:
-                model = pickle.load(f)
+        try:
+            local_path = os.path.join(self.cache_dir, f"{model_name}{ARTIFACT_EXTENSION}")
+            etag_path = f"{local_path}.etag"
+
+            source = 'tmp'
+            if not (os.path.exists(local_path) and self._read_etag(etag_path) == etag):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                s3_client.download_file(self.models_bucket, model_key, f"{local_path}.part")
+                os.replace(f"{local_path}.part", local_path)
+                with open(etag_path, 'w') as f:
+                    f.write(etag)
+                source = 's3'
+
+            model = load_artifact(local_path)
+        except Exception as e:
+            return self._refresh_failed(model_name, entry, e)
 
-            self.models[model_name] = model
-            logger.info(f"Loaded model: {model_name}")
+        self.entries[model_name] = {'model': model, 'etag': etag, 'checked_at': time.monotonic()}
+        load_ms = self._record(model_name, source, started)
+        logger.info(f"Loaded model: {model_name} from {source} in {load_ms:.1f} ms")
 
-            return model
+        return model
 
-        except Exception as e:
-            logger.error(f"Error loading model {model_name}: {str(e)}")
-            # Return None if model doesn't exist - use rule-based fallback
+    def _refresh_failed(self, model_name: str, entry: Dict, error: Exception):
+        """Keep serving a previously loaded model if revalidation fails"""
+        logger.error(f"Error loading model {model_name}: {str(error)}")
+        if entry is not None and entry['model'] is not None:
+            entry['checked_at'] = time.monotonic()
+            return entry['model']
+        return None
+
+    def _read_etag(self, etag_path: str) -> str:
+        try:
+            with open(etag_path) as f:
+                return f.read().strip()
+        except OSError:
             return None
 
-    def classify_performance_pattern(self, metrics: Dict) -> Dict:
+    def _record(self, model_name: str, source: str, started: float) -> float:
+        load_ms = (time.perf_counter() - started) * 1000
+        self.load_stats[model_name] = {
+            'source': source,
+            'load_ms': round(load_ms, 2),
+            'loaded_at': datetime.utcnow().isoformat()
+        }
+        return load_ms
+
+    def versions(self, model_names=INFERENCE_MODELS) -> Dict[str, str]:
+        """Current ETag per model (None when absent), loading models as needed"""
+        versions = {}
+        for model_name in model_names:
+            model = self.get(model_name)
+            entry = self.entries.get(model_name)
+            versions[model_name] = entry['etag'] if model is not None and entry is not None else None
+        return versions
+
+    def preload(self, model_names=MODEL_NAMES):
+        """Load every model (absent ones are negatively cached)"""
+        for model_name in model_names:
+            self.get(model_name)
+
+    def start_background_preload(self):
+        """Preload models on a daemon thread so INIT is not blocked on S3"""
+        thread = threading.Thread(target=self.preload, name='model-preload', daemon=True)
+        thread.start()
+        return thread
+
+
+model_registry = ModelRegistry(MODELS_BUCKET)
+
+if MODEL_PRELOAD:
+    model_registry.start_background_preload()
+
+
+class MLModelPipeline:
+    """Pipeline for running ML models on player data"""
+
+    def __init__(self, models_bucket: str, registry: ModelRegistry = None):
+        self.models_bucket = models_bucket
+        self.registry = registry or model_registry
+
+    def load_model(self, model_name: str):
+        """Load a trained model via the container-wide registry"""
+        # Returns None if the model doesn't exist - use rule-based fallback
+        return self.registry.get(model_name)
+
+    def classify_performance_pattern(self, metrics: Dict, prediction=None, rule_pattern: str = None) -> Dict:
         """
         Model 1: Performance Pattern Analyzer
         Classifies player's performance characteristics
+        (prediction and rule_pattern may be supplied from a batch run over many players)
         """
         try:
-            # Try to load trained model
-            model = self.load_model('performance_pattern_analyzer')
+            if prediction is None:
+                # Try to load trained model
+                model = self.load_model('performance_pattern_analyzer')
 
-            if model is not None:
-                # Use ML model
-                features = self._extract_pattern_features(metrics)
-                prediction = model.predict([features])[0]
+                if model is not None:
+                    features = self._extract_pattern_features(metrics)
+                    prediction = model.predict([features])[0]
 
+            if prediction is not None:
+                # Use ML model
                 return {
                     'model': 'ml',
-                    'pattern': prediction,
+                    'pattern': str(prediction),
                     'confidence': 0.85  # Would come from model probability
                 }
 
             else:
                 # Rule-based fallback
-                pattern = self._rule_based_performance_pattern(metrics)
+                pattern = rule_pattern or self._rule_based_performance_pattern(metrics)
                 return {
                     'model': 'rule_based',
                     'pattern': pattern,
@@ -124,21 +291,23 @@ class MLModelPipeline:
         else:
             return "balanced_gameplay"
 
-    def calculate_mental_resilience(self, metrics: Dict) -> Dict:
+    def calculate_mental_resilience(self, metrics: Dict, score: float = None) -> Dict:
         """
         Model 2: Mental Resilience Calculator
         Calculates tilt resistance and consistency
+        (score may be supplied from a batch predict over many players)
         """
         try:
-            # Try to load trained model
-            model = self.load_model('mental_resilience_calculator')
+            if score is None:
+                # Try to load trained model
+                model = self.load_model('mental_resilience_calculator')
 
-            if model is not None:
-                features = self._extract_resilience_features(metrics)
-                score = model.predict([features])[0]
-            else:
-                # Rule-based calculation
-                score = self._rule_based_resilience_score(metrics)
+                if model is not None:
+                    features = self._extract_resilience_features(metrics)
+                    score = model.predict([features])[0]
+                else:
+                    # Rule-based calculation
+                    score = self._rule_based_resilience_score(metrics)
 
             # Determine grade
             if score >= 80:
@@ -200,23 +369,30 @@ class MLModelPipeline:
         else:
             return "Variable"
 
-    def analyze_growth_trajectory(self, current_metrics: Dict, previous_metrics: Dict = None) -> Dict:
+    def analyze_growth_trajectory(self, current_metrics: Dict, previous_metrics: Dict = None,
+                                  history: List[Dict] = None) -> Dict:
         """
         Model 3: Growth Trajectory Analyzer
         Predicts improvement areas and growth potential
+        (history: earlier seasons, oldest first; with 3+ seasons in total the
+        velocity comes from a least-squares trend across all of them)
         """
         try:
-            if previous_metrics is None:
+            if history is None:
+                history = [previous_metrics] if previous_metrics is not None else []
+
+            if not history:
                 return {
                     'trajectory': 'insufficient_data',
                     'improvement_velocity': 0.0,
                     'predicted_improvement_areas': []
                 }
 
-            # Calculate improvement rates
+            # Season-over-season change against the latest earlier season
+            previous_metrics = history[-1]
             improvements = {}
 
-            metrics_to_compare = ['kda', 'win_rate', 'avg_cs_per_min', 'avg_vision_score_per_min']
+            metrics_to_compare = GROWTH_FIELDS
 
             for metric in metrics_to_compare:
                 current = float(current_metrics.get(metric, 0))
@@ -235,16 +411,26 @@ class MLModelPipeline:
             if current_metrics.get('deaths_per_game', 10) > 6:
                 improvement_areas.append('positioning')
 
-            # Calculate overall improvement velocity
-            avg_improvement = sum(improvements.values()) / len(improvements) if improvements else 0
+            seasons = history + [current_metrics]
+            trends = self._season_trends(seasons) if len(seasons) >= 3 else {}
 
-            return {
+            # Calculate overall improvement velocity (trend-based when available)
+            rates = trends or improvements
+            avg_improvement = sum(rates.values()) / len(rates) if rates else 0
+
+            result = {
                 'trajectory': 'improving' if avg_improvement > 0 else 'stable',
                 'improvement_velocity': round(avg_improvement, 2),
                 'improvements_by_metric': improvements,
                 'predicted_improvement_areas': improvement_areas,
-                'growth_potential': 'high' if avg_improvement > 10 else 'moderate'
+                'growth_potential': 'high' if avg_improvement > 10 else 'moderate',
+                'seasons_analyzed': len(seasons)
             }
+            if trends:
+                result['trend_by_metric'] = trends
+                result['seasons'] = [int(season['year']) for season in seasons if 'year' in season]
+
+            return result
 
         except Exception as e:
             logger.error(f"Error analyzing growth: {str(e)}")
@@ -253,25 +439,70 @@ class MLModelPipeline:
                 'error': str(e)
             }
 
-    def classify_playstyle(self, metrics: Dict) -> Dict:
+    def _season_trends(self, seasons: List[Dict]) -> Dict[str, float]:
+        """
+        Least-squares slope per metric across seasons, as a % of the metric's
+        mean per season. Seasons without a positive value are left out.
+        """
+        trends = {}
+        for metric in GROWTH_FIELDS:
+            points = [
+                (float(season.get('year', index)), float(season.get(metric, 0)))
+                for index, season in enumerate(seasons)
+                if float(season.get(metric, 0)) > 0
+            ]
+            if len(points) < 2:
+                continue
+
+            mean_x = sum(x for x, _ in points) / len(points)
+            mean_y = sum(y for _, y in points) / len(points)
+            spread = sum((x - mean_x) ** 2 for x, _ in points)
+            if spread == 0:
+                continue
+
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+            trends[metric] = round(slope / mean_y * 100, 2)
+
+        return trends
+
+    def classify_playstyle(self, metrics: Dict, scores: Dict = None, prediction=None) -> Dict:
         """
         Model 4: Play Style Profiler
-        Classifies player's playstyle archetype
+        Classifies player's playstyle archetype; the indices always come from the rules
+        (scores and prediction may be supplied from a batch run over many players)
         """
         try:
-            # Calculate playstyle indicators
-            aggression_index = self._calculate_aggression_index(metrics)
-            teamwork_orientation = self._calculate_teamwork_orientation(metrics)
-            mechanical_skill = self._calculate_mechanical_skill(metrics)
-
-            # Classify into archetype
-            archetype = self._determine_archetype(
-                aggression_index,
-                teamwork_orientation,
-                mechanical_skill
-            )
+            if scores is not None:
+                aggression_index = scores['aggression_index']
+                teamwork_orientation = scores['teamwork_orientation']
+                mechanical_skill = scores['mechanical_skill']
+                archetype = scores['archetype']
+            else:
+                # Calculate playstyle indicators
+                aggression_index = self._calculate_aggression_index(metrics)
+                teamwork_orientation = self._calculate_teamwork_orientation(metrics)
+                mechanical_skill = self._calculate_mechanical_skill(metrics)
+
+                # Classify into archetype
+                archetype = self._determine_archetype(
+                    aggression_index,
+                    teamwork_orientation,
+                    mechanical_skill
+                )
+
+                # Try to load trained model
+                model = self.load_model('playstyle_profiler')
+
+                if model is not None:
+                    features = self._extract_playstyle_features(metrics)
+                    prediction = model.predict([features])[0]
+
+            # Use ML model when it produced an archetype, else the rule-based one
+            if prediction is not None:
+                archetype = str(prediction)
 
             return {
+                'model': 'ml' if prediction is not None else 'rule_based',
                 'archetype': archetype,
                 'aggression_index': round(aggression_index, 2),
                 'teamwork_orientation': round(teamwork_orientation, 2),
@@ -286,6 +517,17 @@ class MLModelPipeline:
                 'error': str(e)
             }
 
+    def _extract_playstyle_features(self, metrics: Dict) -> List[float]:
+        """Extract features for playstyle clustering (model_training.PLAYSTYLE_FEATURES order)"""
+        return [
+            float(metrics.get('kills_per_game', 0)),
+            float(metrics.get('deaths_per_game', 0)),
+            float(metrics.get('assists_per_game', 0)),
+            float(metrics.get('avg_objective_participation', 0)),
+            float(metrics.get('avg_cs_per_min', 0)),
+            float(metrics.get('kda', 0)),
+        ]
+
     def _calculate_aggression_index(self, metrics: Dict) -> float:
         """Calculate aggression index (0-100)"""
         kills_per_game = float(metrics.get('kills_per_game', 0))
@@ -328,6 +570,64 @@ class MLModelPipeline:
         else:
             return "Balanced All-Rounder"
 
+    def _batch_predict(self, model_name: str, feature_rows: List[List[float]]) -> List:
+        """
+        Predict once over the whole feature matrix.
+        Returns one None per row if the model is absent or fails, so callers
+        fall back to the per-player path.
+        """
+        model = self.load_model(model_name)
+        if model is None or not feature_rows:
+            return [None] * len(feature_rows)
+
+        try:
+            return list(model.predict(np.asarray(feature_rows, dtype=np.float64)))
+        except Exception as e:
+            logger.error(f"Error in batch predict for {model_name}: {str(e)}")
+            return [None] * len(feature_rows)
+
+    def run_batch(self, current_metrics_list: List[Dict], history_list: List[List[Dict]]) -> List[Dict]:
+        """
+        Run all four models over many players, one predict call per ML model.
+        Rule-based scores come from a single rules_engine pass.
+        """
+        rules = rules_engine.evaluate(current_metrics_list)
+
+        patterns = self._batch_predict(
+            'performance_pattern_analyzer',
+            [self._extract_pattern_features(m) for m in current_metrics_list]
+        )
+        resilience_scores = self._batch_predict(
+            'mental_resilience_calculator',
+            [self._extract_resilience_features(m) for m in current_metrics_list]
+        )
+        playstyles = self._batch_predict(
+            'playstyle_profiler',
+            [self._extract_playstyle_features(m) for m in current_metrics_list]
+        )
+
+        results = []
+        for i, (current, history) in enumerate(zip(current_metrics_list, history_list)):
+            resilience_score = resilience_scores[i]
+            if resilience_score is None:
+                resilience_score = rules['resilience_score'][i]
+
+            results.append({
+                'performance_pattern': self.classify_performance_pattern(
+                    current, prediction=patterns[i], rule_pattern=rules['performance_pattern'][i]
+                ),
+                'mental_resilience': self.calculate_mental_resilience(current, score=resilience_score),
+                'growth_trajectory': self.analyze_growth_trajectory(current, history=history),
+                'playstyle': self.classify_playstyle(current, scores={
+                    'aggression_index': rules['aggression_index'][i],
+                    'teamwork_orientation': rules['teamwork_orientation'][i],
+                    'mechanical_skill': rules['mechanical_skill'][i],
+                    'archetype': rules['archetype'][i]
+                }, prediction=playstyles[i])
+            })
+
+        return results
+
     def _get_archetype_description(self, archetype: str) -> str:
         """Get description for archetype"""
         descriptions = {
@@ -341,43 +641,106 @@ class MLModelPipeline:
         return descriptions.get(archetype, "Unknown playstyle")
 
 
-def process_player_inference(player_puuid: str, year: int) -> Dict:
-    """Run all ML models on player data"""
+def inference_input_hash(current_metrics: Dict, history: List[Dict], model_versions: Dict) -> str:
+    """Content hash of everything the inference output depends on"""
+    payload = {
+        'version': INFERENCE_VERSION,
+        'models': model_versions,
+        'current': {field: current_metrics.get(field) for field in INFERENCE_FIELDS},
+        'history': [
+            {field: season.get(field) for field in ('year',) + GROWTH_FIELDS}
+            for season in history
+        ],
+    }
+    # codec.dumps renders Decimal(5) and 5 alike, so stored and fresh values hash equally
+    return hashlib.sha256(dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def cached_inference(current_metrics: Dict, input_hash: str) -> Dict:
+    """Stored ml_inference if it was computed from the same inputs, else None"""
+    stored = current_metrics.get('ml_inference')
+    if isinstance(stored, dict) and stored.get('input_hash') == input_hash:
+        return stored
+    return None
+
+
+def season_window(year: int) -> range:
+    """Years loaded for a player scored in `year`, oldest first"""
+    return range(year - TRAJECTORY_MAX_SEASONS + 1, year + 1)
+
+
+def query_player_seasons(player_puuid: str, year: int) -> List[Dict]:
+    """
+    Load every season in season_window(year) for one player with a single
+    (paginated) Query over the year sort key, projected to SEASON_FIELDS.
+    Items come back oldest first.
+    """
+    metrics_table = dynamodb.Table(METRICS_TABLE_NAME)
+    window = season_window(year)
+    names = {'#year': 'year'}
+    names.update({f'#p{i}': field for i, field in enumerate(SEASON_FIELDS) if field != 'year'})
+
+    kwargs = {
+        'KeyConditionExpression': 'player_puuid = :puuid AND #year BETWEEN :first AND :last',
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': {':puuid': player_puuid, ':first': window[0], ':last': window[-1]},
+        'ScanIndexForward': True
+    }
+
+    seasons = []
+    while True:
+        response = metrics_table.query(**kwargs)
+        seasons.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return seasons
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def process_player_inference(player_puuid: str, year: int, force: bool = False) -> Dict:
+    """
+    Run all ML models on player data.
+    Skips computation and the write when ml_inference.input_hash matches the
+    current inputs (unless force is set).
+    """
     try:
-        # Get player metrics
-        metrics_table = dynamodb.Table(METRICS_TABLE_NAME)
-        response = metrics_table.get_item(
-            Key={
-                'player_puuid': player_puuid,
-                'year': year
-            }
-        )
+        # Get player metrics for this and earlier seasons in one Query
+        seasons = query_player_seasons(player_puuid, year)
 
-        if 'Item' not in response:
+        if not seasons or int(seasons[-1]['year']) != year:
             return {
                 'success': False,
                 'error': 'Metrics not found for player'
             }
 
-        current_metrics = response['Item']
-
-        # Get previous year metrics if available
-        previous_year = year - 1
-        prev_response = metrics_table.get_item(
-            Key={
-                'player_puuid': player_puuid,
-                'year': previous_year
-            }
-        )
-        previous_metrics = prev_response.get('Item')
+        current_metrics = seasons[-1]
+        history = seasons[:-1]
 
         # Initialize pipeline
         pipeline = MLModelPipeline(MODELS_BUCKET)
 
+        # Per-model load timings for this container (source: s3/tmp/revalidated/absent)
+        def model_load():
+            return {
+                name: pipeline.registry.load_stats[name]
+                for name in MODEL_NAMES if name in pipeline.registry.load_stats
+            }
+
+        input_hash = inference_input_hash(current_metrics, history, pipeline.registry.versions())
+        cached = None if force else cached_inference(current_metrics, input_hash)
+
+        if cached is not None:
+            return {
+                'success': True,
+                'results': cached,
+                'model_load': model_load(),
+                'inference_cache': {'hits': 1, 'misses': 0}
+            }
+
         # Run all models
         performance_pattern = pipeline.classify_performance_pattern(current_metrics)
         mental_resilience = pipeline.calculate_mental_resilience(current_metrics)
-        growth_trajectory = pipeline.analyze_growth_trajectory(current_metrics, previous_metrics)
+        growth_trajectory = pipeline.analyze_growth_trajectory(current_metrics, history=history)
         playstyle = pipeline.classify_playstyle(current_metrics)
 
         # Compile results
@@ -388,24 +751,18 @@ def process_player_inference(player_puuid: str, year: int) -> Dict:
             'mental_resilience': mental_resilience,
             'growth_trajectory': growth_trajectory,
             'playstyle': playstyle,
+            'input_hash': input_hash,
             'processed_at': datetime.utcnow().isoformat()
         }
 
         # Save results back to metrics table
-        metrics_table.update_item(
-            Key={
-                'player_puuid': player_puuid,
-                'year': year
-            },
-            UpdateExpression='SET ml_inference = :inference',
-            ExpressionAttributeValues={
-                ':inference': inference_results
-            }
-        )
+        save_inference(player_puuid, year, inference_results)
 
         return {
             'success': True,
-            'results': inference_results
+            'results': inference_results,
+            'model_load': model_load(),
+            'inference_cache': {'hits': 0, 'misses': 1}
         }
 
     except Exception as e:
@@ -416,6 +773,115 @@ def process_player_inference(player_puuid: str, year: int) -> Dict:
         }
 
 
+def save_inference(player_puuid: str, year: int, inference_results: Dict):
+    """Set ml_inference on a metrics item, leaving its other attributes untouched"""
+    dynamodb.Table(METRICS_TABLE_NAME).update_item(
+        Key={
+            'player_puuid': player_puuid,
+            'year': year
+        },
+        UpdateExpression='SET ml_inference = :inference',
+        ExpressionAttributeValues={
+            ':inference': to_dynamo(inference_results)
+        }
+    )
+
+
+def batch_get_metrics(keys: List[Dict]) -> Dict:
+    """
+    Fetch many MetricsTable items with BatchGetItem. Returns {(player_puuid, year): item}.
+    Numbers come back as int/float rather than Decimal (only ml_inference is
+    written back), which keeps rules_engine column extraction cheap.
+    """
+    return {
+        (item['player_puuid'], item['year']): item
+        for item in batch_get_items(METRICS_TABLE_NAME, keys, projection=SEASON_FIELDS, plain=True)
+    }
+
+
+def process_batch_inference(player_puuids: List[str], year: int, force: bool = False) -> Dict:
+    """
+    Run all ML models for many players at once: BatchGetItem for every season
+    in season_window(year), one predict per model over the feature matrix,
+    and batched writes of the results. Players whose stored input_hash
+    still matches are skipped (unless force is set).
+    """
+    try:
+        player_puuids = list(dict.fromkeys(player_puuids))
+
+        # Same season window as query_player_seasons, so both paths see the same history
+        keys = [
+            {'player_puuid': puuid, 'year': season}
+            for puuid in player_puuids
+            for season in season_window(year)
+        ]
+
+        metrics_by_key = batch_get_metrics(keys)
+
+        scored_puuids = [puuid for puuid in player_puuids if (puuid, year) in metrics_by_key]
+        missing_puuids = [puuid for puuid in player_puuids if (puuid, year) not in metrics_by_key]
+
+        pipeline = MLModelPipeline(MODELS_BUCKET)
+        model_versions = pipeline.registry.versions()
+
+        # Only players whose inputs changed since the stored result are recomputed
+        stale = []
+        for puuid in scored_puuids:
+            current_metrics = metrics_by_key[(puuid, year)]
+            history = [
+                metrics_by_key[(puuid, season)]
+                for season in season_window(year)[:-1] if (puuid, season) in metrics_by_key
+            ]
+            input_hash = inference_input_hash(current_metrics, history, model_versions)
+            if force or cached_inference(current_metrics, input_hash) is None:
+                stale.append((puuid, current_metrics, history, input_hash))
+
+        model_outputs = pipeline.run_batch(
+            [current_metrics for _, current_metrics, _, _ in stale],
+            [history for _, _, history, _ in stale]
+        )
+
+        processed_at = datetime.utcnow().isoformat()
+
+        # Only ml_inference is written: putting back the whole item read above
+        # would undo metrics rewritten by feature engineering in the meantime
+        with ThreadPoolExecutor(max_workers=max(1, min(INFERENCE_WRITE_CONCURRENCY, len(stale)))) as executor:
+            futures = [
+                executor.submit(save_inference, puuid, year, {
+                    'player_puuid': puuid,
+                    'year': year,
+                    **outputs,
+                    'input_hash': input_hash,
+                    'processed_at': processed_at
+                })
+                for (puuid, _, _, input_hash), outputs in zip(stale, model_outputs)
+            ]
+            for future in futures:
+                future.result()
+
+        model_load = {
+            name: pipeline.registry.load_stats[name]
+            for name in MODEL_NAMES if name in pipeline.registry.load_stats
+        }
+
+        return {
+            'success': True,
+            'year': year,
+            'players_requested': len(player_puuids),
+            'players_scored': len(scored_puuids),
+            'missing_players': missing_puuids,
+            'inference_cache': {'hits': len(scored_puuids) - len(stale), 'misses': len(stale)},
+            'model_load': model_load
+        }
+
+    except Exception as e:
+        logger.error(f"Error in batch inference: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
 def lambda_handler(event, context):
     """
     Lambda handler for model inference
@@ -423,12 +889,27 @@ def lambda_handler(event, context):
     Event formats:
     {
         "player_puuid": "string",
-        "year": 2025
+        "year": 2025,
+        "force": false
     }
 
-    OR for training (annual batch):
+    OR batch inference over many players (annual run):
     {
-        "action": "train_models"
+        "player_puuids": ["string", ...],
+        "year": 2025,
+        "force": false
+    }
+
+    Results are memoized on ml_inference.input_hash; "force": true recomputes.
+
+    OR for training (annual batch; all fields except action optional):
+    {
+        "action": "train_models",
+        "year": 2025,
+        "segments": 4,
+        "epochs": 2,
+        "min_games": 50,
+        "publish": true
     }
     """
 
@@ -438,20 +919,36 @@ def lambda_handler(event, context):
         action = event.get('action')
 
         if action == 'train_models':
-            # This would trigger model training
-            # For now, return placeholder
+            # Imported here so scikit-learn is only loaded for training runs
+            from model_training import (
+                SCAN_SEGMENTS, TRAINING_EPOCHS, TRAINING_MIN_GAMES, train_models
+            )
+
+            result = train_models(
+                year=event.get('year'),
+                segments=int(event.get('segments', SCAN_SEGMENTS)),
+                epochs=int(event.get('epochs', TRAINING_EPOCHS)),
+                min_games=int(event.get('min_games', TRAINING_MIN_GAMES)),
+                publish=event.get('publish', True)
+            )
+
             return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': 'Model training triggered',
-                    'note': 'Training process would run here'
-                })
+                'statusCode': 200 if result['success'] else 500,
+                'body': dumps(result)
             }
 
         # Standard inference
         player_puuid = event.get('player_puuid')
         year = event.get('year', datetime.utcnow().year)
 
+        if event.get('player_puuids'):
+            result = process_batch_inference(event['player_puuids'], year, force=bool(event.get('force')))
+
+            return {
+                'statusCode': 200 if result['success'] else 500,
+                'body': dumps(result)
+            }
+
         if not player_puuid:
             return {
                 'statusCode': 400,
@@ -461,17 +958,17 @@ def lambda_handler(event, context):
             }
 
         # Run inference
-        result = process_player_inference(player_puuid, year)
+        result = process_player_inference(player_puuid, year, force=bool(event.get('force')))
 
         if result['success']:
             return {
                 'statusCode': 200,
-                'body': json.dumps(result)
+                'body': dumps(result)
             }
         else:
             return {
                 'statusCode': 500,
-                'body': json.dumps(result)
+                'body': dumps(result)
             }
 
     except Exception as e:
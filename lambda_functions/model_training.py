@@ -0,0 +1,416 @@
+"""
+RiftSage AI Agent - Model Training
+Streams MetricsTable through a parallel segmented scan (parallel_scan),
+fits the inference models incrementally and publishes versioned .rsm
+artifacts
+
+Training never holds the table in memory:
+    pass 1      running moments (mean / covariance) for the k-means
+                feature spaces, and a fixed-size reservoir sample for the
+                random forest
+    pass 2..N   MiniBatchKMeans.partial_fit over standardized (pattern) and
+                PCA-projected (playstyle) batches, one pass per epoch
+
+Artifacts are written to models/versions/{version}/{name}.rsm and then
+copied to models/{name}.rsm, where ModelRegistry loads them.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import boto3
+import numpy as np
+from boto3.dynamodb.conditions import Attr
+
+import rules_engine
+from parallel_scan import SCAN_SEGMENTS, ParallelScan
+from model_artifacts import (
+    ARTIFACT_EXTENSION, KMeansPredictor, PCAKMeansPredictor, PCAPredictor, TreeEnsemblePredictor,
+    convert_sklearn_model, load_artifact, save_artifact
+)
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Environment variables
+MODELS_BUCKET = os.environ.get('MODELS_BUCKET')
+METRICS_TABLE_NAME = os.environ.get('METRICS_TABLE')
+
+# Training configuration (defaults mirror config.yaml ml_models / metrics)
+TRAINING_BATCH_SIZE = int(os.environ.get('TRAINING_BATCH_SIZE', 2048))
+TRAINING_EPOCHS = int(os.environ.get('TRAINING_EPOCHS', 2))
+TRAINING_MIN_GAMES = int(os.environ.get('TRAINING_MIN_GAMES', 50))
+RESILIENCE_SAMPLE_SIZE = int(os.environ.get('RESILIENCE_SAMPLE_SIZE', 50000))
+TRAINING_WORK_DIR = os.environ.get('TRAINING_WORK_DIR', '/tmp/training')
+
+PATTERN_CLUSTERS = 3
+RESILIENCE_TREES = 100
+RESILIENCE_MIN_SAMPLES_LEAF = 20
+PLAYSTYLE_COMPONENTS = 4
+PLAYSTYLE_CLUSTERS = 6
+
+# Feature order must match MLModelPipeline._extract_*_features
+PATTERN_FEATURES = (
+    'kda',
+    'win_rate',
+    'deaths_per_game',
+    'avg_vision_score_per_min',
+    'avg_objective_participation',
+    'avg_cs_per_min',
+)
+RESILIENCE_FEATURES = ('comeback_wins', 'win_rate', 'total_games')
+PLAYSTYLE_FEATURES = (
+    'kills_per_game',
+    'deaths_per_game',
+    'assists_per_game',
+    'avg_objective_participation',
+    'avg_cs_per_min',
+    'kda',
+)
+
+TRAINING_FIELDS = tuple(sorted(set(PATTERN_FEATURES + RESILIENCE_FEATURES + PLAYSTYLE_FEATURES
+                                   + rules_engine.RULE_FIELDS)))
+
+
+# ====================================
+# Streaming input
+# ====================================
+
+def iter_batches(scan: ParallelScan, batch_size: int = TRAINING_BATCH_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """Regroup scan pages into metric-column batches of about batch_size players"""
+    pending = []
+    for page in scan.pages():
+        pending.extend(page)
+        while len(pending) >= batch_size:
+            yield rules_engine.metric_columns(pending[:batch_size], TRAINING_FIELDS)
+            pending = pending[batch_size:]
+
+    if pending:
+        yield rules_engine.metric_columns(pending, TRAINING_FIELDS)
+
+
+def feature_matrix(columns: Dict[str, np.ndarray], fields) -> np.ndarray:
+    """Stack metric columns into a feature matrix, absent metrics as 0 (as at inference)"""
+    return np.nan_to_num(np.column_stack([columns[field] for field in fields]), nan=0.0)
+
+
+# ====================================
+# Incremental learners
+# ====================================
+
+class RunningMoments:
+    """Streaming mean and covariance (Chan et al. pairwise merge)"""
+
+    def __init__(self, dimensions: int):
+        self.count = 0
+        self.mean = np.zeros(dimensions)
+        self.m2 = np.zeros((dimensions, dimensions))
+
+    def update(self, X: np.ndarray):
+        batch_count = len(X)
+        if batch_count == 0:
+            return
+        batch_mean = X.mean(axis=0)
+        centered = X - batch_mean
+        delta = batch_mean - self.mean
+        total = self.count + batch_count
+
+        self.m2 += centered.T @ centered + np.outer(delta, delta) * (self.count * batch_count / total)
+        self.mean += delta * (batch_count / total)
+        self.count = total
+
+    @property
+    def std(self) -> np.ndarray:
+        std = np.sqrt(np.diag(self.m2) / max(self.count - 1, 1))
+        # Constant features are left unscaled instead of dividing by zero
+        return np.where(std > 0, std, 1.0)
+
+    def correlation(self) -> np.ndarray:
+        covariance = self.m2 / max(self.count - 1, 1)
+        return covariance / np.outer(self.std, self.std)
+
+
+class Reservoir:
+    """Uniform fixed-size sample of a stream (Algorithm R, vectorized per batch)"""
+
+    def __init__(self, size: int, dimensions: int, seed: int = 0):
+        self.size = size
+        self.X = np.empty((size, dimensions))
+        self.y = np.empty(size)
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, X: np.ndarray, y: np.ndarray):
+        positions = np.arange(self.seen, self.seen + len(X))
+        # Row t fills slot t while the reservoir is filling, then replaces a
+        # random slot with probability size / (t + 1)
+        slots = np.where(positions < self.size, positions, self.rng.integers(0, positions + 1))
+        keep = slots < self.size
+        # Later rows win duplicate slots, as in the sequential algorithm
+        self.X[slots[keep]] = X[keep]
+        self.y[slots[keep]] = y[keep]
+        self.seen += len(X)
+
+    def sample(self):
+        filled = min(self.seen, self.size)
+        return self.X[:filled], self.y[:filled]
+
+
+class StreamingKMeans:
+    """MiniBatchKMeans fed in batches; partial_fit needs n_clusters rows to start"""
+
+    def __init__(self, n_clusters: int, seed: int = 0):
+        from sklearn.cluster import MiniBatchKMeans
+
+        self.model = MiniBatchKMeans(n_clusters=n_clusters, random_state=seed, n_init=3)
+        self.n_clusters = n_clusters
+        self.pending = None
+        self.fitted = False
+
+    def partial_fit(self, X: np.ndarray):
+        if not self.fitted:
+            X = X if self.pending is None else np.vstack([self.pending, X])
+            if len(X) < self.n_clusters:
+                self.pending = X
+                return
+            self.pending = None
+            self.fitted = True
+        self.model.partial_fit(X)
+
+    @property
+    def centroids(self) -> np.ndarray:
+        if not self.fitted:
+            raise ValueError(f"Not enough players to fit {self.n_clusters} clusters")
+        return np.asarray(self.model.cluster_centers_, dtype=np.float64)
+
+
+# ====================================
+# Models
+# ====================================
+
+def _standardizer(moments: RunningMoments) -> PCAPredictor:
+    """z-score transform expressed as a PCA with identity components"""
+    dimensions = len(moments.mean)
+    return PCAPredictor(moments.mean.copy(), np.eye(dimensions), moments.std)
+
+
+def _playstyle_projection(moments: RunningMoments, n_components: int) -> PCAPredictor:
+    """
+    PCA of the standardized playstyle features (eigenvectors of the
+    correlation matrix), with the standardization folded into mean and
+    components so one PCAPredictor maps raw features to component space.
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(moments.correlation())
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    components = eigenvectors[:, order].T
+    return PCAPredictor(moments.mean.copy(), components / moments.std)
+
+
+def _columns_from_rows(rows: np.ndarray, fields) -> Dict[str, np.ndarray]:
+    return {field: rows[:, i] for i, field in enumerate(fields)}
+
+
+def _pattern_labels(centroids: np.ndarray, standardizer: PCAPredictor) -> List[str]:
+    """Name each cluster by applying the rule-based classifier to its centroid"""
+    raw = centroids * standardizer.scale + standardizer.mean
+    return rules_engine.performance_pattern(_columns_from_rows(raw, PATTERN_FEATURES)).tolist()
+
+
+def _playstyle_labels(centroids: np.ndarray, moments: RunningMoments, projection: PCAPredictor) -> List[str]:
+    """Name each cluster by the rule-based archetype of its centroid in feature space"""
+    standardized_components = projection.components * moments.std
+    raw = (centroids @ standardized_components) * moments.std + moments.mean
+    columns = _columns_from_rows(raw, PLAYSTYLE_FEATURES)
+
+    aggression = rules_engine.aggression_index(columns)
+    teamwork = rules_engine.teamwork_orientation(columns)
+    mechanical = rules_engine.mechanical_skill(columns)
+    return rules_engine.archetype(aggression, teamwork, mechanical).tolist()
+
+
+def _fit_resilience(reservoir: Reservoir) -> TreeEnsemblePredictor:
+    """
+    Random forests cannot be fitted incrementally, so the forest is trained
+    on the bounded reservoir sample. There are no resilience labels in
+    MetricsTable; the target is the rule-based resilience score.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+
+    X, y = reservoir.sample()
+    if len(X) == 0:
+        raise ValueError('No players to fit mental_resilience_calculator')
+
+    forest = RandomForestRegressor(
+        n_estimators=RESILIENCE_TREES,
+        min_samples_leaf=RESILIENCE_MIN_SAMPLES_LEAF,
+        random_state=0,
+        n_jobs=-1
+    )
+    forest.fit(X, y)
+    return convert_sklearn_model(forest)
+
+
+# ====================================
+# Publishing
+# ====================================
+
+def publish_artifacts(bucket: str, version: str, artifacts: Dict[str, str], manifest: Dict) -> Dict[str, str]:
+    """
+    Upload artifacts under models/versions/{version}/ and promote them to
+    models/{name}.rsm. Promotion happens only after every upload succeeded.
+    """
+    s3_client = boto3.client('s3')
+    version_prefix = f"models/versions/{version}"
+
+    for model_name, path in artifacts.items():
+        s3_client.upload_file(path, bucket, f"{version_prefix}/{model_name}{ARTIFACT_EXTENSION}")
+
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=f"{version_prefix}/manifest.json",
+        Body=json.dumps(manifest, indent=2, default=str),
+        ContentType='application/json'
+    )
+
+    published = {}
+    for model_name in artifacts:
+        live_key = f"models/{model_name}{ARTIFACT_EXTENSION}"
+        s3_client.copy_object(
+            Bucket=bucket,
+            Key=live_key,
+            CopySource={'Bucket': bucket, 'Key': f"{version_prefix}/{model_name}{ARTIFACT_EXTENSION}"}
+        )
+        published[model_name] = live_key
+
+    return published
+
+
+# ====================================
+# Training pipeline
+# ====================================
+
+def train_models(year: int = None, segments: int = SCAN_SEGMENTS, epochs: int = TRAINING_EPOCHS,
+                 min_games: int = TRAINING_MIN_GAMES, publish: bool = True) -> Dict:
+    """Train the inference models from MetricsTable and publish a new version"""
+    started = time.perf_counter()
+    version = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+
+    filter_expression = Attr('total_games').gte(min_games)
+    if year is not None:
+        filter_expression = filter_expression & Attr('year').eq(int(year))
+
+    scan_stats = {'passes': 0, 'items': 0, 'throttle_retries': 0}
+
+    def batches():
+        scan = ParallelScan(METRICS_TABLE_NAME, total_segments=segments, projection=TRAINING_FIELDS,
+                            filter_expression=filter_expression)
+        yield from iter_batches(scan)
+        scan_stats['passes'] += 1
+        scan_stats['items'] += scan.stats['items']
+        scan_stats['throttle_retries'] += scan.stats['throttle_retries']
+
+    # Pass 1: moments for the k-means feature spaces, reservoir for the forest
+    pattern_moments = RunningMoments(len(PATTERN_FEATURES))
+    playstyle_moments = RunningMoments(len(PLAYSTYLE_FEATURES))
+    reservoir = Reservoir(RESILIENCE_SAMPLE_SIZE, len(RESILIENCE_FEATURES))
+
+    for columns in batches():
+        pattern_moments.update(feature_matrix(columns, PATTERN_FEATURES))
+        playstyle_moments.update(feature_matrix(columns, PLAYSTYLE_FEATURES))
+        reservoir.update(feature_matrix(columns, RESILIENCE_FEATURES), rules_engine.resilience_score(columns))
+
+    players = pattern_moments.count
+    logger.info(f"Training pass 1: {players} players in {time.perf_counter() - started:.1f}s")
+
+    if players == 0:
+        return {'success': False, 'error': 'No players matched the training filter', 'version': version}
+
+    # Pass 2..N: minibatch k-means in standardized / PCA space
+    pattern_standardizer = _standardizer(pattern_moments)
+    playstyle_projection = _playstyle_projection(playstyle_moments, PLAYSTYLE_COMPONENTS)
+    pattern_kmeans = StreamingKMeans(PATTERN_CLUSTERS)
+    playstyle_kmeans = StreamingKMeans(PLAYSTYLE_CLUSTERS)
+
+    for epoch in range(epochs):
+        for columns in batches():
+            pattern_kmeans.partial_fit(pattern_standardizer.transform(feature_matrix(columns, PATTERN_FEATURES)))
+            playstyle_kmeans.partial_fit(
+                playstyle_projection.transform(feature_matrix(columns, PLAYSTYLE_FEATURES))
+            )
+        logger.info(f"Training epoch {epoch + 1}/{epochs} done at {time.perf_counter() - started:.1f}s")
+
+    predictors = {
+        'performance_pattern_analyzer': (
+            'kmeans', PATTERN_FEATURES,
+            PCAKMeansPredictor(pattern_standardizer, KMeansPredictor(
+                pattern_kmeans.centroids, _pattern_labels(pattern_kmeans.centroids, pattern_standardizer)
+            ))
+        ),
+        'mental_resilience_calculator': ('random_forest', RESILIENCE_FEATURES, _fit_resilience(reservoir)),
+        'playstyle_profiler': (
+            'pca_kmeans', PLAYSTYLE_FEATURES,
+            PCAKMeansPredictor(playstyle_projection, KMeansPredictor(
+                playstyle_kmeans.centroids,
+                _playstyle_labels(playstyle_kmeans.centroids, playstyle_moments, playstyle_projection)
+            ))
+        ),
+    }
+
+    work_dir = os.path.join(TRAINING_WORK_DIR, version)
+    os.makedirs(work_dir, exist_ok=True)
+
+    artifacts = {}
+    models = {}
+    for model_name, (algorithm, features, predictor) in predictors.items():
+        path = os.path.join(work_dir, f"{model_name}{ARTIFACT_EXTENSION}")
+        save_artifact(predictor, path, metadata={
+            'model_name': model_name,
+            'version': version,
+            'algorithm': algorithm,
+            'features': list(features),
+            'players': players,
+            'year': year,
+            'trained_at': datetime.utcnow().isoformat()
+        })
+        # Round-trip check so a bad artifact never gets published
+        load_artifact(path)
+
+        artifacts[model_name] = path
+        models[model_name] = {
+            'algorithm': algorithm,
+            'artifact_bytes': os.path.getsize(path),
+            'labels': predictor.kmeans.params().get('labels') if hasattr(predictor, 'kmeans') else None
+        }
+
+    # No per-player sequences exist in MetricsTable and inference does not
+    # load a growth model, so the configured lstm is not trained
+    models['growth_trajectory_analyzer'] = {'algorithm': 'lstm', 'status': 'skipped',
+                                            'reason': 'no sequence training data'}
+
+    manifest = {
+        'version': version,
+        'year': year,
+        'players': players,
+        'resilience_sample': int(min(reservoir.seen, reservoir.size)),
+        'epochs': epochs,
+        'segments': segments,
+        'min_games': min_games,
+        'models': models,
+    }
+
+    if publish:
+        published = publish_artifacts(MODELS_BUCKET, version, artifacts, manifest)
+        for model_name, key in published.items():
+            models[model_name]['s3_key'] = key
+
+    manifest.update({
+        'scan': scan_stats,
+        'success': True,
+        'published': publish,
+        'duration_seconds': round(time.perf_counter() - started, 2),
+    })
+    return manifest
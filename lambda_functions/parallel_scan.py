@@ -0,0 +1,319 @@
+"""
+RiftSage AI Agent - Parallel Segmented Scan
+Streams a DynamoDB table through TotalSegments/Segment worker threads
+
+For population-wide jobs (training, percentile rebuilds, re-scoring,
+exports):
+
+    scan = ParallelScan(METRICS_TABLE_NAME, total_segments=8,
+                        projection=('player_puuid', 'year', 'kda'),
+                        checkpoint=S3Checkpoint(bucket, 'jobs/rescore.json'))
+    for item in scan.items():
+        ...
+
+- Pages are handed over through a bounded queue, so memory stays flat
+  whatever the table size.
+- Throttled requests are retried with exponential backoff, and a shared
+  pacer adds delay between all workers' requests while throttling lasts
+  (doubling on throttle, halving on success).
+- With a checkpoint, each segment's cursor is saved once the caller has
+  consumed its page; an interrupted job (error, timeout, or the caller
+  stopping early) resumes from those cursors and skips finished
+  segments. A scan that runs to completion clears its checkpoint, so the
+  next run starts over.
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import lazy
+from codec import dumps, to_dynamo
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', 4))
+SCAN_MAX_RETRIES = int(os.environ.get('SCAN_MAX_RETRIES', 8))
+# Seconds between checkpoint writes (a final write always happens at the end)
+CHECKPOINT_INTERVAL_SECONDS = float(os.environ.get('SCAN_CHECKPOINT_INTERVAL', 10))
+
+THROTTLE_CODES = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+)
+
+
+# ====================================
+# Checkpoint stores
+# ====================================
+
+class FileCheckpoint:
+    """Scan state in a local JSON file (scripts, long-running jobs)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, state: Dict):
+        # Write-then-rename so a crash never leaves a truncated checkpoint
+        with open(f"{self.path}.part", 'w') as f:
+            f.write(dumps(state))
+        os.replace(f"{self.path}.part", self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class S3Checkpoint:
+    """Scan state in an S3 object (Lambda jobs that may time out and be re-invoked)"""
+
+    def __init__(self, bucket: str, key: str):
+        self.bucket = bucket
+        self.key = key
+        self.s3_client = lazy.client('s3')
+
+    def load(self) -> Optional[Dict]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self.key)
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        return json.loads(response['Body'].read())
+
+    def save(self, state: Dict):
+        self.s3_client.put_object(Bucket=self.bucket, Key=self.key, Body=dumps(state),
+                                  ContentType='application/json')
+
+    def clear(self):
+        self.s3_client.delete_object(Bucket=self.bucket, Key=self.key)
+
+
+# ====================================
+# Throttling
+# ====================================
+
+class _Pacer:
+    """Delay shared by all segment workers; grows while DynamoDB throttles"""
+
+    def __init__(self, base_delay: float = 0.05, max_delay: float = 5.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if self.delay:
+            time.sleep(self.delay)
+
+    def throttled(self):
+        with self._lock:
+            self.delay = min(self.max_delay, max(self.base_delay, self.delay * 2))
+
+    def succeeded(self):
+        with self._lock:
+            self.delay = self.delay / 2 if self.delay > self.base_delay else 0.0
+
+
+def _is_throttle(error: Exception) -> bool:
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code') in THROTTLE_CODES
+
+
+# ====================================
+# Parallel scan
+# ====================================
+
+class ParallelScan:
+    """Parallel segmented scan of one table; iterate pages() or items()"""
+
+    def __init__(self, table_name: str, total_segments: int = SCAN_SEGMENTS, projection=None,
+                 filter_expression=None, expression_names: Dict = None, expression_values: Dict = None,
+                 page_size: int = None, checkpoint=None, max_retries: int = SCAN_MAX_RETRIES):
+        self.table_name = table_name
+        self.total_segments = total_segments
+        self.checkpoint = checkpoint
+        self.max_retries = max_retries
+
+        self.scan_kwargs = {}
+        # expression_names: '#name' placeholders used by a string filter_expression
+        names = dict(expression_names or {})
+        if projection:
+            projected = {f'#p{i}': field for i, field in enumerate(projection)}
+            self.scan_kwargs['ProjectionExpression'] = ', '.join(projected)
+            names.update(projected)
+        if names:
+            self.scan_kwargs['ExpressionAttributeNames'] = names
+        if filter_expression is not None:
+            self.scan_kwargs['FilterExpression'] = filter_expression
+        if expression_values:
+            self.scan_kwargs['ExpressionAttributeValues'] = expression_values
+        if page_size:
+            self.scan_kwargs['Limit'] = page_size
+
+        self.stats = {
+            'pages': 0,
+            'items': 0,
+            'scanned': 0,
+            'throttle_retries': 0,
+            'segments_resumed': 0,
+            'segments_skipped': 0,
+        }
+        self._pacer = _Pacer()
+        self._stats_lock = threading.Lock()
+
+    def _initial_state(self) -> Dict:
+        state = self.checkpoint.load() if self.checkpoint is not None else None
+        if state is None:
+            return {
+                'table': self.table_name,
+                'total_segments': self.total_segments,
+                'segments': {str(segment): {'last_key': None, 'done': False}
+                             for segment in range(self.total_segments)}
+            }
+
+        if state.get('table') != self.table_name or state.get('total_segments') != self.total_segments:
+            raise ValueError(
+                f"Checkpoint is for {state.get('table')} with {state.get('total_segments')} segments; "
+                f"clear it to scan {self.table_name} with {self.total_segments}"
+            )
+        return state
+
+    def _scan_page(self, table, kwargs: Dict) -> Dict:
+        for attempt in range(self.max_retries + 1):
+            self._pacer.wait()
+            try:
+                response = table.scan(**kwargs)
+            except Exception as e:
+                if not _is_throttle(e) or attempt == self.max_retries:
+                    raise
+                self._pacer.throttled()
+                with self._stats_lock:
+                    self.stats['throttle_retries'] += 1
+                # Exponential backoff with full jitter on top of the shared pacing
+                time.sleep(random.uniform(0, min(10.0, 0.1 * 2 ** attempt)))
+                continue
+
+            self._pacer.succeeded()
+            return response
+
+    def _scan_segment(self, segment: int, start_key: Dict, put) -> None:
+        # boto3 resources are not thread-safe; one session per worker
+        import boto3
+        table = boto3.session.Session().resource('dynamodb').Table(self.table_name)
+
+        kwargs = dict(self.scan_kwargs, Segment=segment, TotalSegments=self.total_segments)
+        if start_key:
+            kwargs['ExclusiveStartKey'] = to_dynamo(start_key)
+
+        while True:
+            response = self._scan_page(table, kwargs)
+            last_key = response.get('LastEvaluatedKey')
+
+            with self._stats_lock:
+                self.stats['scanned'] += response.get('ScannedCount', 0)
+
+            # Empty pages are still passed on so the segment's cursor advances
+            if not put((segment, response['Items'], last_key)):
+                return
+            if last_key is None:
+                return
+            kwargs['ExclusiveStartKey'] = last_key
+
+    def pages(self) -> Iterator[List[Dict]]:
+        """Yield non-empty pages of items as workers produce them"""
+        state = self._initial_state()
+        pending = [int(segment) for segment, cursor in state['segments'].items() if not cursor['done']]
+        self.stats['segments_skipped'] = self.total_segments - len(pending)
+        self.stats['segments_resumed'] = sum(
+            1 for segment in pending if state['segments'][str(segment)]['last_key']
+        )
+
+        if not pending:
+            # Left by a completed run from before checkpoints were cleared
+            if self.checkpoint is not None:
+                self.checkpoint.clear()
+            return
+
+        results = queue.Queue(maxsize=2 * len(pending))
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run(segment: int):
+            try:
+                self._scan_segment(segment, state['segments'][str(segment)]['last_key'], put)
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+
+        last_saved = time.monotonic()
+        finished = False
+
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='scan') as executor:
+            for segment in pending:
+                executor.submit(run, segment)
+
+            try:
+                remaining = len(pending)
+                while remaining:
+                    item = results.get()
+                    if item is done:
+                        remaining -= 1
+                        continue
+                    if isinstance(item, Exception):
+                        raise item
+
+                    segment, page, last_key = item
+                    if page:
+                        with self._stats_lock:
+                            self.stats['pages'] += 1
+                            self.stats['items'] += len(page)
+                        yield page
+
+                    # Resumed after the yield: the caller has finished this page
+                    self._advance(state, segment, last_key)
+                    if self.checkpoint is not None and \
+                            time.monotonic() - last_saved >= CHECKPOINT_INTERVAL_SECONDS:
+                        self.checkpoint.save(state)
+                        last_saved = time.monotonic()
+                finished = True
+            finally:
+                stop.set()
+                if self.checkpoint is not None:
+                    if finished:
+                        # Complete: a rerun must scan again, not resume into nothing
+                        self.checkpoint.clear()
+                    else:
+                        self.checkpoint.save(state)
+
+    def _advance(self, state: Dict, segment: int, last_key: Optional[Dict]):
+        cursor = state['segments'][str(segment)]
+        cursor['last_key'] = last_key
+        cursor['done'] = last_key is None
+
+    def items(self) -> Iterator[Dict]:
+        """Yield items one at a time"""
+        for page in self.pages():
+            yield from page
@@ -5,17 +5,19 @@ Assembles all sections into a complete report
 
 import json
 import os
-import boto3
 import logging
 from datetime import datetime
 from typing import Dict, List, Any
 
+import lazy
+from codec import dumps
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+dynamodb = lazy.resource('dynamodb')
+s3_client = lazy.client('s3')
 
 # Environment variables
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'development')
@@ -23,23 +25,37 @@ INSIGHTS_TABLE_NAME = os.environ.get('INSIGHTS_TABLE')
 REPORTS_BUCKET = os.environ.get('REPORTS_BUCKET')
 
 
+# Only the attributes the report is built from (the data package behind a section stays in S3)
+SECTION_PROJECTION = ('section_id', 'section_type', 'content', 'generated_at')
+
+
 def get_all_sections(player_puuid: str, year: int) -> List[Dict]:
     """Retrieve all generated sections for a player"""
     try:
         insights_table = dynamodb.Table(INSIGHTS_TABLE_NAME)
 
-        # Query all sections for this player and year
-        response = insights_table.query(
-            KeyConditionExpression='player_puuid = :puuid',
-            FilterExpression='#year = :year',
-            ExpressionAttributeNames={'#year': 'year'},
-            ExpressionAttributeValues={
+        # Query the player's sections for this year (section_id is "{year}_{section_type}")
+        names = {f'#p{i}': field for i, field in enumerate(SECTION_PROJECTION)}
+        kwargs = {
+            'KeyConditionExpression': 'player_puuid = :puuid AND begins_with(section_id, :year_prefix)',
+            'ProjectionExpression': ', '.join(names),
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': {
                 ':puuid': player_puuid,
-                ':year': year
+                ':year_prefix': f"{year}_"
             }
-        )
+        }
+
+        items = []
+        while True:
+            response = insights_table.query(**kwargs)
+            items.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
-        sections = response.get('Items', [])
+        # A section still streaming its first generation has no content yet
+        sections = [item for item in items if 'content' in item]
 
         logger.info(f"Found {len(sections)} sections for {player_puuid}")
 
@@ -100,7 +116,7 @@ def compile_report(player_puuid: str, year: int) -> Dict:
 
 def generate_json_report(report_data: Dict) -> str:
     """Generate JSON format report"""
-    return json.dumps(report_data, indent=2)
+    return dumps(report_data, indent=2)
 
 
 def generate_markdown_report(report_data: Dict) -> str:
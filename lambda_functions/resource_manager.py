@@ -6,18 +6,20 @@ Only provisions/uses resources when actively processing requests
 
 import json
 import os
-import boto3
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+import lazy
+from codec import to_dynamo, dumps
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-lambda_client = boto3.client('lambda')
-cloudwatch = boto3.client('cloudwatch')
+dynamodb = lazy.resource('dynamodb')
+lambda_client = lazy.client('lambda')
+cloudwatch = lazy.client('cloudwatch')
 
 # Environment variables
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'development')
@@ -46,7 +48,7 @@ class ResourceManager:
         try:
             state['resource_id'] = resource_id
             state['updated_at'] = datetime.utcnow().isoformat()
-            self.state_table.put_item(Item=state)
+            self.state_table.put_item(Item=to_dynamo(state))
             logger.info(f"Updated state for {resource_id}")
         except Exception as e:
             logger.error(f"Error updating resource state: {str(e)}")
@@ -306,7 +308,7 @@ def lambda_handler(event, context):
 
             return {
                 'statusCode': 200,
-                'body': json.dumps({
+                'body': dumps({
                     'current_state': state,
                     'activity': activity
                 })
@@ -0,0 +1,178 @@
+"""
+RiftSage AI Agent - Rules Engine
+Vectorized rule-based scoring over many players at once
+
+NumPy counterparts of the per-player fallbacks in
+model_inference.MLModelPipeline (_rule_based_performance_pattern,
+_rule_based_resilience_score, _calculate_aggression_index,
+_calculate_teamwork_orientation, _calculate_mechanical_skill and
+_determine_archetype). Each rule reads float64 metric columns and applies
+the same arithmetic in the same order, so labels and scores are identical
+to the scalar versions. Missing (or None) metrics are NaN in the columns
+and replaced by the scalar version's default inside each rule.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List
+
+import lazy
+
+# numpy is executed on first use, so importing this module stays cheap
+np = lazy.lazy_import('numpy')
+
+# Metric fields read by the rules
+RULE_FIELDS = (
+    'kda',
+    'win_rate',
+    'total_games',
+    'comeback_wins',
+    'kills_per_game',
+    'deaths_per_game',
+    'assists_per_game',
+    'avg_cs_per_min',
+    'avg_vision_score_per_min',
+    'avg_objective_participation',
+)
+
+PERFORMANCE_PATTERNS = (
+    'aggressive_combat_with_survival',
+    'high_risk_high_reward',
+    'vision_focused_support',
+)
+DEFAULT_PERFORMANCE_PATTERN = 'balanced_gameplay'
+
+ARCHETYPES = (
+    'Strategic Enabler',
+    'Mechanical Carry',
+    'Late-Game Scaler',
+    'Aggressive Playmaker',
+    'Team-Oriented Support',
+)
+DEFAULT_ARCHETYPE = 'Balanced All-Rounder'
+
+
+# ====================================
+# Column extraction
+# ====================================
+
+def _metric_values(metrics_list: List[Dict], fields) -> Iterator[float]:
+    """Every field of every item as a float, row by row (NaN when absent or None)"""
+    nan = float('nan')
+    for metrics in metrics_list:
+        get = metrics.get
+        for field in fields:
+            value = get(field)
+            yield nan if value is None else float(value)
+
+
+def metric_columns(metrics_list: List[Dict], fields=RULE_FIELDS) -> Dict[str, np.ndarray]:
+    """
+    Turn a list of metrics items into one float64 column per field (NaN when absent).
+
+    A single pass over the items fills one block with np.fromiter; this
+    costs far less than a per-field np.array over object lists, and less
+    still when the items already hold floats (batch_get_items(plain=True))
+    instead of DynamoDB Decimals.
+    """
+    block = np.fromiter(_metric_values(metrics_list, fields), dtype=np.float64,
+                        count=len(metrics_list) * len(fields))
+    # Contiguous column-major copy, so each rule reads its columns sequentially
+    block = np.ascontiguousarray(block.reshape(len(metrics_list), len(fields)).T)
+    return {field: block[i] for i, field in enumerate(fields)}
+
+
+def _column(columns: Dict[str, np.ndarray], field: str, default: float) -> np.ndarray:
+    values = columns[field]
+    return np.where(np.isnan(values), default, values)
+
+
+# ====================================
+# Rules
+# ====================================
+
+def performance_pattern(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Rule-based performance pattern label per player"""
+    kda = _column(columns, 'kda', 0.0)
+    deaths_per_game = _column(columns, 'deaths_per_game', 0.0)
+    vision_per_min = _column(columns, 'avg_vision_score_per_min', 0.0)
+
+    conditions = [
+        (kda > 3.0) & (deaths_per_game < 5),
+        deaths_per_game > 7,
+        vision_per_min > 1.0,
+    ]
+    return np.select(conditions, PERFORMANCE_PATTERNS, default=DEFAULT_PERFORMANCE_PATTERN)
+
+
+def resilience_score(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Rule-based resilience score (0-100) per player"""
+    total_games = _column(columns, 'total_games', 1.0)
+    comeback_wins = _column(columns, 'comeback_wins', 0.0)
+    win_rate = _column(columns, 'win_rate', 0.0)
+
+    comeback_rate = np.zeros_like(total_games)
+    played = total_games > 0
+    comeback_rate[played] = (comeback_wins[played] / total_games[played]) * 100
+
+    score = (comeback_rate * 0.4) + (win_rate * 0.6)
+    return np.minimum(100, np.maximum(0, score))
+
+
+def aggression_index(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Aggression index (0-100) per player"""
+    kills_per_game = _column(columns, 'kills_per_game', 0.0)
+    deaths_per_game = _column(columns, 'deaths_per_game', 1.0)
+    return np.minimum(100, (kills_per_game * 5) + (deaths_per_game * 3))
+
+
+def teamwork_orientation(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Teamwork orientation (0-100) per player"""
+    assists_per_game = _column(columns, 'assists_per_game', 0.0)
+    obj_participation = _column(columns, 'avg_objective_participation', 0.0)
+    return np.minimum(100, (assists_per_game * 8) + (obj_participation * 100))
+
+
+def mechanical_skill(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Mechanical skill (0-100) per player"""
+    cs_per_min = _column(columns, 'avg_cs_per_min', 0.0)
+    kda = _column(columns, 'kda', 0.0)
+    return np.minimum(100, (cs_per_min * 10) + (kda * 5))
+
+
+def archetype(aggression: np.ndarray, teamwork: np.ndarray, mechanical: np.ndarray) -> np.ndarray:
+    """Playstyle archetype label per player; first matching rule wins"""
+    conditions = [
+        (teamwork > 60) & (aggression < 50),
+        (aggression > 70) & (mechanical > 60),
+        mechanical > 70,
+        aggression > 60,
+        teamwork > 70,
+    ]
+    return np.select(conditions, ARCHETYPES, default=DEFAULT_ARCHETYPE)
+
+
+# ====================================
+# Entry point
+# ====================================
+
+def evaluate(metrics_list: List[Dict]) -> Dict[str, List]:
+    """
+    Run every rule over a list of metrics items in one pass.
+    Returns plain Python lists (str/float) aligned with metrics_list, so
+    values can go straight into DynamoDB items and JSON bodies.
+    """
+    columns = metric_columns(metrics_list)
+
+    aggression = aggression_index(columns)
+    teamwork = teamwork_orientation(columns)
+    mechanical = mechanical_skill(columns)
+
+    return {
+        'performance_pattern': performance_pattern(columns).tolist(),
+        'resilience_score': resilience_score(columns).tolist(),
+        'aggression_index': aggression.tolist(),
+        'teamwork_orientation': teamwork.tolist(),
+        'mechanical_skill': mechanical.tolist(),
+        'archetype': archetype(aggression, teamwork, mechanical).tolist(),
+    }
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Offline Feature Backfill
+Recomputes match features and aggregated metrics for every player in bulk
+
+Reads raw-matches/PUUID/YEAR/match_id.json from a local mirror or an
+S3-compatible bucket, shards players across a process pool, and writes
+feature records plus aggregated metrics in batches. Completed players are
+checkpointed so an interrupted run can be resumed.
+
+Usage:
+    # Local mirror (./mirror/raw-matches/...), metrics to JSONL
+    python scripts/backfill_features.py --source ./mirror --year 2025 --output ./backfill
+
+    # S3 (or MinIO/localstack via --endpoint-url), metrics to MetricsTable
+    python scripts/backfill_features.py --source s3://riftsage-data-production-123 \\
+        --year 2025 --metrics-table riftsage-Metrics-production --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# boto3 clients need a region when created (on first use, or at import with
+# LAZY_INIT=false); set one so the script also runs on machines without AWS
+# configuration (local mirror mode).
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+from codec import dumps, to_dynamo  # noqa: E402
+from feature_engineering import (  # noqa: E402
+    FEATURE_SCHEMA_VERSION,
+    RAW_MATCHES_PREFIX,
+    aggregate_metrics,
+    extract_features_from_match,
+    MatchFeatures,
+    get_feature_key,
+)
+
+
+class LocalStore:
+    """Directory laid out like the data bucket (raw-matches/, features/)"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def list_players(self, year: int) -> List[str]:
+        base = os.path.join(self.root, RAW_MATCHES_PREFIX)
+        if not os.path.isdir(base):
+            return []
+        return sorted(
+            puuid for puuid in os.listdir(base)
+            if os.path.isdir(os.path.join(base, puuid, str(year)))
+        )
+
+    def list_matches(self, puuid: str, year: int) -> List[Tuple[str, Optional[str]]]:
+        """Return (key, etag) pairs; local ETags are computed lazily on read"""
+        directory = os.path.join(self.root, RAW_MATCHES_PREFIX, puuid, str(year))
+        return [
+            (f"{RAW_MATCHES_PREFIX}/{puuid}/{year}/{name}", None)
+            for name in sorted(os.listdir(directory))
+            if name.endswith('.json')
+        ]
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.root, key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def etag(self, key: str, body: bytes = None) -> str:
+        # MD5 of the content matches S3's ETag for single-part uploads, so
+        # feature records stay valid when a mirror is synced back to S3.
+        if body is None:
+            body = self.read(key)
+        return hashlib.md5(body).hexdigest()
+
+    def write(self, key: str, body: str):
+        path = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(body)
+
+
+class S3Store:
+    """S3 or any S3-compatible endpoint"""
+
+    def __init__(self, bucket: str, endpoint_url: str = None):
+        import boto3
+
+        self.bucket = bucket
+        self.client = boto3.client('s3', endpoint_url=endpoint_url)
+
+    def list_players(self, year: int) -> List[str]:
+        players = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{RAW_MATCHES_PREFIX}/", Delimiter='/'):
+            for prefix in page.get('CommonPrefixes', []):
+                players.append(prefix['Prefix'].split('/')[1])
+
+        # Keep only players with a folder for this year
+        return sorted(
+            puuid for puuid in players
+            if self.client.list_objects_v2(
+                Bucket=self.bucket, Prefix=f"{RAW_MATCHES_PREFIX}/{puuid}/{year}/", MaxKeys=1
+            ).get('KeyCount', 0) > 0
+        )
+
+    def list_matches(self, puuid: str, year: int) -> List[Tuple[str, Optional[str]]]:
+        matches = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{RAW_MATCHES_PREFIX}/{puuid}/{year}/"):
+            for obj in page.get('Contents', []):
+                if obj['Key'].endswith('.json'):
+                    matches.append((obj['Key'], obj['ETag'].strip('"')))
+        return matches
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+    def etag(self, key: str, body: bytes = None) -> str:
+        return self.client.head_object(Bucket=self.bucket, Key=key)['ETag'].strip('"')
+
+    def write(self, key: str, body: str):
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=body, ContentType='application/json')
+
+
+def open_store(source: str, endpoint_url: str = None):
+    """Build a store from a local path or s3://bucket URI"""
+    if source.startswith('s3://'):
+        return S3Store(source[len('s3://'):].strip('/'), endpoint_url)
+    return LocalStore(source)
+
+
+# Per-process state, set up once by the pool initializer
+_worker = {}
+
+
+def _init_worker(source: str, endpoint_url: str, year: int, force: bool):
+    _worker['store'] = open_store(source, endpoint_url)
+    _worker['year'] = year
+    _worker['force'] = force
+
+
+def _load_current_features(store, key: str, etag: str) -> Optional[MatchFeatures]:
+    """Return stored features if written by this schema version from this source"""
+    body = store.read(get_feature_key(key))
+    if body is None:
+        return None
+    record = json.loads(body)
+    if record.get('schema_version') == FEATURE_SCHEMA_VERSION and record.get('source_etag') == etag:
+        return MatchFeatures.from_dict(record['features'])
+    return None
+
+
+def process_player(puuid: str) -> Dict:
+    """Extract (or reuse) features for every match of one player and aggregate them"""
+    store, year, force = _worker['store'], _worker['year'], _worker['force']
+
+    all_match_features = []
+    reused = 0
+    failed = 0
+
+    for key, etag in store.list_matches(puuid, year):
+        try:
+            body = None
+            if etag is None:
+                body = store.read(key)
+                etag = store.etag(key, body)
+
+            features = None if force else _load_current_features(store, key, etag)
+            if features is not None:
+                reused += 1
+            else:
+                if body is None:
+                    body = store.read(key)
+                features = extract_features_from_match(json.loads(body), puuid)
+                store.write(get_feature_key(key), dumps({
+                    'schema_version': FEATURE_SCHEMA_VERSION,
+                    'source_key': key,
+                    'source_etag': etag,
+                    'extracted_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime()),
+                    'features': features.to_dict()
+                }))
+
+            all_match_features.append(features)
+        except Exception as e:
+            print(f"✗ {key}: {str(e)}", file=sys.stderr)
+            failed += 1
+
+    return {
+        'player_puuid': puuid,
+        'metrics': aggregate_metrics(all_match_features, year) if all_match_features else None,
+        'matches': len(all_match_features),
+        'reused': reused,
+        'failed': failed
+    }
+
+
+def _process_shard(puuids: List[str]) -> List[Dict]:
+    return [process_player(puuid) for puuid in puuids]
+
+
+class JsonlSink:
+    """Append aggregated metrics to a local JSONL file"""
+
+    def __init__(self, output_dir: str, year: int, reset: bool = False):
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, f"metrics-{year}.jsonl")
+        if reset and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write_batch(self, results: List[Dict]):
+        with open(self.path, 'a') as f:
+            for result in results:
+                f.write(dumps({'player_puuid': result['player_puuid'], **result['metrics']}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class DynamoSink:
+    """Write aggregated metrics to MetricsTable with BatchWriteItem"""
+
+    def __init__(self, table_name: str, region: str, endpoint_url: str = None):
+        import boto3
+
+        self.table = boto3.resource('dynamodb', region_name=region, endpoint_url=endpoint_url).Table(table_name)
+
+    def write_batch(self, results: List[Dict]):
+        with self.table.batch_writer(overwrite_by_pkeys=['player_puuid', 'year']) as writer:
+            for result in results:
+                writer.put_item(Item={'player_puuid': result['player_puuid'], **to_dynamo(result['metrics'])})
+
+
+def load_checkpoint(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def append_checkpoint(path: str, puuids: Iterable[str]):
+    with open(path, 'a') as f:
+        for puuid in puuids:
+            f.write(puuid + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def chunked(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_backfill(args) -> Dict:
+    store = open_store(args.source, args.endpoint_url)
+    players = store.list_players(args.year)
+
+    checkpoint_path = args.checkpoint or f".backfill-{args.year}.checkpoint"
+    done = set() if args.restart else load_checkpoint(checkpoint_path)
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    pending = [puuid for puuid in players if puuid not in done]
+
+    print(f"Players found: {len(players)}  already done: {len(players) - len(pending)}  pending: {len(pending)}")
+    print(f"Workers: {args.workers}  shard size: {args.shard_size}  batch size: {args.batch_size}")
+
+    if args.metrics_table:
+        sink = DynamoSink(args.metrics_table, args.region, args.dynamodb_endpoint_url)
+    else:
+        sink = JsonlSink(args.output, args.year, reset=args.restart)
+
+    totals = {'players': 0, 'matches': 0, 'reused': 0, 'failed': 0, 'empty': 0}
+    buffer = []
+    started = time.monotonic()
+
+    def flush():
+        written = [r for r in buffer if r['metrics'] is not None]
+        if written:
+            sink.write_batch(written)
+        # Checkpoint only after the batch is durable
+        append_checkpoint(checkpoint_path, (r['player_puuid'] for r in buffer))
+        buffer.clear()
+
+    with multiprocessing.Pool(
+        processes=args.workers,
+        initializer=_init_worker,
+        initargs=(args.source, args.endpoint_url, args.year, args.force)
+    ) as pool:
+        for shard_results in pool.imap_unordered(_process_shard, chunked(pending, args.shard_size)):
+            for result in shard_results:
+                totals['players'] += 1
+                totals['matches'] += result['matches']
+                totals['reused'] += result['reused']
+                totals['failed'] += result['failed']
+                totals['empty'] += int(result['metrics'] is None)
+                buffer.append(result)
+
+            if len(buffer) >= args.batch_size:
+                flush()
+
+            elapsed = time.monotonic() - started
+            print(f"  {totals['players']}/{len(pending)} players  "
+                  f"{totals['players'] / elapsed:.1f} players/s  {totals['matches'] / elapsed:.1f} matches/s")
+
+    if buffer:
+        flush()
+
+    elapsed = time.monotonic() - started
+    totals['elapsed_seconds'] = round(elapsed, 2)
+    totals['players_per_second'] = round(totals['players'] / elapsed, 2) if elapsed else 0.0
+    totals['matches_per_second'] = round(totals['matches'] / elapsed, 2) if elapsed else 0.0
+
+    print("\nBackfill complete:")
+    print(f"  Players: {totals['players']} ({totals['empty']} without usable matches)")
+    print(f"  Matches: {totals['matches']} ({totals['reused']} reused, {totals['failed']} failed)")
+    print(f"  Elapsed: {totals['elapsed_seconds']}s")
+    print(f"  Throughput: {totals['players_per_second']} players/s, {totals['matches_per_second']} matches/s")
+
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill RiftSage features and aggregated metrics')
+    parser.add_argument('--source', required=True, help='Local mirror directory or s3://bucket')
+    parser.add_argument('--year', type=int, default=int(time.strftime('%Y', time.gmtime())))
+    parser.add_argument('--endpoint-url', default=None, help='S3-compatible endpoint (MinIO, localstack)')
+    parser.add_argument('--output', default='backfill-output', help='Directory for JSONL metrics output')
+    parser.add_argument('--metrics-table', default=None, help='Write metrics to this DynamoDB table instead')
+    parser.add_argument('--dynamodb-endpoint-url', default=None)
+    parser.add_argument('--region', default='us-east-1')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shard-size', type=int, default=8, help='Players per worker task')
+    parser.add_argument('--batch-size', type=int, default=25, help='Players per metrics write batch')
+    parser.add_argument('--checkpoint', default=None, help='Checkpoint file (default .backfill-YEAR.checkpoint)')
+    parser.add_argument('--restart', action='store_true', help='Ignore and reset an existing checkpoint')
+    parser.add_argument('--force', action='store_true', help='Re-extract features even if stored records are current')
+
+    args = parser.parse_args()
+
+    run_backfill(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Model Artifact Converter
+Converts pickled scikit-learn models into memory-mappable .rsm artifacts
+
+Usage:
+    python scripts/convert_models.py models/*.pkl --output-dir converted/ \\
+        --labels performance_pattern_analyzer=aggressive_combat_with_survival,high_risk_high_reward,balanced_gameplay
+
+    aws s3 cp converted/ s3://riftsage-models-production-<account>/models/ --recursive
+"""
+
+import argparse
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+from model_artifacts import ARTIFACT_EXTENSION, convert_sklearn_model, load_artifact, save_artifact  # noqa: E402
+
+
+def parse_labels(values):
+    """Parse NAME=label0,label1,... options into {name: [labels]}"""
+    labels = {}
+    for value in values or []:
+        name, _, names = value.partition('=')
+        labels[name] = names.split(',')
+    return labels
+
+
+def convert_file(path: str, output_dir: str, labels: dict) -> str:
+    model_name = os.path.splitext(os.path.basename(path))[0]
+
+    # Only convert pickles you trust: unpickling executes arbitrary code
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+
+    predictor = convert_sklearn_model(model, labels.get(model_name))
+
+    output_path = os.path.join(output_dir, f"{model_name}{ARTIFACT_EXTENSION}")
+    save_artifact(predictor, output_path, metadata={
+        'model_name': model_name,
+        'source': os.path.basename(path),
+        'sklearn_type': type(model).__name__
+    })
+
+    # Round-trip check so a bad conversion never gets uploaded
+    load_artifact(output_path)
+
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert pickled sklearn models to RiftSage artifacts')
+    parser.add_argument('models', nargs='+', help='Pickled model files (models/{name}.pkl)')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--labels', action='append', metavar='NAME=L0,L1,...',
+                        help='Cluster labels for a k-means model, in cluster-index order')
+
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    labels = parse_labels(args.labels)
+
+    for path in args.models:
+        try:
+            output_path = convert_file(path, args.output_dir, labels)
+            print(f"✓ {path} -> {output_path} ({os.path.getsize(output_path)} bytes)")
+        except Exception as e:
+            print(f"✗ {path}: {str(e)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+RiftSage AI Agent - Data Package Offload
+Moves inline data_package snapshots out of existing GeneratedInsightsTable items
+
+Sections generated before data packages moved to S3 carry the package as an
+inline JSON string. Each one is stored the way generation now stores it
+(gzipped, keyed by content hash, so identical packages are written once)
+and the item keeps only data_package_ref. The update is conditional on the
+inline package being unchanged, so a section regenerated meanwhile is left
+alone; re-running the script only visits items that still need it.
+
+Usage:
+    python scripts/offload_data_packages.py --insights-table riftsage-Insights-production \\
+        --bucket riftsage-reports-production-<account> [--segments 4] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_functions'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move inline data packages from insights items to S3')
+    parser.add_argument('--insights-table', required=True)
+    parser.add_argument('--bucket', required=True, help='Bucket for data-packages/ (the reports bucket)')
+    parser.add_argument('--region', default='us-east-1')
+    parser.add_argument('--segments', type=int, default=4, help='Parallel scan segments')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would move without writing')
+    args = parser.parse_args()
+
+    # Read by the lambda modules at import time
+    os.environ.setdefault('AWS_DEFAULT_REGION', args.region)
+    os.environ['INSIGHTS_TABLE'] = args.insights_table
+    os.environ['DATA_PACKAGE_BUCKET'] = args.bucket
+
+    import boto3
+    from boto3.dynamodb.conditions import Attr
+    from bedrock_generation import snapshot_data_package
+    from parallel_scan import ParallelScan
+
+    table = boto3.resource('dynamodb', region_name=args.region).Table(args.insights_table)
+    scan = ParallelScan(
+        args.insights_table,
+        total_segments=args.segments,
+        projection=('player_puuid', 'section_id', 'data_package'),
+        filter_expression=Attr('data_package').exists()
+    )
+
+    started = time.perf_counter()
+    totals = {'moved': 0, 'skipped': 0, 'inline_bytes': 0}
+    packages = set()
+
+    for item in scan.items():
+        inline = item['data_package']
+        totals['inline_bytes'] += len(inline.encode('utf-8'))
+
+        if args.dry_run:
+            totals['moved'] += 1
+            continue
+
+        snapshot = snapshot_data_package(json.loads(inline))
+        if 'data_package_ref' not in snapshot:
+            sys.exit(f"Could not store data packages in {args.bucket}; stopping")
+        packages.add(snapshot['data_package_ref'])
+
+        try:
+            table.update_item(
+                Key={'player_puuid': item['player_puuid'], 'section_id': item['section_id']},
+                UpdateExpression='SET data_package_ref = :ref REMOVE data_package',
+                ConditionExpression='data_package = :inline',
+                ExpressionAttributeValues={':ref': snapshot['data_package_ref'], ':inline': inline}
+            )
+            totals['moved'] += 1
+        except table.meta.client.exceptions.ConditionalCheckFailedException:
+            # Regenerated since the scan read it
+            totals['skipped'] += 1
+
+    elapsed = time.perf_counter() - started
+    print(f"\nOffload {'dry run ' if args.dry_run else ''}complete:")
+    print(f"  Items: {totals['moved']} {'to move' if args.dry_run else 'moved'}, {totals['skipped']} skipped")
+    print(f"  Inline data removed: {totals['inline_bytes'] / 1024:.1f} KiB")
+    if not args.dry_run:
+        print(f"  Distinct packages stored: {len(packages)}")
+    print(f"  Scanned: {scan.stats['scanned']} items in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()